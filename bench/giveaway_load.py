@@ -0,0 +1,252 @@
+"""
+Benchmark de carga do caminho de sorteios contra um Discord falso local.
+
+Sobe um servidor aiohttp.web em processo que imita os endpoints de mensagem de webhook
+(GET/PATCH /api/webhooks/{id}/{token}/messages/{mid}) com latência configurável e
+rate-limit por webhook (headers X-RateLimit-* e 429 com retry_after), e dispara N cliques
+'gaw:join:' por segundo no GiveawayManager via roteador de interações.
+
+Uso (na raiz do repositório):
+    python -m bench.giveaway_load --rate 300 --duration 10
+    python -m bench.giveaway_load --rate 300 --duration 10 --json >> bench_output.txt
+"""
+import os
+import sys
+import json
+import time
+import random
+import asyncio
+import argparse
+import tempfile
+import tracemalloc
+from datetime import datetime, timedelta, timezone
+
+from aiohttp import web
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+# store do cog em diretório temporário (antes de importar config)
+os.environ.setdefault("DATA_DIR", tempfile.mkdtemp(prefix="frizz-bench-"))
+
+import discord
+
+import zwcodec
+from rest import RestClient
+from router import InteractionRouter
+from scheduler import Scheduler
+from webhook_registry import WebhookRegistry
+from cogs.giveaway_manager import Giveaway, GiveawayManager, ParticipantSet
+
+# ------------------------------ Discord falso ------------------------------
+
+class FakeDiscord:
+    def __init__(self, latency_ms: float, limit: int, window: float):
+        self.latency = latency_ms / 1000
+        self.limit = limit
+        self.window = window
+        self.messages: dict[str, dict] = {}
+        self.buckets: dict[str, tuple[int, float]] = {}  # webhook -> (usados, inicio da janela)
+        self.calls = {"GET": 0, "PATCH": 0}
+        self.rate_limited = 0
+
+    def _take(self, wid: str) -> tuple[bool, dict]:
+        now = time.monotonic()
+        used, start = self.buckets.get(wid, (0, now))
+        if now - start >= self.window:
+            used, start = 0, now
+        reset_after = max(0.0, self.window - (now - start))
+        ok = used < self.limit
+        if ok:
+            used += 1
+        self.buckets[wid] = (used, start)
+        headers = {
+            "X-RateLimit-Limit": str(self.limit),
+            "X-RateLimit-Remaining": str(self.limit - used),
+            "X-RateLimit-Reset-After": f"{reset_after:.3f}",
+            "X-RateLimit-Bucket": f"wh-{wid}",
+        }
+        return ok, headers
+
+    async def handle(self, request: web.Request) -> web.Response:
+        await asyncio.sleep(self.latency)
+        wid, mid = request.match_info["wid"], request.match_info["mid"]
+        self.calls[request.method] = self.calls.get(request.method, 0) + 1
+        ok, headers = self._take(wid)
+        if not ok:
+            self.rate_limited += 1
+            retry = float(headers["X-RateLimit-Reset-After"])
+            return web.json_response({"message": "You are being rate limited.", "retry_after": retry, "global": False}, status=429, headers=headers)
+        msg = self.messages.get(mid)
+        if msg is None:
+            return web.json_response({"message": "Unknown Message", "code": 10008}, status=404, headers=headers)
+        if request.method == "PATCH":
+            body = await request.json()
+            if "components" in body:
+                msg["components"] = body["components"]
+        return web.json_response(msg, headers=headers)
+
+    async def start(self) -> tuple[web.AppRunner, str]:
+        app = web.Application()
+        path = "/api/webhooks/{wid}/{token}/messages/{mid}"
+        app.router.add_get(path, self.handle)
+        app.router.add_patch(path, self.handle)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        return runner, f"http://127.0.0.1:{port}"
+
+# ---------------------------- bot e interações ----------------------------
+
+class FakeBot:
+    def __init__(self, rest: RestClient):
+        self.rest = rest
+        self.scheduler = Scheduler()
+        self.router = InteractionRouter()
+        self.webhooks = WebhookRegistry(self)
+        self.user = None
+
+    def get_channel(self, _id):
+        return None
+
+    async def wait_until_ready(self):
+        return None
+
+class FakeResponse:
+    def __init__(self, latency: float):
+        self._latency = latency
+        self._done = False
+
+    def is_done(self) -> bool:
+        return self._done
+
+    async def send_message(self, *args, **kwargs):
+        await asyncio.sleep(self._latency)  # callback da interação no Discord
+        self._done = True
+
+class FakeUser:
+    __slots__ = ("id",)
+
+    def __init__(self, uid: int):
+        self.id = uid
+
+class FakeInteraction:
+    type = discord.InteractionType.component
+
+    def __init__(self, custom_id: str, uid: int, ack_latency: float):
+        self.data = {"custom_id": custom_id}
+        self.user = FakeUser(uid)
+        self.response = FakeResponse(ack_latency)
+
+# --------------------------------- medição ---------------------------------
+
+def percentile(xs: list[float], q: float) -> float:
+    if not xs:
+        return 0.0
+    s = sorted(xs)
+    return s[min(len(s) - 1, int(len(s) * q))]
+
+def memory_per_participant(n: int = 100_000) -> float:
+    tracemalloc.start()
+    base = tracemalloc.get_traced_memory()[0]
+    ps = ParticipantSet()
+    for uid in range(10**17, 10**17 + n):
+        ps.add(uid)
+    used = tracemalloc.get_traced_memory()[0] - base
+    tracemalloc.stop()
+    return used / n
+
+async def run(args) -> dict:
+    fake = FakeDiscord(args.latency_ms, args.limit, args.window)
+    runner, base_url = await fake.start()
+
+    rest = RestClient()
+    await rest.start()
+    bot = FakeBot(rest)
+    bot.scheduler.start()
+
+    cog = GiveawayManager(bot)
+    await cog.cog_load()
+
+    gid = "gaw-bench-0001"
+    mid = "1000"
+    fake.messages[mid] = {
+        "id": mid,
+        "components": [{"type": 17, "components": [
+            {"type": 10, "content": "Participantes: 0" + zwcodec.encode(f"gaw:count:{gid}")},
+        ]}],
+    }
+    cog.active[gid] = Giveaway(id=gid, guild_id=1, channel_id=1, winners=1,
+                               ends_at=datetime.now(timezone.utc) + timedelta(hours=1))
+    cog.bindings[gid] = [{"channel_id": 1, "message_id": int(mid), "base_labels": {},
+                          "webhook_url": f"{base_url}/api/webhooks/1/bench-token"}]
+
+    clicks = 0
+    tasks: set[asyncio.Task] = set()
+    interval = 1 / args.rate
+    t_end = time.perf_counter() + args.duration
+    next_at = time.perf_counter()
+    while time.perf_counter() < t_end:
+        inter = FakeInteraction(f"gaw:join:{gid}", random.randrange(args.users), args.ack_ms / 1000)
+        t = asyncio.create_task(bot.router.dispatch(inter))
+        tasks.add(t)
+        t.add_done_callback(tasks.discard)
+        clicks += 1
+        next_at += interval
+        await asyncio.sleep(max(0.0, next_at - time.perf_counter()))
+
+    await asyncio.gather(*tasks)
+    # deixa o flusher do contador escrever o valor final
+    while cog._counter_flushers:
+        await asyncio.sleep(0.05)
+
+    st = bot.router.stats["gaw:join:"]
+    rest_calls = fake.calls.get("GET", 0) + fake.calls.get("PATCH", 0)
+    final_text = fake.messages[mid]["components"][0]["components"][0]["content"]
+    result = {
+        "clicks": clicks,
+        "participants": len(cog.active[gid].participants),
+        "final_counter": final_text.split(zwcodec.MARK_LEAD, 1)[0],
+        "rest_calls": rest_calls,
+        "rest_get": fake.calls.get("GET", 0),
+        "rest_patch": fake.calls.get("PATCH", 0),
+        "rest_calls_per_click": rest_calls / clicks if clicks else 0.0,
+        "http_429": fake.rate_limited,
+        "ack_p50_ms": percentile(list(st.ack_ms), 0.50),
+        "ack_p99_ms": percentile(list(st.ack_ms), 0.99),
+        "handler_errors": st.errors,
+        "throttled_clicks": cog.click_throttle.throttled,
+        "bytes_per_participant": memory_per_participant(args.mem_n),
+    }
+
+    await cog.cog_unload()
+    await bot.scheduler.stop()
+    await rest.close()
+    await runner.cleanup()
+    return result
+
+def main():
+    ap = argparse.ArgumentParser(description="Benchmark de cliques em sorteios contra um Discord falso.")
+    ap.add_argument("--rate", type=float, default=200, help="cliques por segundo")
+    ap.add_argument("--duration", type=float, default=10, help="segundos de carga")
+    ap.add_argument("--users", type=int, default=50_000, help="tamanho do universo de usuários")
+    ap.add_argument("--latency-ms", type=float, default=80, help="latência do REST falso")
+    ap.add_argument("--ack-ms", type=float, default=60, help="latência do callback da interação")
+    ap.add_argument("--limit", type=int, default=5, help="requests por janela por webhook")
+    ap.add_argument("--window", type=float, default=2.0, help="janela do rate-limit (s)")
+    ap.add_argument("--mem-n", type=int, default=100_000, help="participantes para medir memória")
+    ap.add_argument("--json", action="store_true", help="imprime uma linha JSON (para comparar versões)")
+    args = ap.parse_args()
+
+    result = asyncio.run(run(args))
+    if args.json:
+        print(json.dumps({"bench": "giveaway_load", "args": vars(args), **result}))
+        return
+    for k, v in result.items():
+        print(f"{k:>24}: {v:.3f}" if isinstance(v, float) else f"{k:>24}: {v}")
+
+if __name__ == "__main__":
+    main()
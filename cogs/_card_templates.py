@@ -0,0 +1,180 @@
+import os
+import re
+import json
+import time
+from collections import OrderedDict
+
+import config
+from store import SQLiteStore
+from cogs._components_v2 import MAX_TEXT_CHARS, TEXT_DISPLAY, validate
+
+# Templates de card: o payload do webhook é serializado uma vez, ao salvar, e partido nos
+# {placeholders} (fatias fixas + slots). Enviar só escapa os valores para JSON e junta as
+# fatias; a árvore de componentes nunca é reconstruída. Templates ficam no SQLite e os
+# usados recentemente num cache LRU em memória. Slots só em TextDisplay são checados pelo
+# orçamento de texto pré-calculado; slots em labels, URLs etc. passam pelo validador
+# completo (_components_v2) depois da substituição, antes do POST.
+
+DB_PATH = os.path.join(config.DATA_DIR, "card_templates.db")
+CACHE_SIZE = 128
+
+PLACEHOLDER_RX = re.compile(r"\{([A-Za-z_][A-Za-z0-9_]{0,31})\}")
+NAME_RX = re.compile(r"^[a-z0-9_-]{1,32}$")
+
+class TemplateError(ValueError):
+    """Template inválido ou parâmetros faltando/excedendo limites; mensagem vai para o usuário."""
+
+def _text_budget(components: list) -> tuple[int, dict[str, int]]:
+    """(caracteres fixos dos TextDisplay, ocorrências de cada slot dentro deles)."""
+    base = 0
+    uses: dict[str, int] = {}
+    stack = list(components)
+    while stack:
+        comp = stack.pop()
+        if not isinstance(comp, dict):
+            continue
+        if comp.get("type") == TEXT_DISPLAY and isinstance(comp.get("content"), str):
+            content = comp["content"]
+            base += len(PLACEHOLDER_RX.sub("", content))
+            for m in PLACEHOLDER_RX.finditer(content):
+                uses[m.group(1)] = uses.get(m.group(1), 0) + 1
+        stack.extend(comp.get("components") or ())
+        if isinstance(comp.get("accessory"), dict):
+            stack.append(comp["accessory"])
+    return base, uses
+
+class CardTemplate:
+    """Payload pré-serializado com slots pré-calculados."""
+    __slots__ = ("name", "payload", "chunks", "slots", "params", "base_text", "text_uses", "needs_validation")
+
+    def __init__(self, name: str, payload: str, base_text: int, text_uses: dict[str, int]):
+        self.name = name
+        self.payload = payload
+        # "a{x}b{y}c" -> chunks ["a", "b", "c"], slots ["x", "y"]
+        parts = PLACEHOLDER_RX.split(payload)
+        self.chunks: list[str] = parts[0::2]
+        self.slots: list[str] = parts[1::2]
+        self.params: list[str] = list(dict.fromkeys(self.slots))
+        self.base_text = base_text
+        self.text_uses = text_uses
+        # algum slot fora de TextDisplay (label, url, descrição...): precisa do validador
+        self.needs_validation = sum(text_uses.values()) < len(self.slots)
+
+    @classmethod
+    def compile(cls, name: str, payload: dict) -> "CardTemplate":
+        base, uses = _text_budget(payload.get("components") or [])
+        return cls(name, json.dumps(payload, ensure_ascii=False, separators=(",", ":")), base, uses)
+
+    def render(self, values: dict[str, str]) -> bytes:
+        """
+        Corpo JSON pronto para o POST. TemplateError se faltar ou sobrar parâmetro, se o
+        texto estourar ou se um valor deixar algum componente inválido.
+        """
+        valid = ", ".join(self.params) or "nenhum"
+        unknown = [k for k in values if k not in self.params]
+        if unknown:
+            raise TemplateError(f"parâmetro(s) desconhecido(s): {', '.join(unknown)} (válidos: {valid})")
+        missing = [p for p in self.params if p not in values]
+        if missing:
+            raise TemplateError(f"parâmetro(s) faltando: {', '.join(missing)} (válidos: {valid})")
+        total = self.base_text + sum(len(values[p]) * n for p, n in self.text_uses.items())
+        if total > MAX_TEXT_CHARS:
+            raise TemplateError(f"texto do card ficaria com {total} caracteres (máx. {MAX_TEXT_CHARS})")
+        # valor escapado como string JSON (sem as aspas), inserido direto no slot
+        escaped = {p: json.dumps(values[p], ensure_ascii=False)[1:-1] for p in self.params}
+        out = [self.chunks[0]]
+        for slot, chunk in zip(self.slots, self.chunks[1:]):
+            out.append(escaped[slot])
+            out.append(chunk)
+        body = "".join(out)
+        if self.needs_validation:
+            report = validate(json.loads(body).get("components") or [])
+            if not report.ok:
+                raise TemplateError("; ".join(str(e) for e in report.errors[:5]))
+        return body.encode("utf-8")
+
+class CardTemplateStore(SQLiteStore):
+    """Templates por guild (payload já serializado). Escritas em lote via SQLiteStore."""
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS templates (
+        guild_id INTEGER NOT NULL,
+        name TEXT NOT NULL,
+        payload TEXT NOT NULL,
+        base_text INTEGER NOT NULL,
+        text_uses TEXT NOT NULL,
+        author_id INTEGER,
+        created_at REAL NOT NULL,
+        PRIMARY KEY (guild_id, name)
+    ) WITHOUT ROWID;
+    """
+
+    def __init__(self, path: str = DB_PATH):
+        super().__init__(path)
+
+    def save_template(self, guild_id: int, tpl: CardTemplate, author_id: int):
+        self.write(
+            "INSERT OR REPLACE INTO templates (guild_id, name, payload, base_text, text_uses, author_id, created_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (guild_id, tpl.name, tpl.payload, tpl.base_text, json.dumps(tpl.text_uses), author_id, time.time()),
+        )
+
+    def delete_template(self, guild_id: int, name: str):
+        self.write("DELETE FROM templates WHERE guild_id = ? AND name = ?", (guild_id, name))
+
+    async def load_template(self, guild_id: int, name: str) -> CardTemplate | None:
+        rows = await self.query(
+            "SELECT payload, base_text, text_uses FROM templates WHERE guild_id = ? AND name = ?", (guild_id, name)
+        )
+        if not rows:
+            return None
+        payload, base_text, text_uses = rows[0]
+        return CardTemplate(name, payload, base_text, json.loads(text_uses))
+
+    async def template_names(self, guild_id: int) -> list[str]:
+        return [n for (n,) in await self.query("SELECT name FROM templates WHERE guild_id = ? ORDER BY name", (guild_id,))]
+
+class TemplateLibrary:
+    """Cache LRU (guild_id, nome) -> CardTemplate na frente do CardTemplateStore."""
+
+    def __init__(self, store: CardTemplateStore, capacity: int = CACHE_SIZE):
+        self.store = store
+        self.capacity = capacity
+        self._cache: OrderedDict[tuple[int, str], CardTemplate] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def _put(self, key: tuple[int, str], tpl: CardTemplate):
+        self._cache[key] = tpl
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.capacity:
+            self._cache.popitem(last=False)
+
+    async def get(self, guild_id: int, name: str) -> CardTemplate | None:
+        key = (guild_id, name.lower())
+        tpl = self._cache.get(key)
+        if tpl is not None:
+            self.hits += 1
+            self._cache.move_to_end(key)
+            return tpl
+        self.misses += 1
+        tpl = await self.store.load_template(*key)
+        if tpl is not None:
+            self._put(key, tpl)
+        return tpl
+
+    def save(self, guild_id: int, name: str, payload: dict, author_id: int) -> CardTemplate:
+        name = name.lower()
+        if not NAME_RX.match(name):
+            raise TemplateError("nome de template inválido (use a-z, 0-9, _ ou -, até 32 caracteres)")
+        tpl = CardTemplate.compile(name, payload)
+        self.store.save_template(guild_id, tpl, author_id)
+        self._put((guild_id, name), tpl)
+        return tpl
+
+    def delete(self, guild_id: int, name: str):
+        name = name.lower()
+        self._cache.pop((guild_id, name), None)
+        self.store.delete_template(guild_id, name)
+
+    async def names(self, guild_id: int) -> list[str]:
+        return await self.store.template_names(guild_id)
@@ -0,0 +1,176 @@
+import json
+from dataclasses import dataclass, field
+
+# Validador local de mensagens Components V2 (limites da API do Discord), para o card
+# builder recusar um elemento na hora em vez de descobrir o erro num 400 do webhook.
+# Percorre a árvore uma vez: contagens, aninhamento e orçamento de caracteres (os
+# marcadores invisíveis do zwcodec também contam). Cada erro traz o caminho exato.
+
+MAX_COMPONENTS = 40          # todos os componentes da mensagem, aninhados inclusive
+MAX_TEXT_CHARS = 4000        # soma do texto de todos os TextDisplay
+MAX_ROW_BUTTONS = 5
+MAX_SECTION_TEXTS = 3
+MAX_GALLERY_ITEMS = 10
+MAX_LABEL = 80
+MAX_URL = 512
+MAX_CUSTOM_ID = 100
+MAX_DESCRIPTION = 1024
+
+ACTION_ROW, BUTTON, SECTION, TEXT_DISPLAY, THUMBNAIL, MEDIA_GALLERY, FILE, SEPARATOR, CONTAINER = 1, 2, 9, 10, 11, 12, 13, 14, 17
+
+TYPE_NAMES = {
+    ACTION_ROW: "ActionRow", BUTTON: "Button", SECTION: "Section", TEXT_DISPLAY: "TextDisplay",
+    THUMBNAIL: "Thumbnail", MEDIA_GALLERY: "MediaGallery", FILE: "File", SEPARATOR: "Separator",
+    CONTAINER: "Container",
+}
+TOP_LEVEL = {ACTION_ROW, SECTION, TEXT_DISPLAY, MEDIA_GALLERY, FILE, SEPARATOR, CONTAINER}
+IN_CONTAINER = {ACTION_ROW, SECTION, TEXT_DISPLAY, MEDIA_GALLERY, FILE, SEPARATOR}
+
+ZW_CHARS = frozenset("\u200b\u200c\u200d\u2060\u2061\u2062\u2063\u2064\ufeff")  # zwcodec + afins
+
+@dataclass
+class ComponentError:
+    path: str
+    message: str
+
+    def __str__(self) -> str:
+        return f"`{self.path}`: {self.message}"
+
+@dataclass
+class CardReport:
+    errors: list[ComponentError] = field(default_factory=list)
+    components: int = 0
+    text_chars: int = 0
+    marker_chars: int = 0  # parte de text_chars que é invisível (marcadores)
+    payload_bytes: int = 0
+
+    @property
+    def ok(self) -> bool:
+        return not self.errors
+
+    def summary(self) -> str:
+        return (f"componentes {self.components}/{MAX_COMPONENTS} | texto {self.text_chars}/{MAX_TEXT_CHARS} "
+                f"({self.marker_chars} invisíveis) | {self.payload_bytes} bytes")
+
+def _name(comp) -> str:
+    return TYPE_NAMES.get(comp.get("type"), f"tipo {comp.get('type')}") if isinstance(comp, dict) else type(comp).__name__
+
+class _Walker:
+    def __init__(self, partial: bool):
+        self.partial = partial
+        self.report = CardReport()
+
+    def err(self, path: str, message: str):
+        self.report.errors.append(ComponentError(path, message))
+
+    def children(self, comp: dict, key: str, path: str, allowed: set[int], *, lo: int, hi: int | None):
+        kids = comp.get(key)
+        if not isinstance(kids, list):
+            return self.err(path, f"{_name(comp)} precisa de uma lista '{key}'")
+        if len(kids) < lo or (hi is not None and len(kids) > hi):
+            limit = f"{lo}..{hi}" if hi is not None else f"ao menos {lo}"
+            self.err(path, f"{_name(comp)} com {len(kids)} item(ns) em '{key}' (permitido {limit})")
+        for i, kid in enumerate(kids):
+            self.component(kid, f"{path}.{key}[{i}]", allowed)
+
+    def text(self, value, path: str, label: str, limit: int | None, *, required: bool = True):
+        if value is None and not required:
+            return
+        if not isinstance(value, str) or (required and not value):
+            return self.err(path, f"{label} vazio ou inválido")
+        if limit is not None and len(value) > limit:
+            self.err(path, f"{label} com {len(value)} caracteres (máx. {limit})")
+
+    def media(self, media, path: str):
+        url = media.get("url") if isinstance(media, dict) else None
+        self.text(url, path + ".media.url", "url", None)
+        if isinstance(url, str) and not url.startswith(("http://", "https://", "attachment://")):
+            self.err(path + ".media.url", "url precisa começar com http(s):// ou attachment://")
+        elif isinstance(url, str) and any(ch.isspace() for ch in url):
+            self.err(path + ".media.url", "url não pode ter espaços")
+
+    def component(self, comp, path: str, allowed: set[int]):
+        self.report.components += 1
+        if not isinstance(comp, dict):
+            return self.err(path, "componente precisa ser um objeto")
+        t = comp.get("type")
+        if t not in allowed:
+            return self.err(path, f"{_name(comp)} não é permitido aqui")
+
+        if t == TEXT_DISPLAY:
+            content = comp.get("content")
+            self.text(content, path + ".content", "content", MAX_TEXT_CHARS)
+            if isinstance(content, str):
+                self.report.text_chars += len(content)
+                self.report.marker_chars += sum(1 for ch in content if ch in ZW_CHARS)
+        elif t == CONTAINER:
+            color = comp.get("accent_color")
+            if color is not None and not (isinstance(color, int) and 0 <= color <= 0xFFFFFF):
+                self.err(path + ".accent_color", "cor fora de 0x000000..0xFFFFFF")
+            # partial: card em construção, o container recém-aberto ainda pode estar vazio
+            self.children(comp, "components", path, IN_CONTAINER, lo=0 if self.partial else 1, hi=None)
+        elif t == ACTION_ROW:
+            self.children(comp, "components", path, {BUTTON}, lo=1, hi=MAX_ROW_BUTTONS)
+        elif t == SECTION:
+            self.children(comp, "components", path, {TEXT_DISPLAY}, lo=1, hi=MAX_SECTION_TEXTS)
+            acc = comp.get("accessory")
+            if acc is None:
+                self.err(path + ".accessory", "Section precisa de um accessory (Thumbnail ou Button)")
+            else:
+                self.component(acc, path + ".accessory", {THUMBNAIL, BUTTON})
+        elif t == THUMBNAIL:
+            self.media(comp.get("media"), path)
+            self.text(comp.get("description"), path + ".description", "description", MAX_DESCRIPTION, required=False)
+        elif t == MEDIA_GALLERY:
+            items = comp.get("items")
+            if not isinstance(items, list) or not 1 <= len(items) <= MAX_GALLERY_ITEMS:
+                n = len(items) if isinstance(items, list) else 0
+                self.err(path + ".items", f"MediaGallery com {n} item(ns) (permitido 1..{MAX_GALLERY_ITEMS})")
+            for i, item in enumerate(items if isinstance(items, list) else ()):
+                self.media(item.get("media") if isinstance(item, dict) else None, f"{path}.items[{i}]")
+                self.text(item.get("description") if isinstance(item, dict) else None,
+                          f"{path}.items[{i}].description", "description", MAX_DESCRIPTION, required=False)
+        elif t == SEPARATOR:
+            if comp.get("spacing", 1) not in (1, 2):
+                self.err(path + ".spacing", "spacing deve ser 1 ou 2")
+        elif t == FILE:
+            self.media(comp.get("file"), path + ".file")
+        elif t == BUTTON:
+            self.button(comp, path)
+
+    def button(self, comp: dict, path: str):
+        style = comp.get("style")
+        if style not in (1, 2, 3, 4, 5, 6):
+            return self.err(path + ".style", f"style de botão inválido: {style!r}")
+        if style != 6:  # premium não tem label
+            self.text(comp.get("label"), path + ".label", "label", MAX_LABEL)
+        if style == 5:
+            url = comp.get("url")
+            self.text(url, path + ".url", "url", MAX_URL)
+            if isinstance(url, str) and url and not url.startswith(("http://", "https://", "discord://")):
+                self.err(path + ".url", "url precisa começar com http(s):// ou discord://")
+            elif isinstance(url, str) and any(ch.isspace() for ch in url):
+                self.err(path + ".url", "url não pode ter espaços")
+            if "custom_id" in comp:
+                self.err(path + ".custom_id", "botão de link não pode ter custom_id")
+        elif style != 6:
+            self.text(comp.get("custom_id"), path + ".custom_id", "custom_id", MAX_CUSTOM_ID)
+            if "url" in comp:
+                self.err(path + ".url", "só botões de link (style 5) têm url")
+
+def validate(components: list, *, partial: bool = False) -> CardReport:
+    """Valida a lista de componentes de topo de uma mensagem Components V2."""
+    w = _Walker(partial)
+    if not isinstance(components, list):
+        w.err("components", "precisa ser uma lista")
+        return w.report
+    for i, comp in enumerate(components):
+        w.component(comp, f"components[{i}]", TOP_LEVEL)
+    r = w.report
+    if r.components > MAX_COMPONENTS:
+        r.errors.append(ComponentError("components", f"{r.components} componentes no total (máx. {MAX_COMPONENTS})"))
+    if r.text_chars > MAX_TEXT_CHARS:
+        r.errors.append(ComponentError("components", f"{r.text_chars} caracteres de texto no total, "
+                                                     f"{r.marker_chars} invisíveis (máx. {MAX_TEXT_CHARS})"))
+    r.payload_bytes = len(json.dumps(components, ensure_ascii=False, separators=(",", ":")).encode())
+    return r
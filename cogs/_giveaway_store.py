@@ -0,0 +1,107 @@
+import os
+import json
+from datetime import datetime, timezone
+
+import config
+from store import SQLiteStore
+
+DB_PATH = os.path.join(config.DATA_DIR, "giveaways.db")
+
+class GiveawayStore(SQLiteStore):
+    """
+    Estado durável dos sorteios: sorteios ativos, participantes (inclusive cliques
+    antes do gaw_set) e vínculos de mensagens. Escritas em lote via SQLiteStore.
+    """
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS giveaways (
+        gid TEXT PRIMARY KEY,
+        guild_id INTEGER NOT NULL,
+        channel_id INTEGER NOT NULL,
+        winners INTEGER NOT NULL,
+        ends_at REAL NOT NULL
+    );
+    CREATE TABLE IF NOT EXISTS participants (
+        gid TEXT NOT NULL,
+        user_id INTEGER NOT NULL,
+        PRIMARY KEY (gid, user_id)
+    ) WITHOUT ROWID;
+    CREATE TABLE IF NOT EXISTS bindings (
+        gid TEXT NOT NULL,
+        message_id INTEGER NOT NULL,
+        channel_id INTEGER,
+        webhook_url TEXT,
+        base_labels TEXT,
+        PRIMARY KEY (gid, message_id)
+    ) WITHOUT ROWID;
+    """
+
+    def __init__(self, path: str = DB_PATH):
+        super().__init__(path)
+
+    # ---- escrita (enfileirada) ----
+
+    def save_giveaway(self, gid: str, guild_id: int, channel_id: int, winners: int, ends_at: datetime):
+        # gaw_set num gid já ativo recomeça o sorteio: os participantes antigos saem junto.
+        # Cliques antes do primeiro gaw_set (sem linha em giveaways) são mantidos.
+        self.write(
+            "DELETE FROM participants WHERE gid = ? AND EXISTS (SELECT 1 FROM giveaways WHERE gid = ?)",
+            (gid, gid),
+        )
+        self.write(
+            "INSERT OR REPLACE INTO giveaways (gid, guild_id, channel_id, winners, ends_at) VALUES (?, ?, ?, ?, ?)",
+            (gid, guild_id, channel_id, winners, ends_at.timestamp()),
+        )
+
+    def delete_giveaway(self, gid: str):
+        self.write("DELETE FROM giveaways WHERE gid = ?", (gid,))
+        self.write("DELETE FROM participants WHERE gid = ?", (gid,))
+
+    def delete_participants(self, gid: str):
+        self.write("DELETE FROM participants WHERE gid = ?", (gid,))
+
+    def add_participant(self, gid: str, user_id: int):
+        self.write("INSERT OR IGNORE INTO participants (gid, user_id) VALUES (?, ?)", (gid, user_id))
+
+    def remove_participant(self, gid: str, user_id: int):
+        self.write("DELETE FROM participants WHERE gid = ? AND user_id = ?", (gid, user_id))
+
+    def save_binding(self, gid: str, b: dict):
+        self.write(
+            "INSERT OR REPLACE INTO bindings (gid, message_id, channel_id, webhook_url, base_labels) VALUES (?, ?, ?, ?, ?)",
+            (gid, b.get("message_id"), b.get("channel_id"), b.get("webhook_url"), json.dumps(b.get("base_labels") or {})),
+        )
+
+    def delete_binding(self, gid: str, message_id: int):
+        self.write("DELETE FROM bindings WHERE gid = ? AND message_id = ?", (gid, message_id))
+
+    # ---- leitura (cog_load) ----
+
+    async def load_all(self) -> tuple[list[dict], dict[str, list[int]], dict[str, list[dict]]]:
+        """Retorna (sorteios, participantes por gid, vínculos por gid)."""
+        giveaways = [
+            {
+                "gid": gid,
+                "guild_id": guild_id,
+                "channel_id": channel_id,
+                "winners": winners,
+                "ends_at": datetime.fromtimestamp(ends_at, tz=timezone.utc),
+            }
+            for gid, guild_id, channel_id, winners, ends_at in await self.query(
+                "SELECT gid, guild_id, channel_id, winners, ends_at FROM giveaways"
+            )
+        ]
+
+        participants: dict[str, list[int]] = {}
+        for gid, user_id in await self.query("SELECT gid, user_id FROM participants"):
+            participants.setdefault(gid, []).append(user_id)
+
+        bindings: dict[str, list[dict]] = {}
+        for gid, message_id, channel_id, webhook_url, base_labels in await self.query(
+            "SELECT gid, message_id, channel_id, webhook_url, base_labels FROM bindings"
+        ):
+            b = {"channel_id": channel_id, "message_id": message_id, "base_labels": json.loads(base_labels or "{}")}
+            if webhook_url:
+                b["webhook_url"] = webhook_url
+            bindings.setdefault(gid, []).append(b)
+
+        return giveaways, participants, bindings
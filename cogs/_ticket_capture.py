@@ -0,0 +1,201 @@
+import os
+import json
+import time
+import asyncio
+
+import discord
+
+import config
+from cogs._transcript import message_record, raw_mentions
+
+# Captura incremental dos tickets: cada mensagem, edição e exclusão num canal de ticket
+# vira uma linha num log append-only (<DATA_DIR>/capture/<channel_id>.jsonl). No
+# encerramento o transcript sai desse log, sem buscar o histórico do canal; lacunas
+# (bot fora do ar) são cobertas com uma única chamada history(after=...) limitada.
+
+CAPTURE_DIR = os.path.join(config.DATA_DIR, "capture")
+BACKFILL_LIMIT = 500
+_TAIL_BYTES = 64 * 1024
+
+def capture_path(channel_id: int) -> str:
+    return os.path.join(CAPTURE_DIR, f"{channel_id}.jsonl")
+
+def _last_message_id(path: str) -> int | None:
+    """Último id de mensagem gravado (lê só o fim do arquivo)."""
+    with open(path, "rb") as f:
+        f.seek(0, os.SEEK_END)
+        size = f.tell()
+        f.seek(max(0, size - _TAIL_BYTES))
+        lines = f.read().splitlines()
+    for line in reversed(lines):
+        try:
+            rec = json.loads(line)
+        except ValueError:
+            continue  # linha cortada pelo seek
+        if rec.get("op") == "msg":
+            return rec["id"]
+    return None
+
+class CaptureLog:
+    """
+    Logs de captura por canal de ticket. Escritas ficam num buffer em memória e são
+    gravadas em lote numa thread (flusher periódico), como no SQLiteStore.
+    """
+    def __init__(self, flush_interval: float = 1.0):
+        self.flush_interval = flush_interval
+        self._last: dict[int, int | None] = {}  # canal com log -> último id de mensagem
+        self._buf: dict[int, list[str]] = {}
+        self._hold: dict[int, list[dict]] = {}  # eventos ao vivo retidos durante um backfill
+        self._flusher: asyncio.Task | None = None
+        self._lock = asyncio.Lock()
+        self._removals: set[asyncio.Task] = set()
+
+    # ---- ciclo de vida ----
+
+    def _scan(self) -> dict[int, int | None]:
+        os.makedirs(CAPTURE_DIR, exist_ok=True)
+        found = {}
+        for name in os.listdir(CAPTURE_DIR):
+            if name.endswith(".jsonl") and name[:-6].isdigit():
+                found[int(name[:-6])] = _last_message_id(os.path.join(CAPTURE_DIR, name))
+        return found
+
+    async def open(self):
+        self._last.update(await asyncio.to_thread(self._scan))
+        self._flusher = asyncio.create_task(self._flush_loop())
+
+    async def close(self):
+        if self._flusher:
+            self._flusher.cancel()
+            self._flusher = None
+        await self.flush()
+        if self._removals:
+            await asyncio.gather(*self._removals, return_exceptions=True)
+
+    async def _flush_loop(self):
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            await self.flush()
+
+    async def flush(self):
+        async with self._lock:
+            if not self._buf:
+                return
+            batch, self._buf = self._buf, {}
+            try:
+                await asyncio.to_thread(self._write_batch, batch)
+            except Exception as e:
+                print(f"[capture] falha ao gravar logs: {e!r}")
+
+    @staticmethod
+    def _write_batch(batch: dict[int, list[str]]):
+        for channel_id, lines in batch.items():
+            with open(capture_path(channel_id), "a", encoding="utf-8") as f:
+                f.write("".join(lines))
+
+    # ---- consulta ----
+
+    def __contains__(self, channel_id: int) -> bool:
+        return channel_id in self._last
+
+    def __len__(self) -> int:
+        return len(self._last)
+
+    def channels(self) -> list[int]:
+        return list(self._last)
+
+    def last_id(self, channel_id: int) -> int | None:
+        return self._last.get(channel_id)
+
+    # ---- escrita ----
+
+    def _append(self, channel_id: int, rec: dict):
+        if channel_id not in self._last:
+            return
+        hold = self._hold.get(channel_id)
+        if hold is not None:
+            hold.append(rec)
+            return
+        if rec["op"] == "msg":
+            last = self._last.get(channel_id)
+            if last is not None and rec["id"] <= last:
+                return  # já veio pelo backfill
+            self._last[channel_id] = rec["id"]
+        self._buf.setdefault(channel_id, []).append(json.dumps(rec, ensure_ascii=False) + "\n")
+
+    def start(self, channel_id: int):
+        """Começa a capturar um ticket recém-criado."""
+        if channel_id not in self._last:
+            self._last[channel_id] = None
+            self._append(channel_id, {"op": "start", "ts": time.time()})
+
+    def message(self, msg: discord.Message):
+        if msg.channel.id in self._last:
+            self._append(msg.channel.id, {"op": "msg", **message_record(msg)})
+
+    def edit(self, payload: discord.RawMessageUpdateEvent):
+        if payload.channel_id not in self._last:
+            return
+        data = payload.data
+        if not any(k in data for k in ("content", "attachments", "embeds", "components")):
+            return
+        ts = data.get("edited_timestamp")
+        self._append(payload.channel_id, {
+            "op": "edit",
+            "id": payload.message_id,
+            "content": data.get("content"),
+            # prévia de link (só embeds) não marca a mensagem como editada
+            "edited_ts": (discord.utils.parse_time(ts).timestamp() if ts else time.time()) if "content" in data else None,
+            "attachments": [
+                {"filename": a["filename"], "url": a["url"], "content_type": a.get("content_type"), "size": a.get("size")}
+                for a in data["attachments"]
+            ] if "attachments" in data else None,
+            "embeds": data.get("embeds"),
+            "components": data.get("components"),
+            "mentions": raw_mentions(data) if "mentions" in data else None,
+        })
+
+    def delete(self, channel_id: int, message_id: int):
+        if channel_id in self._last:
+            self._append(channel_id, {"op": "del", "id": message_id})
+
+    async def backfill(self, channel: discord.TextChannel) -> bool:
+        """
+        Cobre a lacuna entre o último id gravado e o last_message_id do canal com uma
+        chamada history(after=...) de até BACKFILL_LIMIT mensagens. False se a lacuna
+        for maior que isso (o log não serve para o transcript).
+        """
+        cid = channel.id
+        if cid not in self._last or cid in self._hold:
+            return cid in self._last
+        last = self._last[cid]
+        if channel.last_message_id is not None and channel.last_message_id == last:
+            return True
+        self._hold[cid] = []
+        fetched: list[discord.Message] = []
+        try:
+            after = discord.Object(id=last or cid)  # sem mensagens ainda: desde a criação do canal
+            fetched = [m async for m in channel.history(limit=BACKFILL_LIMIT, after=after, oldest_first=True)]
+        finally:
+            held = self._hold.pop(cid, [])
+            for m in fetched:
+                self._append(cid, {"op": "msg", **message_record(m)})
+            for rec in held:
+                self._append(cid, rec)
+        return len(fetched) < BACKFILL_LIMIT
+
+    def discard(self, channel_id: int):
+        self._last.pop(channel_id, None)
+        self._buf.pop(channel_id, None)
+        self._hold.pop(channel_id, None)
+        t = asyncio.create_task(self._remove(channel_id))
+        self._removals.add(t)
+        t.add_done_callback(self._removals.discard)
+
+    async def _remove(self, channel_id: int):
+        # sob o lock: um lote já retirado do buffer não recria o arquivo depois da remoção
+        async with self._lock:
+            try:
+                await asyncio.to_thread(os.remove, capture_path(channel_id))
+            except OSError:
+                pass
@@ -0,0 +1,248 @@
+import os
+import json
+import asyncio
+import tempfile
+from dataclasses import asdict, dataclass, fields, replace
+from typing import Callable, Optional
+
+import config
+
+# Configuração dos tickets: um snapshot tipado e imutável em memória. Leituras não tocam
+# o disco; update() troca o snapshot na hora, avisa quem assinou e agenda a gravação
+# (debounce, arquivo temporário + os.replace numa thread). Edições externas no arquivo
+# são recarregadas pelo watcher, sem /restart. Cada valor é convertido e validado ao
+# montar o snapshot; valor inválido mantém o snapshot anterior.
+
+CONFIG_FILE = os.path.join(config.DATA_DIR, "ticket_config.json")
+LEGACY_CONFIG_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "configs", "ticket_config.json")
+CONFIG_KEY = "CONFIG"
+
+@dataclass(frozen=True)
+class TicketSettings:
+    last_ticket_message_id: Optional[int] = None
+    last_ticket_channel_id: Optional[int] = None
+    ticket_category_id: int = 0
+    panel_channel_id: int = 0
+    staff_role_id: int = 0
+    admin_role_id: int = 0
+    logs_channel_id: int = 0
+    one_ticket_per_user: bool = True
+    enable_anonymous_reports: bool = True
+    rating_timeout_sec: int = 20
+    sla_warn_hours: int = 24
+    sla_autoclose_hours: int = 48
+    capture_messages: bool = False
+    channel_pool_size: int = 0
+    ticket_mode: str = "channel"  # "channel" (canal por ticket) ou "thread" (thread privada)
+    thread_parent_channel_id: int = 0
+
+_FIELDS = {f.name for f in fields(TicketSettings)}
+_TYPES = {f.name: f.type for f in fields(TicketSettings)}
+_CHOICES = {"ticket_mode": ("channel", "thread")}
+_MIN = {"rating_timeout_sec": 1}  # demais inteiros: >= 0
+
+class ConfigError(ValueError):
+    """Valor de config inválido; a mensagem lista cada campo recusado."""
+
+def _to_int(value) -> int:
+    if isinstance(value, bool):
+        raise ValueError("esperado um inteiro, veio booleano")
+    if isinstance(value, int):
+        return value
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    if isinstance(value, str) and value.strip().lstrip("-").isdigit():
+        return int(value.strip())
+    raise ValueError(f"esperado um inteiro, veio {value!r}")
+
+def _to_bool(value) -> bool:
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, int) and value in (0, 1):
+        return bool(value)
+    if isinstance(value, str) and value.strip().lower() in ("true", "false", "1", "0", "sim", "nao", "não"):
+        return value.strip().lower() in ("true", "1", "sim")
+    raise ValueError(f"esperado true/false, veio {value!r}")
+
+def _coerce(name: str, value):
+    kind = _TYPES[name]
+    if kind == Optional[int]:
+        if value is None or value == "":
+            return None
+        value = _to_int(value)
+    elif kind is int:
+        value = _to_int(value)
+    elif kind is bool:
+        return _to_bool(value)
+    elif kind is str:
+        if not isinstance(value, str):
+            raise ValueError(f"esperado texto, veio {value!r}")
+        value = value.strip().lower()
+    if name in _CHOICES and value not in _CHOICES[name]:
+        raise ValueError(f"use um de {', '.join(_CHOICES[name])}")
+    if isinstance(value, int) and value < _MIN.get(name, 0):
+        raise ValueError(f"mínimo {_MIN.get(name, 0)}, veio {value}")
+    return value
+
+def build_settings(data: dict) -> TicketSettings:
+    """Snapshot a partir de um dict (JSON/legado/update). ConfigError com todos os campos inválidos."""
+    known, errors = {}, []
+    for k, v in data.items():
+        if k not in _FIELDS:
+            continue
+        try:
+            known[k] = _coerce(k, v)
+        except ValueError as e:
+            errors.append(f"{k}: {e}")
+    if errors:
+        raise ConfigError("; ".join(errors))
+    return replace(TicketSettings(), **known)
+
+Listener = Callable[[TicketSettings, set[str]], None]
+
+class TicketConfig:
+    def __init__(self, path: str = CONFIG_FILE, *, debounce: float = 0.5, watch_interval: float = 5.0):
+        self.path = path
+        self.debounce = debounce
+        self.watch_interval = watch_interval
+        self.snapshot = TicketSettings()
+        self._extra: dict = {}  # chaves desconhecidas, preservadas na gravação
+        self._listeners: list[Listener] = []
+        self._save_task: asyncio.Task | None = None
+        self._watcher: asyncio.Task | None = None
+        self._mtime: float | None = None
+        try:
+            self._apply(self._read(), notify=False)
+        except ConfigError as e:
+            # não sobrescreve o arquivo: o valor ruim fica lá para ser corrigido
+            print(f"[tickets] config inválida, usando os padrões: {e}")
+            return
+        if not os.path.isfile(path):
+            self._write(self.as_dict())  # migra o arquivo legado (configs/) para DATA_DIR
+
+    # ---- leitura ----
+
+    def get(self, key: str, default=None):
+        """Compatível com o antigo dict CONFIG."""
+        if key in _FIELDS:
+            return getattr(self.snapshot, key)
+        return self._extra.get(key, default)
+
+    def as_dict(self) -> dict:
+        return {**self._extra, **asdict(self.snapshot)}
+
+    def __repr__(self) -> str:
+        return repr(self.as_dict())
+
+    def subscribe(self, listener: Listener):
+        """listener(snapshot, chaves_alteradas) a cada mudança."""
+        self._listeners.append(listener)
+
+    def unsubscribe(self, listener: Listener):
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    # ---- escrita ----
+
+    def update(self, **changes):
+        """Aplica as mudanças em memória e agenda a gravação. ConfigError se algum valor for inválido."""
+        unknown = set(changes) - _FIELDS
+        if unknown:
+            raise KeyError(f"chave(s) de config desconhecida(s): {', '.join(sorted(unknown))}")
+        self._apply({**self.as_dict(), **changes})
+        self._schedule_save()
+
+    def _apply(self, data: dict, *, notify: bool = True):
+        new = build_settings(data)  # ConfigError antes de trocar qualquer coisa
+        old, self.snapshot = self.snapshot, new
+        self._extra = {k: v for k, v in data.items() if k not in _FIELDS}
+        changed = {k for k in _FIELDS if getattr(old, k) != getattr(new, k)}
+        if notify and changed:
+            for listener in list(self._listeners):
+                try:
+                    listener(new, changed)
+                except Exception as e:
+                    print(f"[tickets] listener de config falhou: {e!r}")
+
+    def _schedule_save(self):
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return self._write(self.as_dict())  # fora do loop (inicialização)
+        if self._save_task is None or self._save_task.done():
+            self._save_task = loop.create_task(self._save_later())
+
+    async def _save_later(self):
+        await asyncio.sleep(self.debounce)
+        await self.flush()
+
+    async def flush(self):
+        """Grava o snapshot atual agora (chamado também pelo /restart)."""
+        try:
+            await asyncio.to_thread(self._write, self.as_dict())
+        except Exception as e:
+            print(f"[tickets] falha ao gravar {self.path}: {e!r}")
+
+    # ---- arquivo ----
+
+    def _read(self) -> dict:
+        for path in (self.path, LEGACY_CONFIG_FILE):
+            if os.path.isfile(path):
+                with open(path, "r", encoding="utf-8") as f:
+                    data = json.load(f).get(CONFIG_KEY, {})
+                if path == self.path:
+                    self._mtime = os.path.getmtime(path)
+                return data
+        print("Creating default config file...")
+        data = asdict(TicketSettings())
+        self._write(data)
+        return data
+
+    def _write(self, data: dict):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(self.path) or ".", prefix=".ticket_config.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump({CONFIG_KEY: data}, f, indent=4, ensure_ascii=False)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, self.path)
+        except BaseException:
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
+            raise
+        self._mtime = os.path.getmtime(self.path)
+
+    # ---- hot reload de edições externas ----
+
+    def start(self):
+        if self._watcher is None:
+            self._watcher = asyncio.create_task(self._watch())
+
+    async def stop(self):
+        if self._watcher:
+            self._watcher.cancel()
+            self._watcher = None
+        if self._save_task and not self._save_task.done():
+            self._save_task.cancel()
+            await self.flush()
+
+    async def _watch(self):
+        while True:
+            await asyncio.sleep(self.watch_interval)
+            try:
+                mtime = await asyncio.to_thread(os.path.getmtime, self.path)
+            except OSError:
+                continue
+            if mtime == self._mtime or (self._save_task and not self._save_task.done()):
+                continue
+            try:
+                data = await asyncio.to_thread(self._read)
+                self._apply(data)
+            except (OSError, ValueError) as e:  # ConfigError é ValueError
+                print(f"[tickets] config inválida em {self.path}, mantendo a atual: {e}")
+                self._mtime = mtime
+                continue
+            print("[tickets] configuração recarregada do disco")
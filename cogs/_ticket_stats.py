@@ -0,0 +1,130 @@
+import os
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+import config
+from store import SQLiteStore
+
+# Analytics dos tickets: uma linha por ticket com os eventos do ciclo de vida (aberto,
+# assumido, fechado, avaliado). Banco separado do TicketStore para que consultas pesadas
+# do /ticket stats rodem na thread dele sem atrasar as escritas de estado dos tickets.
+
+DB_PATH = os.path.join(config.DATA_DIR, "ticket_stats.db")
+
+def normalize_category(category: Optional[str]) -> str:
+    """Mesma forma do extract_category (tópico): sem espaços nas pontas."""
+    return (category or "").strip() or "desconhecida"
+
+@dataclass
+class CategoryStats:
+    category: str
+    opened: int = 0
+    claimed: int = 0
+    closed: int = 0
+    rated: int = 0
+    avg_rating: Optional[float] = None
+    median_claim_sec: Optional[float] = None
+    median_close_sec: Optional[float] = None
+
+class TicketStatsStore(SQLiteStore):
+    """
+    Eventos do ciclo de vida por ticket (ticket_id = id do canal/thread). Escritas em lote
+    via SQLiteStore; summary() roda fora do loop e só lê o índice coberto
+    (guild_id, category, opened_at, ...): uma busca por intervalo por categoria.
+    """
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS tickets (
+        ticket_id INTEGER PRIMARY KEY,
+        guild_id INTEGER NOT NULL,
+        category TEXT NOT NULL,
+        author_id INTEGER,
+        opened_at REAL NOT NULL,
+        claimed_at REAL,
+        claimed_by INTEGER,
+        closed_at REAL,
+        closed_by INTEGER,
+        reason TEXT,
+        rating INTEGER
+    );
+    CREATE INDEX IF NOT EXISTS tickets_guild_category_time
+        ON tickets (guild_id, category, opened_at, claimed_at, closed_at, rating);
+    UPDATE tickets SET category = trim(category) WHERE category <> trim(category);
+    """
+
+    def __init__(self, path: str = DB_PATH):
+        super().__init__(path)
+
+    # ---- eventos ----
+
+    def opened(self, ticket_id: int, guild_id: int, category: str, author_id: int, ts: float | None = None):
+        self.write(
+            "INSERT OR IGNORE INTO tickets (ticket_id, guild_id, category, author_id, opened_at) VALUES (?, ?, ?, ?, ?)",
+            (ticket_id, guild_id, normalize_category(category), author_id, ts or time.time()),
+        )
+
+    def claimed(self, ticket_id: int, staff_id: int, ts: float | None = None):
+        """Só o primeiro 'Assumir' conta para o tempo até atendimento."""
+        self.write(
+            "UPDATE tickets SET claimed_at = ?, claimed_by = ? WHERE ticket_id = ? AND claimed_at IS NULL",
+            (ts or time.time(), staff_id, ticket_id),
+        )
+
+    def closed(self, ticket_id: int, guild_id: int, category: str, author_id: Optional[int],
+               opened_at: float, closed_by: Optional[int], reason: str, ts: float | None = None):
+        # tickets abertos antes do analytics entram aqui com opened_at vindo do snowflake
+        self.write(
+            "INSERT INTO tickets (ticket_id, guild_id, category, author_id, opened_at, closed_at, closed_by, reason) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT (ticket_id) DO UPDATE SET closed_at = excluded.closed_at, "
+            "closed_by = excluded.closed_by, reason = excluded.reason",
+            (ticket_id, guild_id, normalize_category(category), author_id, opened_at, ts or time.time(), closed_by, reason),
+        )
+
+    def rated(self, ticket_id: int, rating: int):
+        self.write("UPDATE tickets SET rating = ? WHERE ticket_id = ?", (rating, ticket_id))
+
+    # ---- consultas ----
+
+    async def summary(self, guild_id: int, since: float = 0.0) -> list[CategoryStats]:
+        """Agregados por categoria dos tickets abertos desde 'since'."""
+        await self.flush()
+        return await self._run(self._summary, guild_id, since)
+
+    def _summary(self, guild_id: int, since: float) -> list[CategoryStats]:
+        conn = self._conn
+        # categorias distintas pulando pelo índice (uma busca por categoria, sem varrer a guild)
+        categories = [c for (c,) in conn.execute(
+            "WITH RECURSIVE cats(c) AS ("
+            " SELECT min(category) FROM tickets WHERE guild_id = ?1"
+            " UNION ALL"
+            " SELECT (SELECT min(category) FROM tickets WHERE guild_id = ?1 AND category > c) FROM cats WHERE c IS NOT NULL"
+            ") SELECT c FROM cats WHERE c IS NOT NULL",
+            (guild_id,),
+        )]
+        out = []
+        for category in categories:
+            where = "guild_id = ? AND category = ? AND opened_at >= ?"
+            args = (guild_id, category, since)
+            opened, claimed, closed, rated, avg_rating = conn.execute(
+                f"SELECT count(*), count(claimed_at), count(closed_at), count(rating), avg(rating) FROM tickets WHERE {where}",
+                args,
+            ).fetchone()
+            if not opened:
+                continue
+            s = CategoryStats(category, opened, claimed, closed, rated, avg_rating)
+            s.median_claim_sec = self._median(conn, where, args, "claimed_at", claimed)
+            s.median_close_sec = self._median(conn, where, args, "closed_at", closed)
+            out.append(s)
+        return sorted(out, key=lambda s: -s.opened)
+
+    @staticmethod
+    def _median(conn, where: str, args: tuple, column: str, n: int) -> Optional[float]:
+        if not n:
+            return None
+        rows = conn.execute(
+            f"SELECT {column} - opened_at AS d FROM tickets WHERE {where} AND {column} IS NOT NULL "
+            "ORDER BY d LIMIT ? OFFSET ?",
+            (*args, 2 - n % 2, (n - 1) // 2),
+        ).fetchall()
+        return sum(d for (d,) in rows) / len(rows)
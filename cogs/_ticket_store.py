@@ -0,0 +1,107 @@
+import os
+import json
+
+import config
+from store import SQLiteStore
+
+DB_PATH = os.path.join(config.DATA_DIR, "tickets.db")
+
+class TicketStore(SQLiteStore):
+    """
+    Estado durável dos tickets: índice autor -> canal do ticket aberto (por guild),
+    jobs de encerramento em andamento, atividade para o SLA e os metadados dos tickets
+    em thread privada (threads não têm tópico). Escritas em lote via SQLiteStore.
+    """
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS open_tickets (
+        guild_id INTEGER NOT NULL,
+        author_id INTEGER NOT NULL,
+        channel_id INTEGER NOT NULL,
+        PRIMARY KEY (guild_id, author_id)
+    ) WITHOUT ROWID;
+    CREATE TABLE IF NOT EXISTS indexed_guilds (
+        guild_id INTEGER PRIMARY KEY
+    );
+    CREATE TABLE IF NOT EXISTS close_jobs (
+        channel_id INTEGER PRIMARY KEY,
+        job TEXT NOT NULL
+    );
+    CREATE TABLE IF NOT EXISTS sla (
+        channel_id INTEGER PRIMARY KEY,
+        guild_id INTEGER NOT NULL,
+        last_user REAL NOT NULL,
+        last_staff REAL NOT NULL,
+        warned INTEGER NOT NULL DEFAULT 0
+    );
+    CREATE TABLE IF NOT EXISTS ticket_threads (
+        thread_id INTEGER PRIMARY KEY,
+        guild_id INTEGER NOT NULL,
+        author_id INTEGER NOT NULL,
+        category TEXT NOT NULL
+    );
+    """
+
+    def __init__(self, path: str = DB_PATH):
+        super().__init__(path)
+
+    # ---- índice de tickets abertos ----
+
+    def save_open_ticket(self, guild_id: int, author_id: int, channel_id: int):
+        self.write(
+            "INSERT OR REPLACE INTO open_tickets (guild_id, author_id, channel_id) VALUES (?, ?, ?)",
+            (guild_id, author_id, channel_id),
+        )
+
+    def delete_open_ticket(self, guild_id: int, author_id: int):
+        self.write("DELETE FROM open_tickets WHERE guild_id = ? AND author_id = ?", (guild_id, author_id))
+
+    def mark_indexed(self, guild_id: int):
+        self.write("INSERT OR IGNORE INTO indexed_guilds (guild_id) VALUES (?)", (guild_id,))
+
+    async def load_open_tickets(self) -> tuple[list[tuple[int, int, int]], set[int]]:
+        """Retorna ([(guild_id, author_id, channel_id)], guilds já indexadas)."""
+        rows = await self.query("SELECT guild_id, author_id, channel_id FROM open_tickets")
+        indexed = {gid for (gid,) in await self.query("SELECT guild_id FROM indexed_guilds")}
+        return rows, indexed
+
+    # ---- jobs de encerramento ----
+
+    def save_close_job(self, job: dict):
+        self.write(
+            "INSERT OR REPLACE INTO close_jobs (channel_id, job) VALUES (?, ?)",
+            (job["channel_id"], json.dumps(job)),
+        )
+
+    def delete_close_job(self, channel_id: int):
+        self.write("DELETE FROM close_jobs WHERE channel_id = ?", (channel_id,))
+
+    async def load_close_jobs(self) -> list[dict]:
+        return [json.loads(job) for (job,) in await self.query("SELECT job FROM close_jobs")]
+
+    # ---- SLA ----
+
+    def save_sla(self, channel_id: int, guild_id: int, last_user: float, last_staff: float, warned: bool):
+        self.write(
+            "INSERT OR REPLACE INTO sla (channel_id, guild_id, last_user, last_staff, warned) VALUES (?, ?, ?, ?, ?)",
+            (channel_id, guild_id, last_user, last_staff, int(warned)),
+        )
+
+    def delete_sla(self, channel_id: int):
+        self.write("DELETE FROM sla WHERE channel_id = ?", (channel_id,))
+
+    async def load_sla(self) -> list[tuple[int, int, float, float, int]]:
+        return await self.query("SELECT channel_id, guild_id, last_user, last_staff, warned FROM sla")
+
+    # ---- tickets em thread privada ----
+
+    def save_thread(self, thread_id: int, guild_id: int, author_id: int, category: str):
+        self.write(
+            "INSERT OR REPLACE INTO ticket_threads (thread_id, guild_id, author_id, category) VALUES (?, ?, ?, ?)",
+            (thread_id, guild_id, author_id, category),
+        )
+
+    def delete_thread(self, thread_id: int):
+        self.write("DELETE FROM ticket_threads WHERE thread_id = ?", (thread_id,))
+
+    async def load_threads(self) -> list[tuple[int, int, int, str]]:
+        return await self.query("SELECT thread_id, guild_id, author_id, category FROM ticket_threads")
@@ -0,0 +1,581 @@
+import os
+import re
+import gzip
+import html
+import json
+import time
+import asyncio
+import datetime as dt
+from typing import Iterable
+
+import discord
+
+import config
+
+# Transcript HTML dos tickets gerado em streaming: o histórico é paginado (100 por vez),
+# cada página vira registros simples no loop e é renderizada numa thread, direto para
+# disco. Memória fica em ~1 página, qualquer que seja o tamanho do ticket. O arquivo
+# <nome>.html é temporário: vai para o canal de logs (o Discord mostra a prévia) e é
+# apagado. Com TRANSCRIPT_ARCHIVE_DAYS > 0 sai também <nome>.html.gz, mantido por esse
+# número de dias (prune_archives). Com a captura incremental ligada, o transcript sai
+# do log local (export_capture) sem buscar o histórico.
+#
+# A renderização segue o chat_exporter: markdown, menções, emojis, timestamps, embeds
+# completos, componentes (botões, selects e Components V2), anexos com prévia,
+# reações, respostas e stickers.
+
+TRANSCRIPT_DIR = os.path.join(config.DATA_DIR, "transcripts")
+PAGE_SIZE = 100
+
+_HEAD = """<!DOCTYPE html>
+<html lang="pt-br"><head><meta charset="utf-8"><title>{title}</title>
+<style>
+body{{background:#313338;color:#dbdee1;font-family:"gg sans","Helvetica Neue",Arial,sans-serif;font-size:15px;margin:0;padding:16px}}
+h1{{font-size:18px;color:#f2f3f5;margin:0 0 12px}}
+a{{color:#00a8fc;text-decoration:none}}
+.m{{display:flex;gap:12px;padding:4px 0}}
+.m img.av{{width:40px;height:40px;border-radius:50%;flex:none}}
+.b{{min-width:0;flex:1}}
+.a{{font-weight:600;color:#f2f3f5}} .t{{font-size:12px;color:#949ba4;margin-left:6px}}
+.bot{{background:#5865f2;color:#fff;font-size:10px;font-weight:600;border-radius:3px;padding:1px 4px;margin-left:4px}}
+.rp{{font-size:13px;color:#949ba4}}
+.c{{white-space:pre-wrap;word-wrap:break-word}}
+.c h1{{font-size:22px}} .c h2{{font-size:19px;margin:4px 0}} .c h3{{font-size:16px;margin:4px 0}}
+.c .sub{{font-size:12px;color:#949ba4}}
+.q{{border-left:4px solid #4e5058;padding-left:8px;margin:2px 0}}
+code{{background:#2b2d31;border-radius:3px;padding:0 3px;font-family:Consolas,monospace;font-size:85%}}
+pre{{background:#2b2d31;border:1px solid #1e1f22;border-radius:4px;padding:7px;margin:4px 0;white-space:pre-wrap}}
+pre code{{background:none;padding:0}}
+.sp{{background:#1e1f22;color:transparent;border-radius:3px}} .sp:hover{{color:inherit}}
+.mn{{background:rgba(88,101,242,.3);color:#c9cdfb;border-radius:3px;padding:0 2px}}
+.em{{width:22px;height:22px;vertical-align:bottom}} .emj .em{{width:48px;height:48px}}
+.e{{display:flex;border-left:4px solid #1e1f22;background:#2b2d31;padding:8px 12px;margin-top:4px;border-radius:4px;max-width:520px;gap:12px}}
+.eb{{min-width:0;flex:1}} .ea{{font-size:13px;font-weight:600}} .ea img,.ef img{{width:20px;height:20px;border-radius:50%;vertical-align:middle;margin-right:6px}}
+.et{{font-weight:600;color:#f2f3f5;margin:2px 0}}
+.efs{{display:flex;flex-wrap:wrap;gap:4px 12px;margin-top:6px}} .efl{{flex:1 1 100%}} .efl.i{{flex:1 1 28%}}
+.efn{{font-weight:600;font-size:13px}}
+.ef{{font-size:12px;color:#949ba4;margin-top:6px}}
+.ei{{max-width:100%;border-radius:4px;margin-top:8px}} .eth{{max-width:80px;max-height:80px;border-radius:4px}}
+.img{{max-width:400px;max-height:300px;border-radius:4px;margin-top:4px;display:block}}
+.att{{display:flex;gap:8px;background:#2b2d31;border:1px solid #1e1f22;border-radius:4px;padding:10px;margin-top:4px;max-width:420px}}
+.att small{{color:#949ba4}}
+.row{{display:flex;flex-wrap:wrap;gap:8px;margin-top:4px}}
+.btn{{border-radius:3px;padding:2px 16px;font-size:14px;color:#fff;line-height:28px}}
+.s1{{background:#5865f2}} .s2,.s5{{background:#4e5058}} .s3{{background:#248046}} .s4{{background:#da373c}} .s6{{background:#b4769e}}
+.dis{{opacity:.5}}
+.sel{{border:1px solid #1e1f22;background:#2b2d31;border-radius:4px;padding:6px 10px;min-width:280px;color:#949ba4}}
+.ctr{{border-left:4px solid #1e1f22;background:#2b2d31;border-radius:8px;padding:12px;margin-top:4px;max-width:560px}}
+.sec{{display:flex;gap:12px;justify-content:space-between}}
+.gal{{display:flex;flex-wrap:wrap;gap:4px}} .gal img{{max-width:270px;max-height:200px;border-radius:4px}}
+hr{{border:none;border-top:1px solid #3f4147;margin:8px 0}} .gap{{height:8px}} .gap2{{height:16px}}
+.rx{{display:inline-block;background:#2b2d31;border:1px solid #1e1f22;border-radius:8px;padding:1px 6px;margin:4px 4px 0 0;font-size:13px}}
+.rx .em{{width:16px;height:16px}}
+.stk{{width:160px;height:160px}}
+</style></head><body><h1>{title}</h1>
+"""
+_TAIL = "<p class=\"t\">{count} mensagem(ns)</p></body></html>\n"
+
+def transcript_path(filename: str) -> str:
+    return os.path.join(TRANSCRIPT_DIR, filename)
+
+def archive_path(filename: str) -> str:
+    return transcript_path(filename) + ".gz"
+
+def remove_transcript(filename: str):
+    """Apaga a cópia .html de upload; o .html.gz (se houver retenção) fica até o prune."""
+    try:
+        os.remove(transcript_path(filename))
+    except OSError:
+        pass
+
+def prune_archives(max_age_days: float | None = None) -> int:
+    """Apaga os .html.gz mais velhos que a retenção (roda numa thread). Retorna quantos saíram."""
+    days = config.TRANSCRIPT_ARCHIVE_DAYS if max_age_days is None else max_age_days
+    cutoff = time.time() - days * 86400
+    removed = 0
+    try:
+        entries = list(os.scandir(TRANSCRIPT_DIR))
+    except OSError:
+        return 0
+    for entry in entries:
+        if not entry.name.endswith(".html.gz"):
+            continue
+        try:
+            if entry.stat().st_mtime < cutoff:
+                os.remove(entry.path)
+                removed += 1
+        except OSError:
+            pass
+    return removed
+
+# ---------------------------------- registros ---------------------------------
+
+def _member_name(m) -> str:
+    return getattr(m, "display_name", None) or m.name
+
+def message_record(msg: discord.Message) -> dict:
+    """Extrai só o que o transcript usa (barato, roda no loop). Tudo serializável em JSON."""
+    author = msg.author
+    components = []
+    for c in msg.components:
+        try:
+            components.append(c.to_dict())
+        except Exception:
+            pass  # tipo de componente sem serialização nesta versão da lib
+    reactions = []
+    for r in msg.reactions:
+        e = r.emoji
+        url = getattr(e, "url", None) if not isinstance(e, str) else None
+        reactions.append({"emoji": str(e), "name": getattr(e, "name", None) or str(e), "url": str(url) if url else None, "count": r.count})
+    return {
+        "id": msg.id,
+        "author_id": author.id,
+        "author": _member_name(author),
+        "avatar": author.display_avatar.url if author.display_avatar else None,
+        "bot": author.bot,
+        "ts": msg.created_at.timestamp(),
+        "edited_ts": msg.edited_at.timestamp() if msg.edited_at else None,
+        "content": msg.content or "",
+        "attachments": [
+            {"filename": a.filename, "url": a.url, "content_type": a.content_type, "size": a.size}
+            for a in msg.attachments
+        ],
+        "embeds": [e.to_dict() for e in msg.embeds],
+        "components": components,
+        "reactions": reactions,
+        "stickers": [{"name": s.name, "url": s.url} for s in msg.stickers],
+        "reply_to": msg.reference.message_id if msg.reference and msg.reference.message_id else None,
+        "mentions": {
+            "u": {str(u.id): _member_name(u) for u in msg.mentions},
+            "r": {str(r.id): [r.name, r.colour.value] for r in msg.role_mentions},
+            "c": {str(c.id): c.name for c in msg.channel_mentions},
+        },
+    }
+
+def raw_mentions(data: dict) -> dict:
+    """Mapa de menções a partir de um payload cru (MESSAGE_UPDATE)."""
+    users = {}
+    for u in data.get("mentions") or ():
+        member = u.get("member") or {}
+        users[str(u["id"])] = member.get("nick") or u.get("global_name") or u.get("username") or u["id"]
+    return {"u": users, "r": {}, "c": {}}
+
+def merge_record(rec: dict, update: dict):
+    """Aplica uma edição capturada ao registro (menções se somam, o resto substitui)."""
+    for k, v in update.items():
+        if k == "mentions":
+            m = rec.setdefault("mentions", {})
+            for kind, names in v.items():
+                m.setdefault(kind, {}).update(names)
+        else:
+            rec[k] = v
+
+# --------------------------------- markdown -----------------------------------
+
+_CODEBLOCK_RX = re.compile(r"```(?:([\w+-]+)\n)?(.*?)```", re.S)
+_INLINE_CODE_RX = re.compile(r"`([^`\n]+)`")
+_TOKEN_RX = re.compile(
+    r"<@!?(?P<user>\d+)>"
+    r"|<@&(?P<role>\d+)>"
+    r"|<#(?P<chan>\d+)>"
+    r"|<(?P<anim>a?):(?P<ename>\w+):(?P<eid>\d+)>"
+    r"|<t:(?P<ts>-?\d+)(?::(?P<tsfmt>[tTdDfFR]))?>"
+    r"|\[(?P<ltext>[^\]\n]+)\]\(<?(?P<lurl>https?://[^\s)>]+)>?\)"
+    r"|<?(?P<url>https?://[^\s<>]+[^\s<>.,:;\"')\]])>?"
+    r"|(?P<everyone>@everyone|@here)"
+)
+_INLINE_FMT = (
+    (re.compile(r"\*\*(.+?)\*\*"), r"<b>\1</b>"),
+    (re.compile(r"__(.+?)__"), r"<u>\1</u>"),
+    (re.compile(r"\*(?!\s)(.+?)(?<!\s)\*"), r"<i>\1</i>"),
+    (re.compile(r"(?<![\w])_(?!\s)(.+?)(?<!\s)_(?![\w])"), r"<i>\1</i>"),
+    (re.compile(r"~~(.+?)~~"), r"<s>\1</s>"),
+    (re.compile(r"\|\|(.+?)\|\|"), r'<span class="sp">\1</span>'),
+)
+_HEADER_RX = re.compile(r"^(#{1,3}) (.+)$", re.M)
+_SUBTEXT_RX = re.compile(r"^-# (.+)$", re.M)
+_QUOTE_RX = re.compile(r"^&gt; ?(.*)$", re.M)
+_PLACEHOLDER_RX = re.compile("\x00(\\d+)\x00")
+_BLOCK_NL_RX = re.compile(r"(</h[123]>|</div>)\n")  # blocos já quebram linha (o .c é pre-wrap)
+_TS_FMT = {"t": "%H:%M", "T": "%H:%M:%S", "d": "%d/%m/%Y", "D": "%d de %B de %Y", "f": "%d/%m/%Y %H:%M",
+           "F": "%A, %d/%m/%Y %H:%M", "R": "%d/%m/%Y %H:%M"}
+_EMOJI_CDN = "https://cdn.discordapp.com/emojis/{id}.{ext}"
+
+def _emoji_img(name: str, eid: str, animated: bool) -> str:
+    src = _EMOJI_CDN.format(id=eid, ext="gif" if animated else "png")
+    return f'<img class="em" src="{src}" alt=":{html.escape(name)}:" title=":{html.escape(name)}:">'
+
+def _token(m: re.Match, mentions: dict, tz) -> str:
+    esc = html.escape
+    if m["user"]:
+        name = (mentions.get("u") or {}).get(m["user"])
+        return f'<span class="mn" title="{m["user"]}">@{esc(name or m["user"])}</span>'
+    if m["role"]:
+        name, color = ((mentions.get("r") or {}).get(m["role"]) or (None, 0))
+        style = f' style="color:#{color:06x};background:#{color:06x}26"' if color else ""
+        return f'<span class="mn"{style} title="{m["role"]}">@{esc(name or "cargo")}</span>'
+    if m["chan"]:
+        name = (mentions.get("c") or {}).get(m["chan"])
+        return f'<span class="mn" title="{m["chan"]}">#{esc(name or m["chan"])}</span>'
+    if m["eid"]:
+        return _emoji_img(m["ename"], m["eid"], bool(m["anim"]))
+    if m["ts"]:
+        try:
+            when = dt.datetime.fromtimestamp(int(m["ts"]), tz)
+        except (OverflowError, OSError, ValueError):
+            return esc(m[0])
+        return f'<code title="{when.isoformat()}">{when.strftime(_TS_FMT[m["tsfmt"] or "f"])}</code>'
+    if m["lurl"]:
+        return f'<a href="{esc(m["lurl"])}">{_inline(m["ltext"], mentions, tz)}</a>'
+    if m["url"]:
+        return f'<a href="{esc(m["url"])}">{esc(m["url"])}</a>'
+    return f'<span class="mn">{m["everyone"]}</span>'
+
+def _inline(text: str, mentions: dict, tz) -> str:
+    """Texto sem blocos de código: tokens atômicos viram placeholders, escapa, formata."""
+    saved: list[str] = []
+
+    def keep(fragment: str) -> str:
+        saved.append(fragment)
+        return f"\x00{len(saved) - 1}\x00"
+
+    text = _INLINE_CODE_RX.sub(lambda m: keep(f"<code>{html.escape(m[1])}</code>"), text)
+    text = _TOKEN_RX.sub(lambda m: keep(_token(m, mentions, tz)), text)
+    text = html.escape(text)
+    for rx, repl in _INLINE_FMT:
+        text = rx.sub(repl, text)
+    text = _SUBTEXT_RX.sub(r'<span class="sub">\1</span>', text)
+    text = _HEADER_RX.sub(lambda m: f"<h{len(m[1])}>{m[2]}</h{len(m[1])}>", text)
+    text = _QUOTE_RX.sub(r'<div class="q">\1</div>', text)
+    text = _BLOCK_NL_RX.sub(r"\1", text)
+    return _PLACEHOLDER_RX.sub(lambda m: saved[int(m[1])], text)
+
+def markdown(text: str, mentions: dict | None = None, tz=dt.timezone.utc) -> str:
+    """Markdown do Discord -> HTML (blocos de código, formatação, menções, emojis, timestamps)."""
+    mentions = mentions or {}
+    out = []
+    pos = 0
+    for m in _CODEBLOCK_RX.finditer(text):
+        out.append(_inline(text[pos:m.start()], mentions, tz))
+        out.append(f"<pre><code>{html.escape(m[2].strip(chr(10)))}</code></pre>")
+        pos = m.end()
+    out.append(_inline(text[pos:], mentions, tz))
+    return "".join(out)
+
+# ------------------------------ embeds / anexos --------------------------------
+
+def _fmt_ts(ts: float, tz) -> str:
+    return dt.datetime.fromtimestamp(ts, tz).strftime("%d/%m/%Y %H:%M")
+
+def _render_embed(e, mentions: dict, tz) -> str:
+    esc = html.escape
+    if isinstance(e, (list, tuple)):  # registros antigos: (título, descrição)
+        e = {"title": e[0], "description": e[1]}
+    if e.get("type") in ("image", "gifv") and (e.get("thumbnail") or {}).get("url"):
+        # prévia de link só com imagem/gif: o Discord mostra a mídia, sem caixa
+        return f'<img class="img" src="{esc(e["thumbnail"]["url"])}">'
+    color = e.get("color")
+    style = f' style="border-left-color:#{color:06x}"' if isinstance(color, int) else ""
+    body = []
+    author = e.get("author") or {}
+    if author.get("name"):
+        icon = f'<img src="{esc(author["icon_url"])}">' if author.get("icon_url") else ""
+        name = esc(author["name"])
+        if author.get("url"):
+            name = f'<a href="{esc(author["url"])}">{name}</a>'
+        body.append(f'<div class="ea">{icon}{name}</div>')
+    if e.get("title"):
+        title = markdown(e["title"], mentions, tz)
+        if e.get("url"):
+            title = f'<a href="{esc(e["url"])}">{title}</a>'
+        body.append(f'<div class="et">{title}</div>')
+    if e.get("description"):
+        body.append(f'<div class="c">{markdown(e["description"], mentions, tz)}</div>')
+    fields = e.get("fields") or []
+    if fields:
+        body.append('<div class="efs">')
+        for f in fields:
+            cls = "efl i" if f.get("inline") else "efl"
+            body.append(f'<div class="{cls}"><div class="efn">{markdown(f.get("name") or "", mentions, tz)}</div>'
+                        f'<div class="c">{markdown(f.get("value") or "", mentions, tz)}</div></div>')
+        body.append("</div>")
+    if (e.get("image") or {}).get("url"):
+        body.append(f'<img class="ei" src="{esc(e["image"]["url"])}">')
+    footer = e.get("footer") or {}
+    when = e.get("timestamp")
+    if footer.get("text") or when:
+        icon = f'<img src="{esc(footer["icon_url"])}">' if footer.get("icon_url") else ""
+        parts = [esc(footer.get("text") or "")]
+        if when:
+            try:
+                parts.append(dt.datetime.fromisoformat(when).astimezone(tz).strftime("%d/%m/%Y %H:%M"))
+            except ValueError:
+                pass
+        body.append(f'<div class="ef">{icon}{" • ".join(p for p in parts if p)}</div>')
+    thumb = (e.get("thumbnail") or {}).get("url")
+    side = f'<img class="eth" src="{esc(thumb)}">' if thumb else ""
+    return f'<div class="e"{style}><div class="eb">{"".join(body)}</div>{side}</div>'
+
+def _size(n) -> str:
+    if not isinstance(n, int):
+        return ""
+    for unit in ("B", "KB", "MB"):
+        if n < 1024:
+            return f"{n:.0f} {unit}" if unit == "B" else f"{n:.2f} {unit}"
+        n /= 1024
+    return f"{n:.2f} GB"
+
+def _render_attachment(a) -> str:
+    esc = html.escape
+    if isinstance(a, (list, tuple)):  # registros antigos: (nome, url)
+        a = {"filename": a[0], "url": a[1]}
+    name, url = a.get("filename") or "arquivo", a.get("url") or ""
+    ctype = (a.get("content_type") or "").split(";")[0]
+    ext = name.rsplit(".", 1)[-1].lower()
+    if ctype.startswith("image/") or ext in ("png", "jpg", "jpeg", "gif", "webp"):
+        return f'<a href="{esc(url)}"><img class="img" src="{esc(url)}" alt="{esc(name)}"></a>'
+    if ctype.startswith("video/") or ext in ("mp4", "webm", "mov"):
+        return f'<video class="img" controls preload="metadata" src="{esc(url)}"></video>'
+    if ctype.startswith("audio/") or ext in ("mp3", "ogg", "wav", "m4a"):
+        return f'<div class="att"><div><a href="{esc(url)}">{esc(name)}</a><br><audio controls preload="metadata" src="{esc(url)}"></audio></div></div>'
+    return f'<div class="att">&#128196;<div><a href="{esc(url)}">{esc(name)}</a><br><small>{_size(a.get("size"))}</small></div></div>'
+
+# ------------------------------- componentes -----------------------------------
+
+def _emoji_html(emoji) -> str:
+    if not isinstance(emoji, dict):
+        return ""
+    if emoji.get("id"):
+        return _emoji_img(emoji.get("name") or "emoji", str(emoji["id"]), bool(emoji.get("animated")))
+    return html.escape(emoji.get("name") or "")
+
+def _media_url(media) -> str:
+    return html.escape((media or {}).get("url") or "") if isinstance(media, dict) else ""
+
+def _render_component(c: dict, mentions: dict, tz) -> str:
+    esc = html.escape
+    t = c.get("type")
+    kids = c.get("components") or []
+    if t == 1:  # action row
+        return f'<div class="row">{"".join(_render_component(k, mentions, tz) for k in kids)}</div>'
+    if t == 2:  # botão
+        style = c.get("style", 2)
+        dis = " dis" if c.get("disabled") else ""
+        label = f'{_emoji_html(c.get("emoji"))} {esc(c.get("label") or "")}'.strip()
+        if style == 5 and c.get("url"):
+            return f'<a class="btn s5{dis}" href="{esc(c["url"])}">{label} &#8599;</a>'
+        return f'<span class="btn s{style}{dis}">{label}</span>'
+    if t in (3, 5, 6, 7, 8):  # selects
+        return f'<span class="sel">{esc(c.get("placeholder") or "Faça uma seleção")}</span>'
+    if t == 9:  # section
+        texts = "".join(_render_component(k, mentions, tz) for k in kids)
+        acc = c.get("accessory")
+        side = _render_component(acc, mentions, tz) if isinstance(acc, dict) else ""
+        return f'<div class="sec"><div>{texts}</div><div>{side}</div></div>'
+    if t == 10:  # text display
+        return f'<div class="c">{markdown(c.get("content") or "", mentions, tz)}</div>'
+    if t == 11:  # thumbnail
+        return f'<img class="eth" src="{_media_url(c.get("media"))}">'
+    if t == 12:  # media gallery
+        imgs = "".join(f'<a href="{_media_url(i.get("media"))}"><img src="{_media_url(i.get("media"))}"></a>'
+                       for i in c.get("items") or () if isinstance(i, dict))
+        return f'<div class="gal">{imgs}</div>'
+    if t == 13:  # file
+        url = _media_url(c.get("file"))
+        return f'<div class="att">&#128196;<a href="{url}">{url.rsplit("/", 1)[-1] or "arquivo"}</a></div>'
+    if t == 14:  # separator
+        if c.get("divider", True):
+            return "<hr>"
+        return '<div class="gap2"></div>' if c.get("spacing") == 2 else '<div class="gap"></div>'
+    if t == 17:  # container
+        color = c.get("accent_color")
+        style = f' style="border-left-color:#{color:06x}"' if isinstance(color, int) else ""
+        return f'<div class="ctr"{style}>{"".join(_render_component(k, mentions, tz) for k in kids)}</div>'
+    return ""
+
+# --------------------------------- mensagens -----------------------------------
+
+_ONLY_EMOJI_RX = re.compile(r"^(?:\s*<a?:\w+:\d+>\s*){1,27}$")
+
+def _render(records: Iterable[dict], tz) -> str:
+    esc = html.escape
+    out = []
+    for r in records:
+        mentions = r.get("mentions") or {}
+        when = _fmt_ts(r["ts"], tz)
+        if r.get("edited_ts"):
+            when += " (editada)"
+        avatar = f'<img class="av" src="{esc(r["avatar"])}">' if r.get("avatar") else '<div style="width:40px"></div>'
+        parts = [f'<div class="m" id="m{r["id"]}">{avatar}<div class="b">']
+        if r.get("reply_to"):
+            parts.append(f'<div class="rp">&#8618; <a href="#m{r["reply_to"]}">respondendo a uma mensagem</a></div>')
+        badge = '<span class="bot">BOT</span>' if r.get("bot") else ""
+        parts.append(f'<span class="a" title="{r["author_id"]}">{esc(r["author"])}</span>{badge}'
+                     f'<span class="t">{when}</span>')
+        content = r.get("content") or ""
+        if content:
+            big = " emj" if _ONLY_EMOJI_RX.match(content) else ""
+            parts.append(f'<div class="c{big}">{markdown(content, mentions, tz)}</div>')
+        for e in r.get("embeds") or ():
+            parts.append(_render_embed(e, mentions, tz))
+        for a in r.get("attachments") or ():
+            parts.append(_render_attachment(a))
+        for s in r.get("stickers") or ():
+            parts.append(f'<img class="stk" src="{esc(s.get("url") or "")}" alt="{esc(s.get("name") or "")}" title="{esc(s.get("name") or "")}">')
+        for c in r.get("components") or ():
+            if isinstance(c, dict):
+                parts.append(_render_component(c, mentions, tz))
+        reactions = r.get("reactions") or ()
+        if reactions:
+            parts.append("<div>")
+            for rx in reactions:
+                icon = f'<img class="em" src="{esc(rx["url"])}" alt="{esc(rx["name"])}">' if rx.get("url") else esc(rx.get("emoji") or "")
+                parts.append(f'<span class="rx">{icon} {rx.get("count", 1)}</span>')
+            parts.append("</div>")
+        parts.append("</div></div>\n")
+        out.append("".join(parts))
+    return "".join(out)
+
+class TranscriptWriter:
+    """
+    Escreve o transcript em <TRANSCRIPT_DIR>/<nome> (HTML puro, para o upload) e, com
+    retenção ligada, <nome>.gz (cópia comprimida em disco). Cada write() renderiza e grava
+    numa thread; chamadas são sequenciais (uma página por vez).
+    """
+    def __init__(self, filename: str, title: str, tz=dt.timezone.utc):
+        self.filename = filename
+        self.path = transcript_path(filename)
+        self.archive = archive_path(filename) if config.TRANSCRIPT_ARCHIVE_DAYS > 0 else None
+        self.title = title
+        self.tz = tz
+        self.count = 0
+        self._fh = None
+        self._gz: gzip.GzipFile | None = None
+
+    def _emit(self, chunk: str):
+        self._fh.write(chunk)
+        if self._gz is not None:
+            self._gz.write(chunk)
+
+    def _open(self):
+        os.makedirs(TRANSCRIPT_DIR, exist_ok=True)
+        self._fh = open(self.path, "w", encoding="utf-8")
+        if self.archive:
+            self._gz = gzip.open(self.archive, "wt", encoding="utf-8", compresslevel=6)
+        self._emit(_HEAD.format(title=html.escape(self.title)))
+
+    def _write(self, records: list[dict]):
+        self._emit(_render(records, self.tz))
+
+    def _close(self):
+        self._emit(_TAIL.format(count=self.count))
+        self._abort()
+
+    def _abort(self):
+        for fh in (self._fh, self._gz):
+            if fh is not None:
+                fh.close()
+        self._fh = self._gz = None
+
+    async def open(self):
+        await asyncio.to_thread(self._open)
+
+    async def write(self, records: list[dict]):
+        if records:
+            self.count += len(records)
+            await asyncio.to_thread(self._write, records)
+
+    async def close(self):
+        if self._fh is not None:
+            await asyncio.to_thread(self._close)
+
+    def discard(self):
+        remove_transcript(self.filename)
+        if self.archive:
+            try:
+                os.remove(self.archive)
+            except OSError:
+                pass
+
+async def export_channel(channel: discord.TextChannel, filename: str, *, tz=dt.timezone.utc, after: discord.abc.Snowflake | None = None) -> TranscriptWriter:
+    """
+    Gera o transcript do canal inteiro (ou só depois de 'after') em disco.
+    A renderização de uma página corre na thread enquanto a próxima é buscada.
+    """
+    writer = TranscriptWriter(filename, f"Transcript de #{channel.name}", tz)
+    await writer.open()
+    pending: asyncio.Task | None = None
+    page: list[dict] = []
+    try:
+        async for msg in channel.history(limit=None, after=after, oldest_first=True):
+            page.append(message_record(msg))
+            if len(page) >= PAGE_SIZE:
+                if pending:
+                    await pending
+                pending = asyncio.create_task(writer.write(page))
+                page = []
+        if pending:
+            await pending
+        await writer.write(page)
+        await writer.close()
+    except BaseException:
+        if pending:
+            await asyncio.gather(pending, return_exceptions=True)  # a thread não pode ser interrompida
+        try:
+            await writer.close()
+        finally:
+            writer.discard()
+        raise
+    return writer
+
+def _capture_records(log_path: str):
+    with open(log_path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                yield json.loads(line)
+            except ValueError:
+                continue  # linha cortada (queda no meio de uma gravação)
+
+def _render_capture(log_path: str, writer: TranscriptWriter):
+    # 1ª passada: edições e exclusões (poucas); 2ª: mensagens em ordem, página a página
+    edits: dict[int, dict] = {}
+    deleted: set[int] = set()
+    for rec in _capture_records(log_path):
+        if rec["op"] == "edit":
+            e = edits.setdefault(rec["id"], {})
+            merge_record(e, {k: v for k, v in rec.items() if v is not None and k not in ("op", "id")})
+        elif rec["op"] == "del":
+            deleted.add(rec["id"])
+
+    writer._open()
+    seen: set[int] = set()
+    page: list[dict] = []
+    for rec in _capture_records(log_path):
+        if rec["op"] != "msg":
+            continue
+        mid = rec["id"]
+        if mid in seen or mid in deleted:
+            continue
+        seen.add(mid)
+        if mid in edits:
+            merge_record(rec, edits[mid])
+        page.append(rec)
+        if len(page) >= PAGE_SIZE:
+            writer.count += len(page)
+            writer._write(page)
+            page = []
+    if page:
+        writer.count += len(page)
+        writer._write(page)
+    writer._close()
+
+async def export_capture(log_path: str, filename: str, title: str, *, tz=dt.timezone.utc) -> TranscriptWriter:
+    """Gera o transcript a partir de um log de captura (tudo numa thread, sem REST)."""
+    writer = TranscriptWriter(filename, title, tz)
+    try:
+        await asyncio.to_thread(_render_capture, log_path, writer)
+    except BaseException:
+        writer._abort()
+        writer.discard()
+        raise
+    return writer
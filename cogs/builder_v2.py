@@ -1,12 +1,16 @@
 import re
-import aiohttp
+import json
+import shlex
 import asyncio
 import secrets
 import discord
 from discord.ext import commands
 
-WEBHOOK_NAME = "Frizz"
-WEBHOOK_AVATAR = "https://cdn.discordapp.com/attachments/781008768925433876/1410721715264426148/frizz-logo-test.png"
+import config
+import zwcodec
+from cogs._card_templates import CardTemplateStore, TemplateError, TemplateLibrary
+from cogs._components_v2 import validate
+from webhook_registry import WEBHOOK_AVATAR, WEBHOOK_NAME
 
 # ---- Components V2 type ids (confirmed in modern API typings)
 # TextDisplay=10, Thumbnail=11, MediaGallery=12, File=13, Separator=14, Container=17, ActionRow=1, Button=2
@@ -16,16 +20,13 @@ WEBHOOK_AVATAR = "https://cdn.discordapp.com/attachments/781008768925433876/1410
 # ---------------------------------------------------------------
 
 COMP_FLAG = 1 << 15  # IS_COMPONENTS_V2
+SCRIPT_MAX_BYTES = 64 * 1024  # anexo do modo script
 
 URL_RX = re.compile(r"^https?://", re.I)
 
-# marcador invisível (start/end) e codificador
-ZW_START = "\u2063\u2063"
-ZW_END = "\u2063\u2063"
-
+# marcador invisível (ver zwcodec: v2, 4 símbolos por byte)
 def _zw_encode_token(token: str) -> str:
-    bits = "".join(f"{ord(c):08b}" for c in token)
-    return ZW_START + "".join("\u200b" if b == "0" else "\u200c" for b in bits) + ZW_END
+    return zwcodec.encode(token)
 
 def ensure_with_components(url: str) -> str:
     return url if "with_components=" in url else (url + ("&" if "?" in url else "?") + "with_components=true")
@@ -43,9 +44,13 @@ def parse_hex_color(s: str | None) -> int | None:
 def valid_url(u: str) -> bool:
     return bool(URL_RX.match(u))
 
+class CardSyntaxError(ValueError):
+    """Linha inválida para o construtor; a mensagem é a dica de uso mostrada ao usuário."""
+
 class CardSession:
     """Holds the in-progress Components V2 message for one user."""
-    __slots__ = ("author_id", "build_channel", "top_components", "container_stack","history")
+    __slots__ = ("author_id", "build_channel", "top_components", "container_stack","history",
+                 "preview_channel", "preview_id", "auto_preview", "preview_dirty", "preview_task", "preview_last")
 
     def __init__(self, author_id: int, build_channel: discord.TextChannel):
         self.author_id = author_id
@@ -53,6 +58,13 @@ class CardSession:
         self.top_components: list[dict] = []           # final message components
         self.container_stack: list[dict] = []           # stack of container dicts
         self.history: list[dict] = []  # pilha de ações para desfazer
+        # preview editado no lugar: uma mensagem de webhook por sessão, PATCH a cada render
+        self.preview_channel: discord.TextChannel | None = None
+        self.preview_id: int | None = None
+        self.auto_preview = False
+        self.preview_dirty = False
+        self.preview_task: asyncio.Task | None = None
+        self.preview_last = 0.0
 
     @property
     def target(self) -> list[dict]:
@@ -110,46 +122,441 @@ class CardSession:
             return "Container removido."
         return "Nada para apagar."
 
+    # ---- gramática (uma linha = um elemento/comando) ----
+
+    def apply(self, raw: str) -> str:
+        """
+        Aplica uma linha do construtor. Retorna a resposta; CardSyntaxError se a linha for
+        inválida ou se o elemento estourar um limite do Components V2 (aí ele é desfeito).
+        """
+        before = len(self.history)
+        reply = self._apply(raw)
+        if len(self.history) > before:
+            report = validate(self.top_components, partial=True)
+            if not report.ok:
+                self.undo()
+                raise CardSyntaxError("Elemento recusado: " + "; ".join(str(e) for e in report.errors[:5]))
+        return reply
+
+    def _apply(self, raw: str) -> str:
+        upper = raw.upper()
+
+        if upper == "EXIT":
+            if self.close_container():
+                return "Você está agora **fora** do container."
+            return "Você não estava dentro de um container."
+
+        if upper == "APAGAR":
+            return self.undo()
+
+        if upper.startswith("TEXT:") or upper.startswith("TEXT "):
+            content = raw.split(":", 1)[1].strip() if ":" in raw else raw.split(" ", 1)[1].strip()
+            if not content:
+                raise CardSyntaxError("Usagem: `TEXT: seu texto`")
+            self.add_component({"type": 10, "content": content})
+            return "Texto adicionado."
+
+        if upper.startswith("CONTAINER"):
+            parts = raw.split(maxsplit=1)
+            color = parse_hex_color(parts[1]) if len(parts) > 1 else None
+            self.open_container(color)
+            tip = f"com cor `#{parts[1].lstrip('#')}`" if len(parts) > 1 and color is not None else "sem cor"
+            return f"Container aberto ({tip}). Digite **EXIT** para sair do container."
+
+        if upper.startswith("BANNER_IMG"):
+            parts = raw.split(maxsplit=1)
+            if len(parts) < 2 or not valid_url(parts[1]):
+                raise CardSyntaxError("Usagem: `BANNER_IMG https://...`")
+            self.add_component({
+                "type": 12,  # MediaGallery
+                "items": [{"media": {"url": parts[1]}, "description": None}]
+            })
+            return "Banner adicionado."
+
+        if upper.startswith("THUMBNAIL"):
+            parts = raw.split(maxsplit=1)
+            if len(parts) < 2 or not valid_url(parts[1]):
+                raise CardSyntaxError("Usagem: `THUMBNAIL https://...`")
+            section = {
+                "type": 9,  # Section
+                "components": [{"type": 10, "content": "\u200b"}],  # zero-width spacer
+                "accessory": {
+                    "type": 11,  # Thumbnail
+                    "media": {"url": parts[1]},
+                    "description": None
+                }
+            }
+            self.add_component(section)
+            return "Thumbnail adicionada."
+
+        if upper.startswith("DIVIDER"):
+            self.add_component({"type": 14, "divider": True})
+            return "Divisor adicionado."
+
+        if upper.startswith("LINK_BUTTON_ROW"):
+            parts = raw.split(maxsplit=2)
+            if len(parts) < 3 or not valid_url(parts[1]):
+                raise CardSyntaxError("Usagem: `LINK_BUTTON_ROW https://... Nome do Botão`")
+            url, label = parts[1], parts[2]
+            button = {"type": 2, "style": 5, "label": label, "url": url}
+
+            # se o último componente já for uma Action Row com <5 botões, reaproveita
+            if self.target and isinstance(self.target[-1], dict) \
+            and self.target[-1].get("type") == 1 \
+            and len(self.target[-1].get("components", [])) < 5:
+                row = self.target[-1]["components"]
+                row.append(button)
+                self.history.append({"t": "append", "lst": row, "obj": button})
+            else:
+                self.add_component({"type": 1, "components": [button]})
+            return "Botão de link adicionado na mesma linha."
+
+        if upper.startswith("LINK_BUTTON"):
+            # LINK_BUTTON <url> <label...>
+            parts = raw.split(maxsplit=2)
+            if len(parts) < 3 or not valid_url(parts[1]):
+                raise CardSyntaxError("Usagem: `LINK_BUTTON https://... Nome do Botão`")
+            url, label = parts[1], parts[2]
+            self.add_component({
+                "type": 1,  # Action Row
+                "components": [
+                    {"type": 2, "style": 5, "label": label, "url": url}
+                ]
+            })
+            return "Botão de link adicionado."
+
+        if upper.startswith("GAW_BUTTON"):
+            parts = raw.split(maxsplit=2)
+            if len(parts) < 3:
+                raise CardSyntaxError("usagem giveaway: nome gid")
+            gid, label = parts[1].strip(), parts[2].strip()
+            self.add_component({
+                "type": 1,
+                "components": [
+                    {"type": 2, "style": 1, "label": label, "custom_id": f"gaw:join:{gid}"},
+                ]
+            })
+            return "botao adicionado"
+
+        if upper.startswith("GAW_COUNT"):
+            parts = raw.split(maxsplit=2)
+            if len(parts) < 3:
+                raise CardSyntaxError("Usagem: GIVEAWAY_COUNT <gid> <rotulo>")
+            gid, label = parts[1].strip(), parts[2].strip()
+            marker = _zw_encode_token(f"gaw:count:{gid}")
+            self.add_component({"type": 10, "content": f"{label}: 0{marker}"})
+            return "contador adicionado"
+
+        if upper.startswith("GAW_TEMPO"):
+            parts = raw.split(maxsplit=2)
+            if len(parts) < 3:
+                raise CardSyntaxError("Usagem: TEMPO <gid> <rotulo>")
+            gid, label = parts[1].strip(), parts[2].strip()
+            marker = _zw_encode_token(f"gaw:time:{gid}")
+            self.add_component({"type": 10, "content": f"{label} {marker}"})
+            return "tempo adicionado"
+
+        raise CardSyntaxError(
+            "Entrada desconhecida. Tente uma das seguintes: `TEXT:`, `CONTAINER [#hex]`, `BANNER_IMG`, "
+            "`THUMBNAIL`, `DIVIDER`, ,`LINK_BUTTON_ROW`, `LINK_BUTTON`, `PREVIEW`, `APAGAR`, `EXIT`, `DONE`."
+        )
+
+    def run_script(self, lines: list[str]) -> tuple[list[str], bool, str | None]:
+        """
+        Modo script: aplica todas as linhas numa passada com a mesma gramática do modo
+        interativo. Retorna (erros com número da linha, preview pedido, nome do SAVE).
+        DONE encerra o script.
+        """
+        errors = []
+        preview = False
+        save_as = None
+        for n, line in enumerate(lines, 1):
+            raw = line.strip()
+            if not raw or raw.startswith("#"):
+                continue  # linhas vazias e comentários
+            upper = raw.upper()
+            if upper == "DONE":
+                break
+            if upper == "PREVIEW":
+                preview = True
+                continue
+            if upper.startswith("SAVE "):
+                save_as = raw.split(maxsplit=1)[1].strip()
+                continue
+            if upper in ("CANCEL", "AUTO_PREVIEW") or (upper.startswith("GAW") and not upper.startswith(("GAW_BUTTON", "GAW_COUNT", "GAW_TEMPO"))):
+                errors.append(f"linha {n}: `{raw[:40]}` só vale no modo interativo")
+                continue
+            try:
+                self.apply(raw)
+            except CardSyntaxError as e:
+                errors.append(f"linha {n}: {e}")
+        self.container_stack.clear()
+        return errors, preview, save_as
+
 class BuilderV2Cog(commands.Cog):
     def __init__(self, bot: commands.Bot):
         self.bot = bot
         # active sessions keyed by (guild_id, user_id)
         self.sessions: dict[tuple[int, int], CardSession] = {}
+        # templates de card (SQLite + LRU em memória), usados pelo !card send
+        self.templates = TemplateLibrary(CardTemplateStore())
 
-    # --------------- Utilities: ensure webhook & POST raw JSON ----------------
+    async def cog_load(self):
+        await self.templates.store.open()
 
-    async def _download_avatar_bytes(self) -> bytes | None:
-        async with aiohttp.ClientSession() as sess:
-            async with sess.get(WEBHOOK_AVATAR) as resp:
-                if resp.status != 200:
-                    return None
-                return await resp.read()
+    async def cog_unload(self):
+        await self.templates.store.close()
 
-    async def _get_or_create_app_webhook(self, channel: discord.TextChannel) -> discord.Webhook:
-        # try to find bot-owned, same name
-        webhooks = await channel.webhooks()
-        me = self.bot.user
-        wh = discord.utils.get(webhooks, name=WEBHOOK_NAME, user=me)
-        if wh:
-            return wh
+    async def flush_state(self):
+        """Grava escritas pendentes (chamado pelo /restart antes do execv)."""
+        await self.templates.store.flush()
 
-        avatar_bytes = await self._download_avatar_bytes()
-        wh = await channel.create_webhook(name=WEBHOOK_NAME, avatar=avatar_bytes)
-        return wh
+    # --------------- Utilities: ensure webhook & POST raw JSON ----------------
+
+    async def _get_or_create_app_webhook(self, channel: discord.TextChannel) -> discord.Webhook:
+        # registro compartilhado: channel.webhooks() só na primeira vez por canal
+        return await self.bot.webhooks.get(channel)
 
     async def _post_components_v2(self, webhook: discord.Webhook, payload: dict) -> tuple[int, str]:
         url = ensure_with_components(webhook.url)
-        async with aiohttp.ClientSession() as sess:
-            async with sess.post(url, json=payload, timeout=30) as resp:
-                text = await resp.text()
-                return resp.status, text
+        r = await self.bot.rest.request("POST", url, json=payload, timeout=30)
+        if r.status == 404:
+            self.bot.webhooks.invalidate(webhook.channel_id)  # webhook apagado por fora
+        return r.status, r.text()
+
+    # ---------------------------- Preview in place -----------------------------
+
+    async def _render_preview(self, session: CardSession) -> str | None:
+        """
+        Mostra o card na mensagem de preview da sessão: PATCH se ela já existe, POST
+        (?wait=true, para guardar o id) só na primeira vez ou se ela foi apagada.
+        Retorna o erro para mostrar ao usuário, ou None.
+        """
+        report = validate(session.top_components)
+        if not report.ok:
+            return self._report_errors(report)
+        try:
+            webhook = await self._get_or_create_app_webhook(session.preview_channel)
+        except discord.HTTPException as e:
+            return f"Falha ao obter webhook de preview: {e}"
+
+        payload = self._card_payload(session.top_components)
+        if session.preview_id:
+            url = ensure_with_components(f"{webhook.url}/messages/{session.preview_id}")
+            r = await self.bot.rest.request("PATCH", url, json={"components": payload["components"]}, timeout=30)
+            if r.ok:
+                return None
+            if r.status != 404:
+                return f"Falha no preview ({r.status}): {r.text()[:400]}"
+            session.preview_id = None  # mensagem apagada: cria outra
+
+        r = await self.bot.rest.request("POST", ensure_with_components(webhook.url) + "&wait=true", json=payload, timeout=30)
+        if r.status == 404:
+            self.bot.webhooks.invalidate(webhook.channel_id)
+        if not r.ok:
+            return f"Falha no preview ({r.status}): {r.text()[:400]}"
+        session.preview_id = int((r.json() or {}).get("id") or 0) or None
+        return None
+
+    def _mark_preview_dirty(self, session: CardSession):
+        """Preview automático: marca a sessão e garante um flusher (no máximo 1 render por intervalo)."""
+        session.preview_dirty = True
+        if session.preview_task is None or session.preview_task.done():
+            session.preview_task = asyncio.create_task(self._preview_flusher(session))
+
+    async def _preview_flusher(self, session: CardSession):
+        loop = asyncio.get_running_loop()
+        while session.preview_dirty:
+            wait = session.preview_last + config.CARD_PREVIEW_DEBOUNCE_SEC - loop.time()
+            if wait > 0:
+                await asyncio.sleep(wait)
+                if not session.preview_dirty:
+                    break  # sessão encerrada durante a espera
+            session.preview_dirty = False
+            session.preview_last = loop.time()
+            if not validate(session.top_components).ok:
+                continue  # estado intermediário (ex.: container vazio): espera o próximo
+            try:
+                await self._render_preview(session)
+            except Exception as e:
+                print(f"[builder] preview automático falhou: {e!r}")
+
+    async def _end_preview(self, session: CardSession):
+        """DONE/CANCEL/expiração: para o preview automático e apaga a mensagem de preview."""
+        session.auto_preview = False
+        session.preview_dirty = False
+        if session.preview_task is not None:
+            await asyncio.gather(session.preview_task, return_exceptions=True)  # render em curso termina
+            session.preview_task = None
+        if not session.preview_id:
+            return
+        webhook = self.bot.webhooks.peek(session.preview_channel.id)
+        if webhook is not None:
+            await self.bot.rest.request("DELETE", f"{webhook.url}/messages/{session.preview_id}")
+        session.preview_id = None
+
+    # ------------------------------ Script mode -------------------------------
+
+    async def _read_script(self, ctx: commands.Context) -> tuple[list[str] | None, list | None]:
+        """
+        Script enviado junto com o comando: linhas depois da primeira da mensagem ou um anexo
+        .txt/.json. .json aceita uma lista de linhas ou {"components": [...]} pronto.
+        Retorna (linhas, componentes); (None, None) se não houver script.
+        """
+        for att in ctx.message.attachments:
+            name = att.filename.lower()
+            if not name.endswith((".txt", ".json")):
+                continue
+            if att.size > SCRIPT_MAX_BYTES:
+                raise CardSyntaxError(f"Anexo grande demais (máx. {SCRIPT_MAX_BYTES // 1024} KB).")
+            text = (await att.read()).decode("utf-8", errors="replace")
+            if name.endswith(".txt"):
+                return text.splitlines(), None
+            try:
+                data = json.loads(text)
+            except ValueError as e:
+                raise CardSyntaxError(f"JSON inválido: {e}")
+            if isinstance(data, list) and all(isinstance(x, str) for x in data):
+                return data, None
+            if isinstance(data, dict) and isinstance(data.get("components"), list):
+                return None, data["components"]
+            raise CardSyntaxError('JSON deve ser uma lista de linhas ou `{"components": [...]}`.')
+
+        _, _, rest = ctx.message.content.partition("\n")
+        if rest.strip():
+            return rest.splitlines(), None
+        return None, None
+
+    async def _run_script(self, ctx: commands.Context, channel: discord.TextChannel, lines: list[str] | None, components: list | None):
+        """Monta o card inteiro numa passada e envia (ou faz preview) com uma chamada de webhook."""
+        session = CardSession(author_id=ctx.author.id, build_channel=channel)
+        preview, save_as = False, None
+        if lines is not None:
+            errors, preview, save_as = session.run_script(lines)
+            if errors:
+                report = "\n".join(errors)
+                return await ctx.reply(f"**{len(errors)} erro(s) no script**, nada foi enviado:\n{report}"[:1900])
+        else:
+            session.top_components = components
+
+        report = validate(session.top_components)
+        if not report.ok:
+            return await ctx.reply(self._report_errors(report))
+        if save_as:
+            return await ctx.reply(await self._save_template(ctx, save_as, session))
+
+        target = ctx.channel if preview else channel
+        if not isinstance(target, discord.TextChannel):
+            return await ctx.reply("Não é possível fazer preview neste tipo de canal.")
+        try:
+            webhook = await self._get_or_create_app_webhook(target)
+        except discord.HTTPException as e:
+            return await ctx.reply(f"Falha ao garantir webhook: `{e}`")
+
+        status, text = await self._post_components_v2(webhook, self._card_payload(session.top_components))
+        if not 200 <= status < 300:
+            return await ctx.reply(f"Webhook POST falhou ({status}): `{text[:500]}`")
+        await ctx.reply("**Preview enviado.**" if preview else "**Card criado!**")
+
+    # -------------------------------- Templates --------------------------------
+
+    async def _save_template(self, ctx: commands.Context, name: str, session: CardSession) -> str:
+        # sobrescrever um template existente exige o mesmo que o card delete
+        if not ctx.channel.permissions_for(ctx.author).manage_messages and await self.templates.get(ctx.guild.id, name):
+            return f"Já existe um template `{name.lower()}`; sobrescrever exige a permissão Gerenciar Mensagens."
+        try:
+            tpl = self.templates.save(ctx.guild.id, name, self._card_payload(session.top_components), ctx.author.id)
+        except TemplateError as e:
+            return f"Não foi possível salvar o template: {e}"
+        params = ", ".join(f"`{p}`" for p in tpl.params) or "nenhum"
+        return f"Template **{tpl.name}** salvo (parâmetros: {params}). Use `card send {tpl.name} #canal chave=valor ...`."
+
+    @commands.group(name="card", invoke_without_command=True)
+    @commands.guild_only()
+    async def card(self, ctx: commands.Context):
+        """Templates de card: send, list, show, delete."""
+        await ctx.reply("Uso: `card send <template> #canal chave=valor ...`, `card list`, `card show <template>`, `card delete <template>`.\n"
+                        "Para criar: no `buildcard`, use `{parametro}` nos textos e `SAVE <nome>`.")
+
+    @card.command(name="send")
+    async def card_send(self, ctx: commands.Context, name: str, channel: discord.TextChannel, *, params: str = ""):
+        """Renderiza o template nos slots pré-calculados e envia com uma chamada de webhook."""
+        tpl = await self.templates.get(ctx.guild.id, name)
+        if tpl is None:
+            return await ctx.reply(f"Template `{name}` não encontrado.")
+        values = {}
+        try:
+            for token in shlex.split(params):
+                key, sep, value = token.partition("=")
+                if not sep:
+                    return await ctx.reply(f"Parâmetro inválido `{token}`: use `chave=valor` (aspas para valores com espaço).")
+                values[key] = value
+            body = tpl.render(values)
+        except (ValueError, TemplateError) as e:  # shlex: aspas sem fechar
+            return await ctx.reply(f"Não foi possível montar o card: {e}")
+
+        try:
+            webhook = await self._get_or_create_app_webhook(channel)
+        except discord.HTTPException as e:
+            return await ctx.reply(f"Falha ao garantir webhook: `{e}`")
+        r = await self.bot.rest.request("POST", ensure_with_components(webhook.url), data=body,
+                                        headers={"Content-Type": "application/json"}, timeout=30)
+        if r.status == 404:
+            self.bot.webhooks.invalidate(webhook.channel_id)
+        if not r.ok:
+            return await ctx.reply(f"Webhook POST falhou ({r.status}): `{r.text()[:500]}`")
+        await ctx.reply(f"**Card `{tpl.name}` enviado** em {channel.mention}.")
+
+    @card.command(name="list")
+    async def card_list(self, ctx: commands.Context):
+        names = await self.templates.names(ctx.guild.id)
+        await ctx.reply(("Templates: " + ", ".join(f"`{n}`" for n in names))[:1900] if names else "Nenhum template salvo.")
+
+    @card.command(name="show")
+    async def card_show(self, ctx: commands.Context, name: str):
+        tpl = await self.templates.get(ctx.guild.id, name)
+        if tpl is None:
+            return await ctx.reply(f"Template `{name}` não encontrado.")
+        params = " ".join(f"{p}=..." for p in tpl.params)
+        await ctx.reply(f"`card send {tpl.name} #canal {params}`".strip())
+
+    @card.command(name="delete")
+    @commands.has_permissions(manage_messages=True)
+    async def card_delete(self, ctx: commands.Context, name: str):
+        if await self.templates.get(ctx.guild.id, name) is None:
+            return await ctx.reply(f"Template `{name}` não encontrado.")
+        self.templates.delete(ctx.guild.id, name)
+        await ctx.reply(f"Template `{name.lower()}` apagado.")
+
+    @staticmethod
+    def _report_errors(report) -> str:
+        lines = [f"**{len(report.errors)} problema(s) no card**, nada foi enviado ({report.summary()}):"]
+        lines += [f"• {e}" for e in report.errors]
+        return "\n".join(lines)[:1900]
+
+    def _card_payload(self, components: list[dict]) -> dict:
+        return {
+            "flags": COMP_FLAG,
+            "username": WEBHOOK_NAME,
+            "avatar_url": WEBHOOK_AVATAR,
+            "allowed_mentions": {"parse": []},
+            "components": components or [{"type": 10, "content": "*empty card*"}],
+        }
 
     # -------------------------- The builder command ---------------------------
 
     @commands.command(name="buildcard")
     @commands.guild_only()
     async def buildcard(self, ctx: commands.Context, channel: discord.TextChannel):
-        """Start an interactive card build session."""
+        """Start an interactive card build session (or run a script sent with the command)."""
+        # modo script: o card inteiro na mensagem do comando ou num anexo
+        try:
+            lines, components = await self._read_script(ctx)
+        except CardSyntaxError as e:
+            return await ctx.reply(str(e))
+        if lines is not None or components is not None:
+            return await self._run_script(ctx, channel, lines, components)
+
         # restrict one session per (guild, user)
         key = (ctx.guild.id, ctx.author.id)
         if key in self.sessions:
@@ -170,8 +577,12 @@ class BuilderV2Cog(commands.Cog):
             "• `DIVIDER`\n"
             "• `LINK_BUTTON_ROW <url> <texto...>` (botões na mesma linha)\n"
             "• `LINK_BUTTON <url> <texto...>`\n"
-            "• `PREVIEW` (visualizar o cartão)\n"
-            "• `EXIT` (sair do container atual)\n".format(ctx.author, channel)
+            "• `PREVIEW` (visualizar o cartão; a mesma mensagem é atualizada)\n"
+            "• `AUTO_PREVIEW` (liga/desliga o preview automático a cada alteração)\n"
+            "• `SAVE <nome>` (salva como template; `{parametro}` nos textos vira slot do `card send`)\n"
+            "• `EXIT` (sair do container atual)\n"
+            "Dica: mande o card inteiro de uma vez nas linhas seguintes ao `buildcard #canal` "
+            "ou num anexo `.txt`/`.json` (mesma gramática, todos os erros numa resposta).\n".format(ctx.author, channel)
         )
 
         def check(m: discord.Message) -> bool:
@@ -194,10 +605,17 @@ class BuilderV2Cog(commands.Cog):
                 # control commands
                 if upper == "CANCEL":
                     del self.sessions[key]
+                    await self._end_preview(session)
                     await msg.reply("Build cancelada, nada foi enviado")
                     return
 
                 if upper == "DONE":
+                    # valida localmente antes do POST (o card continua aberto para corrigir)
+                    report = validate(session.top_components)
+                    if not report.ok:
+                        await msg.reply(self._report_errors(report))
+                        continue
+
                     # auto-close any open containers (so you don't lose work)
                     session.container_stack.clear()
 
@@ -206,19 +624,15 @@ class BuilderV2Cog(commands.Cog):
                         webhook = await self._get_or_create_app_webhook(session.build_channel)
                     except discord.HTTPException as e:
                         del self.sessions[key]
+                        await self._end_preview(session)
                         await msg.reply(f"Falha ao garantir webhook: `{e}`")
                         return
 
-                    payload = {
-                        "flags": COMP_FLAG,
-                        "username": WEBHOOK_NAME,
-                        "avatar_url": WEBHOOK_AVATAR,
-                        "allowed_mentions": {"parse": []},
-                        "components": session.top_components or [{"type": 10, "content": "*empty card*"}],
-                    }
+                    payload = self._card_payload(session.top_components)
 
                     status, text = await self._post_components_v2(webhook, payload)
                     del self.sessions[key]
+                    await self._end_preview(session)
 
                     if 200 <= status < 300:
                         await msg.reply("**Card criado!**")
@@ -226,195 +640,51 @@ class BuilderV2Cog(commands.Cog):
                         await msg.reply(f"Webhook POST falhou ({status}): `{text[:500]}`")
                     return
 
-                if upper == "EXIT":
-                    if session.close_container():
-                        await msg.reply("Você está agora **fora** do container.")
-                    else:
-                        await msg.reply("Você não estava dentro de um container.")
-                    continue
-
-
-                if upper == "PREVIEW":
-                    # preview no canal atual (ctx.channel)
+                if upper in ("PREVIEW", "AUTO_PREVIEW"):
+                    # preview no canal atual (ctx.channel), sempre na mesma mensagem
                     if not isinstance(ctx.channel, discord.TextChannel):
                         await msg.reply("Não é possível fazer preview neste tipo de canal.")
                         continue
-                    try:
-                        preview_wh = await self._get_or_create_app_webhook(ctx.channel)
-                    except discord.HTTPException as e:
-                        await msg.reply(f"Falha ao obter webhook de preview: {e}")
-                        continue
-
-                    payload = {
-                        "flags": COMP_FLAG,
-                        "username": WEBHOOK_NAME,
-                        "avatar_url": WEBHOOK_AVATAR,
-                        "allowed_mentions": {"parse": []},
-                        "components": session.top_components or [{"type": 10, "content": ""}],
-                    }
-                    status, text = await self._post_components_v2(preview_wh, payload)
-                    if not (200 <= status < 300):
-                        await msg.reply(f"Falha no preview ({status}): {text[:400]}")
-                    continue
-
-                if upper == "APAGAR":
-                    res = session.undo()
-                    await msg.reply(res)
-                    continue
-                
-                # element parsers
-                if upper.startswith("TEXT:") or upper.startswith("TEXT "):
-                    content = raw.split(":", 1)[1].strip() if ":" in raw else raw.split(" ", 1)[1].strip()
-                    if not content:
-                        await msg.reply("Usagem: `TEXT: seu texto`")
+                    session.preview_channel = ctx.channel
+                    if upper == "AUTO_PREVIEW":
+                        session.auto_preview = not session.auto_preview
+                        state = "ligado" if session.auto_preview else "desligado"
+                        await msg.reply(f"Preview automático {state} (no máximo 1 atualização a cada {config.CARD_PREVIEW_DEBOUNCE_SEC:g}s).")
+                        if session.auto_preview:
+                            self._mark_preview_dirty(session)
                         continue
-                    session.add_component({"type": 10, "content": content})
-                    await msg.reply("Texto adicionado.")
-                    continue
-
-                if upper.startswith("CONTAINER"):
-                    parts = raw.split(maxsplit=1)
-                    color = parse_hex_color(parts[1]) if len(parts) > 1 else None
-                    session.open_container(color)
-                    tip = f"com cor `#{parts[1].lstrip('#')}`" if len(parts) > 1 and color is not None else "sem cor"
-                    await msg.reply(f"Container aberto ({tip}). Digite **EXIT** para sair do container.")
+                    error = await self._render_preview(session)
+                    if error:
+                        await msg.reply(error)
                     continue
 
-                if upper.startswith("BANNER_IMG"):
-                    parts = raw.split(maxsplit=1)
-                    if len(parts) < 2 or not valid_url(parts[1]):
-                        await msg.reply("Usagem: `BANNER_IMG https://...`")
+                if upper.startswith("SAVE "):
+                    # salva o card atual como template ({parametros} viram slots); a sessão continua
+                    report = validate(session.top_components)
+                    if not report.ok:
+                        await msg.reply(self._report_errors(report))
                         continue
-                    session.add_component({
-                        "type": 12,  # MediaGallery
-                        "items": [{"media": {"url": parts[1]}, "description": None}]
-                    })
-                    await msg.reply("Banner adicionado.")
+                    await msg.reply(await self._save_template(ctx, raw.split(maxsplit=1)[1].strip(), session))
                     continue
 
-                if upper.startswith("THUMBNAIL"):
-                    parts = raw.split(maxsplit=1)
-                    if len(parts) < 2 or not valid_url(parts[1]):
-                        await msg.reply("Usagem: `THUMBNAIL https://...`")
-                        continue
-                    section = {
-                        "type": 9,  # Section
-                        "components": [{"type": 10, "content": "\u200b"}],  # zero-width spacer
-                        "accessory": {
-                            "type": 11,  # Thumbnail
-                            "media": {"url": parts[1]},
-                            "description": None
-                        }
-                    }
-                    session.add_component(section)
-                    await msg.reply("Thumbnail adicionada.")
-                    continue
-
-                if upper.startswith("DIVIDER"):
-                    session.add_component({"type": 14, "divider": True})
-                    await msg.reply("Divisor adicionado.")
-                    continue
-
-                if upper.startswith("LINK_BUTTON_ROW"):
-                    parts = raw.split(maxsplit=2)
-                    if len(parts) < 3 or not valid_url(parts[1]):
-                        await msg.reply("Usagem: `LINK_BUTTON_ROW https://... Nome do Botão`")
-                        continue
-                    url, label = parts[1], parts[2]
-                    button = {"type": 2, "style": 5, "label": label, "url": url}
-
-                    # se o último componente já for uma Action Row com <5 botões, reaproveita
-                    if session.target and isinstance(session.target[-1], dict) \
-                    and session.target[-1].get("type") == 1 \
-                    and len(session.target[-1].get("components", [])) < 5:
-                        session.target[-1]["components"].append(button)
-                    else:
-                        session.add_component({"type": 1, "components": [button]})
-
-                    await msg.reply("Botão de link adicionado na mesma linha.")
-                    continue
-
-                if upper.startswith("LINK_BUTTON"):
-                    # LINK_BUTTON <url> <label...>
-                    parts = raw.split(maxsplit=2)
-                    if len(parts) < 3 or not valid_url(parts[1]):
-                        await msg.reply("Usagem: `LINK_BUTTON https://... Nome do Botão`")
-                        continue
-                    url, label = parts[1], parts[2]
-
-                    session.add_component({
-                        "type": 1,  # Action Row
-                        "components": [
-                            {"type": 2, "style": 5, "label": label, "url": url}
-                        ]
-                    })
-                    await msg.reply("Botão de link adicionado.")
-                    continue
-
-                if upper.startswith("GAW_BUTTON"):
-                    parts = raw.split(maxsplit=2)
-                    if len(parts) < 3:
-                        await msg.reply("usagem giveaway: nome gid")
-                        continue
-
-                    gid, label = parts[1].strip(), parts[2].strip()
-                    
-                    action_row = {
-                        "type": 1,
-                        "components": [
-                            {"type": 2, "style": 1, "label": label, "custom_id": f"gaw:join:{gid}"},
-                        ]
-                    }
-                    session.add_component(action_row)
-                    await msg.reply(f"botao adicionado")
-                    continue
-
-                if upper.startswith("GAW_COUNT"):
-                    parts = raw.split(maxsplit=2)
-                    if len(parts) < 3:
-                        await msg.reply("Usagem: GIVEAWAY_COUNT <gid> <rotulo>")
-                        continue
-
-                    gid, label = parts[1].strip(), parts[2].strip()
-                    marker = _zw_encode_token(f"gaw:count:{gid}")
-
-                    session.add_component({
-                        "type": 10,
-                        "content": f"{label}: 0{marker}"
-                    })
-                    await msg.reply("contador adicionado")
-                    continue
-
-                if upper.startswith("GAW_TEMPO"):
-                    parts = raw.split(maxsplit=2)
-                    if len(parts) < 3:
-                        await msg.reply("Usagem: TEMPO <gid> <rotulo>")
-                        continue
-
-                    gid, label = parts[1].strip(), parts[2].strip()
-                    marker = _zw_encode_token(f"gaw:time:{gid}")
-
-                    session.add_component({
-                        "type": 10,
-                        "content": f"{label} {marker}"
-                    })
-                    await msg.reply("tempo adicionado")
-                    continue
-
-                if upper.startswith("GAW"):
+                if upper.startswith("GAW") and not upper.startswith(("GAW_BUTTON", "GAW_COUNT", "GAW_TEMPO")):
                     gid = f"gaw-{ctx.guild.id}-{secrets.token_hex(4)}"
                     await ctx.reply(f"GID: {gid}")
                     continue
 
-                # unknown
-                await msg.reply(
-                    "Entrada desconhecida. Tente uma das seguintes: `TEXT:`, `CONTAINER [#hex]`, `BANNER_IMG`, "
-                    "`THUMBNAIL`, `DIVIDER`, ,`LINK_BUTTON_ROW`, `LINK_BUTTON`, `PREVIEW`, `APAGAR`, `EXIT`, `DONE`."
-                )
+                # elementos (mesma gramática do modo script)
+                try:
+                    await msg.reply(session.apply(raw))
+                except CardSyntaxError as e:
+                    await msg.reply(str(e))
+                    continue
+                if session.auto_preview:
+                    self._mark_preview_dirty(session)
 
         except asyncio.TimeoutError:
             # cleanup stale session
             self.sessions.pop(key, None)
+            await self._end_preview(session)
             await ctx.reply("O construtor expirou (10 minutos). Sessão encerrada.")
 
 async def setup(bot: commands.Bot):
@@ -1,18 +1,20 @@
 import re
-import aiohttp
+import time
 import asyncio
 import random
 import secrets
+import itertools
+from array import array
+from collections import OrderedDict
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta, timezone
 
 import discord
 from discord.ext import commands
 
-WEBHOOK_NAME = "Frizz"
-
-ZW_START = "\u2063\u2063"
-ZW_END = "\u2063\u2063"
+import config
+import zwcodec
+from cogs._giveaway_store import GiveawayStore
 
 # -------- utilidades --------
 
@@ -34,6 +36,206 @@ def parse_duration(s: str) -> timedelta | None:
 
 # -------- dados de sorteio --------
 
+# cliques em gids sem sorteio nem vínculo (custom_id perdido/forjado): limite e TTL
+STRAY_MAX_GIDS = 256
+STRAY_TTL_SEC = 6 * 3600
+# árvores de mensagens vinculadas em memória (LRU); uma entrada despejada é refeita com um GET
+MSG_CACHE_MAX = 256
+
+class ParticipantSet:
+    """
+    Conjunto de snowflakes sem objetos Python por participante:
+    - _ids: array('Q') com os ids (sorteio O(k) direto por índice, sem copiar para lista)
+    - _table: hash aberto em array('q') guardando a posição de cada id em _ids
+      (-1 vazio, -2 removido); remoção troca o item com o último do array.
+    add/discard/toggle O(1) amortizado, ~24 bytes por participante.
+    """
+    __slots__ = ("_ids", "_table", "_mask", "_used")
+
+    _EMPTY = -1
+    _DELETED = -2
+
+    def __init__(self, ids=()):
+        self._ids = array("Q")
+        self._alloc(8)
+        self.update(ids)
+
+    def _alloc(self, size: int):
+        self._table = array("q", [self._EMPTY]) * size
+        self._mask = size - 1
+        self._used = 0  # slots ocupados + removidos
+
+    @staticmethod
+    def _hash(uid: int) -> int:
+        # snowflakes têm os bits baixos quase constantes; mistura antes de mascarar
+        return ((uid ^ (uid >> 22)) * 0x9E3779B97F4A7C15 >> 20) & 0xFFFFFFFFFFFF
+
+    def _find(self, uid: int) -> tuple[int, int]:
+        """Retorna (slot do uid ou -1, primeiro slot livre para inserir)."""
+        table, ids, mask = self._table, self._ids, self._mask
+        i = self._hash(uid) & mask
+        free = -1
+        while True:
+            pos = table[i]
+            if pos == self._EMPTY:
+                return -1, (free if free != -1 else i)
+            if pos == self._DELETED:
+                if free == -1:
+                    free = i
+            elif ids[pos] == uid:
+                return i, free
+            i = (i + 1) & mask
+
+    def _rehash(self):
+        size = 8
+        while size < len(self._ids) * 2:
+            size <<= 1
+        self._alloc(size)
+        table, mask = self._table, self._mask
+        for pos, uid in enumerate(self._ids):
+            i = self._hash(uid) & mask
+            while table[i] != self._EMPTY:
+                i = (i + 1) & mask
+            table[i] = pos
+        self._used = len(self._ids)
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __contains__(self, uid: int) -> bool:
+        return self._find(uid)[0] != -1
+
+    def __iter__(self):
+        return iter(self._ids)
+
+    def add(self, uid: int) -> bool:
+        slot, free = self._find(uid)
+        if slot != -1:
+            return False
+        if self._table[free] == self._EMPTY:
+            self._used += 1
+        self._table[free] = len(self._ids)
+        self._ids.append(uid)
+        if self._used * 3 > len(self._table) * 2:
+            self._rehash()
+        return True
+
+    def discard(self, uid: int) -> bool:
+        slot, _ = self._find(uid)
+        if slot == -1:
+            return False
+        ids = self._ids
+        pos = self._table[slot]
+        self._table[slot] = self._DELETED
+        last_pos = len(ids) - 1
+        if pos != last_pos:
+            # move o último id para o buraco e atualiza sua posição na tabela
+            last = ids[last_pos]
+            self._table[self._find(last)[0]] = pos
+            ids[pos] = last
+        ids.pop()
+        return True
+
+    def toggle(self, uid: int) -> bool:
+        """Inverte a participação; retorna True se o usuário ficou dentro."""
+        if self.discard(uid):
+            return False
+        self.add(uid)
+        return True
+
+    def update(self, ids):
+        if not self._ids:
+            # carga em lote (restauração do store): monta o array e indexa uma vez só
+            self._ids = array("Q", dict.fromkeys(ids))
+            self._rehash()
+            return
+        for uid in ids:
+            self.add(uid)
+
+    def sample(self, k: int) -> list[int]:
+        ids = self._ids
+        return [ids[i] for i in random.sample(range(len(ids)), min(k, len(ids)))]
+
+class StrayClicks:
+    """Cliques em gids desconhecidos: no máximo max_gids conjuntos, expirados após ttl sem cliques."""
+
+    def __init__(self, max_gids: int, ttl: float, on_evict):
+        self.max_gids = max_gids
+        self.ttl = ttl
+        self.on_evict = on_evict
+        self._sets: OrderedDict[str, tuple[ParticipantSet, float]] = OrderedDict()
+
+    def __contains__(self, gid: str) -> bool:
+        return gid in self._sets
+
+    def get(self, gid: str) -> ParticipantSet | None:
+        item = self._sets.get(gid)
+        return item[0] if item else None
+
+    def touch(self, gid: str) -> ParticipantSet:
+        now = time.monotonic()
+        item = self._sets.pop(gid, None)
+        ps = item[0] if item else ParticipantSet()
+        self._sets[gid] = (ps, now)
+        self._sweep(now)
+        return ps
+
+    def pop(self, gid: str) -> ParticipantSet | None:
+        item = self._sets.pop(gid, None)
+        return item[0] if item else None
+
+    def _sweep(self, now: float):
+        # ordem de inserção = ordem do último clique, então basta olhar o começo
+        while self._sets:
+            gid, (_, last) = next(iter(self._sets.items()))
+            if len(self._sets) <= self.max_gids and now - last < self.ttl:
+                break
+            self._sets.popitem(last=False)
+            self.on_evict(gid)
+
+class ClickThrottle:
+    """
+    Token bucket por (usuário, gid), consultado antes de mudar o estado.
+    Buckets ficam em ordem de último uso; os ociosos (já cheios de novo) saem pelo começo.
+    """
+
+    def __init__(self, burst: int, refill_sec: float):
+        self.burst = burst
+        self.refill_sec = refill_sec
+        self._buckets: OrderedDict[tuple[int, str], tuple[float, float]] = OrderedDict()  # -> (fichas, último uso)
+        self.allowed = 0
+        self.throttled = 0
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+    def allow(self, uid: int, gid: str) -> bool:
+        now = time.monotonic()
+        key = (uid, gid)
+        item = self._buckets.pop(key, None)
+        if item is None:
+            tokens = float(self.burst)
+        else:
+            tokens, last = item
+            tokens = min(float(self.burst), tokens + (now - last) / self.refill_sec)
+        ok = tokens >= 1.0
+        if ok:
+            tokens -= 1.0
+            self.allowed += 1
+        else:
+            self.throttled += 1
+        self._buckets[key] = (tokens, now)
+        self._expire(now)
+        return ok
+
+    def _expire(self, now: float):
+        idle = self.burst * self.refill_sec  # depois disso o bucket estaria cheio = igual a não existir
+        while self._buckets:
+            _, (_, last) = next(iter(self._buckets.items()))
+            if now - last < idle:
+                break
+            self._buckets.popitem(last=False)
+
 @dataclass
 class Giveaway:
     id: str
@@ -41,7 +243,7 @@ class Giveaway:
     channel_id: int
     winners: int
     ends_at: datetime
-    participants: set[int] = field(default_factory=set)
+    participants: ParticipantSet = field(default_factory=ParticipantSet)
 
 # -------- Cog --------
 
@@ -52,158 +254,108 @@ class GiveawayManager(commands.Cog):
     def __init__(self, bot: commands.Bot):
         self.bot = bot
         self.active: dict[str, Giveaway] = {}           # gid
-        self.pending_clicks: dict[str, set[int]] = {}   # gid -> cliques antes do gaw_set
+        self.pending_clicks: dict[str, ParticipantSet] = {}   # gid vinculado -> cliques antes do gaw_set
         # bindings: onde atualizar contadores na mensagem
         # gid -> [ { "webhook_url": str, "message_id": int, "base_labels": {path->label} } ]
         self.bindings: dict[str, list[dict]] = {}
+        # contador write-behind: cliques só marcam o gid como sujo; um flusher por gid
+        # faz no máximo um update a cada GAW_COUNTER_FLUSH_SEC com a contagem mais recente
+        self._dirty_counters: set[str] = set()
+        self._counter_flushers: dict[str, asyncio.Task] = {}
+        self._last_counter_flush: dict[str, float] = {}
+        # message_id -> {"components": árvore conhecida, "markers": índice de caminhos dos marcadores}
+        self._msg_cache: OrderedDict[int, dict] = OrderedDict()
+        # estado durável: entradas/saídas, vínculos e fim dos sorteios sobrevivem a /restart
+        self.store = GiveawayStore()
+        # gids sem sorteio e sem vínculo: limitados e com TTL para não crescer para sempre
+        self.stray_clicks = StrayClicks(STRAY_MAX_GIDS, STRAY_TTL_SEC, self.store.delete_participants)
+        # anti-spam do botão de participar
+        self.click_throttle = ClickThrottle(config.GAW_CLICK_BURST, config.GAW_CLICK_REFILL_SEC)
+
+    async def cog_load(self):
+        self.bot.router.register("gaw:join:", self._on_join)
+        await self.store.open()
+        giveaways, participants, bindings = await self.store.load_all()
+
+        for row in giveaways:
+            gid = row["gid"]
+            g = Giveaway(
+                id=gid,
+                guild_id=row["guild_id"],
+                channel_id=row["channel_id"],
+                winners=row["winners"],
+                ends_at=row["ends_at"],
+            )
+            g.participants.update(participants.pop(gid, ()))
+            self.active[gid] = g
+            # reagenda; sorteios vencidos disparam na hora (o encerramento espera o bot ficar pronto)
+            self._schedule_finish(gid)
+
+        # participantes sem sorteio configurado = cliques antes do gaw_set
+        self.bindings.update(bindings)
+        for gid, uids in participants.items():
+            if gid in self.bindings:
+                ps = self.pending_clicks.setdefault(gid, ParticipantSet())
+            else:
+                ps = self.stray_clicks.touch(gid)
+            ps.update(uids)
+
+        if giveaways:
+            print(f"[giveaway] {len(giveaways)} sorteio(s) restaurado(s)")
+
+    async def cog_unload(self):
+        self.bot.router.unregister("gaw:join:")
+        self.bot.scheduler.cancel_prefix("gaw:end:")
+        for t in self._counter_flushers.values():
+            t.cancel()
+        self._counter_flushers.clear()
+        await self.store.close()
+
+    async def flush_state(self):
+        """Grava escritas pendentes (chamado pelo /restart antes do execv)."""
+        await self.store.flush()
 
     def _zw_find_and_decode(self, s: str):
-        i = s.find(ZW_START)
-        if i == -1:
-            return None
-        j = s.find(ZW_END, i + len(ZW_START))
-        if j == -1:
-            return None
-        payload = s[i + len(ZW_START): j]
-        if any(ch not in ("\u200b", "\u200c") for ch in payload):
-            return None
-        bits = "".join("0" if ch == "\u200b" else "1" for ch in payload)
-        if len(bits) % 8 != 0:
-            return None
-        decoded = "".join(chr(int(bits[k:k+8], 2)) for k in range(0, len(bits), 8))
-        return decoded, s[i:j + len(ZW_END)]
+        # aceita marcadores v1 (legado, já publicados) e v2
+        return zwcodec.find_and_decode(s)
 
     async def _write_time_once(self, gid: str):
         g = self.active.get(gid)
         if not g or not g.ends_at:
             return
-
-        ts = int(g.ends_at.timestamp())
-
-        for b in self.bindings.get(gid, []):
-            url = b.get("webhook_url")
-            ch_id = b.get("channel_id")
-            mid = b.get("message_id")
-            base_labels = b.setdefault("base_labels", {})
-
-            if not url:
-                ch = self.bot.get_channel(ch_id or 0)
-                if not isinstance(ch, discord.TextChannel):
-                    continue
-                try:
-                    webhooks = await ch.webhooks()
-                except discord.HTTPException:
-                    continue
-                me = self.bot.user
-                wh = discord.utils.find(lambda w: w.user == me and w.name == WEBHOOK_NAME, webhooks)
-                if not wh:
-                    continue
-                url = wh.url
-                b["webhook_url"] = url
-
-            # GET da mensagem atual
-            get_url = url + f"/messages/{mid}"
-            async with aiohttp.ClientSession() as sess:
-                async with sess.get(get_url) as r:
-                    if r.status != 200:
-                        continue
-                    msg_json = await r.json()
-
-            comps = msg_json.get("components") or []
-            changed, base_labels = self._set_time_texts(comps, gid, g.ends_at, base_labels)
-            if not changed:
-                continue
-
-            patch_url = url + f"/messages/{mid}"
-            async with aiohttp.ClientSession() as sess:
-                await sess.patch(patch_url, json={"components": comps}, timeout=30)
-            b["base_labels"] = base_labels
-            
-
-    def _set_time_texts(self, comps: list, gid: str, ends_at: datetime | None, base_labels: dict[str, str]) -> tuple[bool, dict[str, str]]:
-        """
-        Procura TextDisplay (type 10) com marcador invisível 'gaw:time:<gid>'
-        e escreve 'Label: <t:UNIX:R>' mantendo o marcador
-        """
-        changed = False
-        if ends_at is None:
-            return changed, base_labels
-
-        ts = int(ends_at.timestamp())
-
-        def walk(lst: list, path: str = ""):
-            nonlocal changed
-            for i, c in enumerate(lst):
-                if not isinstance(c, dict):
-                    continue
-                cur = f"{path}/{i}"
-                t = c.get("type")
-
-                if t == 10:
-                    content = c.get("content")
-                    if isinstance(content, str):
-                        found = self._zw_find_and_decode(content)  # precisa existir na classe
-                        if found:
-                            decoded, token_span = found
-                            if decoded.startswith("gaw:time:"):
-                                gid_in = decoded.split(":", 2)[2]
-                                if gid_in == gid:
-                                    # remove contagem/tempo anterior visível, preserva marcador
-                                    visible = content.replace(token_span, "")
-                                    base = base_labels.get(cur) or re.sub(r'\s*:\s*<?t:\d+:R>?\s*$', '', visible).rstrip()
-                                    c["content"] = f"{base}: <t:{ts}:R>{token_span}"
-                                    base_labels[cur] = base
-                                    changed = True
-
-                inner = c.get("components")
-                if isinstance(inner, list):
-                    walk(inner, cur)
-
-        walk(comps, "")
-        return changed, base_labels
+        await self._apply_markers(gid, "time")
 
     # -------------------- interacao de botao (entrar/sair) --------------------
 
-    @commands.Cog.listener()
-    async def on_interaction(self, interaction: discord.Interaction):
-        try:
-            data = interaction.data or {}
-            cid = data.get("custom_id")
-            if not cid or not isinstance(cid, str):
-                return
-            if not cid.startswith("gaw:join:"):
-                return
-
-            gid = cid.split(":", 2)[2]
-
-            # escolhe conjunto de participantes
-            g = self.active.get(gid)
-            if g:
-                part_set = g.participants
-            else:
-                part_set = self.pending_clicks.setdefault(gid, set())
+    async def _on_join(self, interaction: discord.Interaction):
+        """Handler do roteador para custom_id 'gaw:join:<gid>'."""
+        gid = interaction.data["custom_id"].split(":", 2)[2]
+        uid = interaction.user.id
 
-            uid = interaction.user.id
-            if uid in part_set:
-                part_set.discard(uid)
-                out_msg = "Removido da participação."
-                reply = out_msg
-            else:
-                part_set.add(uid)
-                in_msg = "Participação registrada."
-                reply = in_msg
+        if not self.click_throttle.allow(uid, gid):
+            await interaction.response.send_message("Calma! Você está clicando rápido demais, tente de novo em alguns segundos.", ephemeral=True)
+            return
 
-            try:
-                await interaction.response.send_message(reply, ephemeral=True)
-            except discord.InteractionResponded:
-                pass
+        # escolhe conjunto de participantes
+        part_set = self._participants_for(gid, create=True)
 
-            # atualiza contador
-            await self._update_counters(gid)
+        if part_set.toggle(uid):
+            self.store.add_participant(gid, uid)
+            in_msg = "Participação registrada."
+            reply = in_msg
+        else:
+            self.store.remove_participant(gid, uid)
+            out_msg = "Removido da participação."
+            reply = out_msg
 
-        except Exception:
+        try:
+            await interaction.response.send_message(reply, ephemeral=True)
+        except discord.InteractionResponded:
             pass
 
+        # atualiza contador (coalescido, fora do caminho do clique)
+        self._mark_counter_dirty(gid)
+
     # --------------------------- comandos de controle --------------------------
 
     @commands.command(name="gaw_set")
@@ -234,12 +386,13 @@ class GiveawayManager(commands.Cog):
         )
 
         # funde cliques anteriores
-        early = self.pending_clicks.pop(giveaway_id, set())
-        g.participants |= early
+        g.participants.update(self.pending_clicks.pop(giveaway_id, None) or ())
+        g.participants.update(self.stray_clicks.pop(giveaway_id) or ())
 
         self.active[giveaway_id] = g
-        # dispara a tarefa de conclusao
-        asyncio.create_task(self._run_giveaway(giveaway_id))
+        self.store.save_giveaway(giveaway_id, g.guild_id, g.channel_id, g.winners, g.ends_at)
+        # agenda (ou reagenda, se o gid já existia) a conclusao
+        self._schedule_finish(giveaway_id)
         await ctx.reply(f"Sorteio configurado. Termina em {duration}. Vencedores: {winners}.")
 
         await self._write_time_once(giveaway_id)
@@ -251,21 +404,26 @@ class GiveawayManager(commands.Cog):
     @commands.guild_only()
     async def gaw_participants(self, ctx: commands.Context, giveaway_id: str):
         """Lista participantes atuais."""
-        g = self.active.get(giveaway_id)
-        ids: list[int]
-        if g:
-            ids = list(g.participants)
-        else:
-            ids = list(self.pending_clicks.get(giveaway_id, set()))
-        if not ids:
+        ps = self._participants_for(giveaway_id)
+        if not ps:
             await ctx.reply("Sem participantes no momento.")
             return
         # limita visual para não estourar
-        names = [f"<@{i}>" for i in ids][:30]
-        more = max(0, len(ids) - 30)
+        names = [f"<@{i}>" for i in itertools.islice(ps, 30)]
+        more = max(0, len(ps) - 30)
         extra = f" e mais {more}" if more else ""
         await ctx.reply(f"Participantes: {', '.join(names)}{extra}")
 
+    @commands.command(name="gaw_stats")
+    @commands.guild_only()
+    async def gaw_stats(self, ctx: commands.Context):
+        """Contadores do botão de participar (cliques aceitos/limitados)."""
+        th = self.click_throttle
+        await ctx.reply(
+            f"Cliques aceitos: {th.allowed} | limitados: {th.throttled} | buckets ativos: {len(th)}\n"
+            f"Limite: {th.burst} cliques, +1 a cada {th.refill_sec:g}s por usuário/sorteio."
+        )
+
     @commands.command(name="gaw_end")
     @commands.guild_only()
     async def gaw_end(self, ctx: commands.Context, giveaway_id: str):
@@ -273,8 +431,23 @@ class GiveawayManager(commands.Cog):
         if giveaway_id not in self.active:
             await ctx.reply("Sorteio não encontrado ou já encerrado.")
             return
+        self.bot.scheduler.cancel(f"gaw:end:{giveaway_id}")
         await self._finish_and_announce(giveaway_id)
 
+    @commands.command(name="gaw_list")
+    @commands.guild_only()
+    async def gaw_list(self, ctx: commands.Context):
+        """Lista os sorteios ativos e quando terminam."""
+        pending = [
+            (key.split(":", 2)[2], ts) for key, ts in self.bot.scheduler.pending("gaw:end:")
+            if (g := self.active.get(key.split(":", 2)[2])) and g.guild_id == ctx.guild.id
+        ]
+        if not pending:
+            await ctx.reply("Nenhum sorteio ativo.")
+            return
+        lines = [f"`{gid}` termina <t:{int(ts)}:R> ({len(self.active[gid].participants)} participantes)" for gid, ts in pending[:20]]
+        await ctx.reply("\n".join(lines))
+
     @commands.command(name="gaw_bind")
     @commands.guild_only()
     async def gaw_bind(self, ctx: commands.Context, giveaway_id: str, channel: discord.TextChannel, message: str):
@@ -301,11 +474,22 @@ class GiveawayManager(commands.Cog):
             return
 
         # armazena apenas canal_id e message_id; o webhook será descoberto na hora do update
-        self.bindings.setdefault(giveaway_id, []).append({
+        binding = {
             "channel_id": channel.id,
             "message_id": message_id,
             "base_labels": {}  # mantém compatibilidade com o contador em texto
-        })
+        }
+        self.bindings.setdefault(giveaway_id, []).append(binding)
+        self.store.save_binding(giveaway_id, binding)
+        # gid deixou de ser desconhecido: cliques já feitos passam a valer sem TTL
+        stray = self.stray_clicks.pop(giveaway_id)
+        if stray is not None and giveaway_id not in self.active:
+            self.pending_clicks.setdefault(giveaway_id, ParticipantSet()).update(stray)
+
+        # monta o cache/índice de marcadores uma vez, aqui
+        url = await self._binding_webhook_url(giveaway_id, binding)
+        if url:
+            await self._message_entry(url, message_id, self._base_labels_for(message_id), refresh=True)
         await ctx.reply("Vinculado. Atualizando contador.")
 
         await self._write_time_once(giveaway_id)
@@ -320,45 +504,81 @@ class GiveawayManager(commands.Cog):
         before = len(lst)
         lst[:] = [b for b in lst if b.get("message_id") != message_id]
         removed = before - len(lst)
+        if removed:
+            self.store.delete_binding(giveaway_id, message_id)
+            if not any(b.get("message_id") == message_id for bs in self.bindings.values() for b in bs):
+                self._msg_cache.pop(message_id, None)
         await ctx.reply("Removido." if removed else "Nada removido.")
 
     # ----------------------------- internos -----------------------------------
 
-    async def _run_giveaway(self, giveaway_id: str):
-        g = self.active.get(giveaway_id)
-        if not g:
-            return
-        delay = max(0, int((g.ends_at - datetime.now(timezone.utc)).total_seconds()))
-        try:
-            await asyncio.sleep(delay)
-        except asyncio.CancelledError:
-            return
-        await self._finish_and_announce(giveaway_id)
+    def _schedule_finish(self, giveaway_id: str):
+        g = self.active[giveaway_id]
+        self.bot.scheduler.schedule(f"gaw:end:{giveaway_id}", g.ends_at, lambda: self._finish_and_announce(giveaway_id))
 
     async def _finish_and_announce(self, giveaway_id: str):
+        await self.bot.wait_until_ready()
         g = self.active.pop(giveaway_id, None)
         if not g:
             return
+        self.store.delete_giveaway(giveaway_id)
 
         ch = self.bot.get_channel(g.channel_id)
         if not isinstance(ch, discord.TextChannel):
+            self._drop_cached(giveaway_id)
             return
 
-        pool = list(g.participants)
-        if not pool:
+        if not g.participants:
             await ch.send(f"Sorteio {giveaway_id} encerrado. Sem participantes.")
+            self._drop_cached(giveaway_id)
             return
 
-        k = min(g.winners, len(pool))
-        winners = random.sample(pool, k)
+        winners = g.participants.sample(g.winners)
         mentions = " ".join(f"<@{i}>" for i in winners)
         await ch.send(f":tada: Parabéns ao ganhador, {mentions}! Você ganhou **RANK + MEDALHA BETA + INGRESSO BETACUP**!")
 
         # atualiza contadores pela ultima vez
         await self._update_counters(giveaway_id)
+        self._drop_cached(giveaway_id)
+
+    def _participants_for(self, gid: str, *, create: bool = False) -> ParticipantSet | None:
+        g = self.active.get(gid)
+        if g:
+            return g.participants
+        ps = self.pending_clicks.get(gid)
+        if ps is not None:
+            return ps
+        if gid in self.bindings:
+            return self.pending_clicks.setdefault(gid, ParticipantSet()) if create else None
+        return self.stray_clicks.touch(gid) if create else self.stray_clicks.get(gid)
 
     # ---- atualizacao do contador ----
 
+    def _mark_counter_dirty(self, gid: str):
+        """Marca o contador como sujo e garante um flusher rodando para o gid."""
+        self._dirty_counters.add(gid)
+        t = self._counter_flushers.get(gid)
+        if t is None or t.done():
+            self._counter_flushers[gid] = asyncio.create_task(self._counter_flusher(gid))
+
+    async def _counter_flusher(self, gid: str):
+        loop = asyncio.get_running_loop()
+        try:
+            while gid in self._dirty_counters:
+                wait = self._last_counter_flush.get(gid, 0.0) + config.GAW_COUNTER_FLUSH_SEC - loop.time()
+                if wait > 0:
+                    await asyncio.sleep(wait)
+                # limpa antes do update: cliques durante o PATCH agendam o próximo flush
+                self._dirty_counters.discard(gid)
+                self._last_counter_flush[gid] = loop.time()
+                try:
+                    await self._update_counters(gid)
+                except Exception as e:
+                    print(f"[giveaway] falha ao atualizar contador {gid}: {e!r}")
+        finally:
+            if self._counter_flushers.get(gid) is asyncio.current_task():
+                self._counter_flushers.pop(gid, None)
+
     def _parse_message_link(self, link: str) -> tuple[int | None, int | None, int | None]:
         # https://discord.com/channels/<guild>/<channel>/<message>
         try:
@@ -370,102 +590,180 @@ class GiveawayManager(commands.Cog):
         except Exception:
             return None, None, None
 
-    def _set_counter_texts(self, comps: list, gid: str, count: int, base_labels: dict[str, str]) -> tuple[bool, dict[str,str]]:
-        """
-        Procura TextDisplay (type 10) contendo o marcador invisivel '\u2063gaw:count:<gid>\u2063'
-        e substitui o conteudo visivel para 'Label: <count>' mantendo o marcador.
-        """
-        changed = False
+    # ---- cache de mensagens vinculadas ----
+    #
+    # Cada mensagem vinculada guarda a última árvore de componentes conhecida e um índice
+    # com o caminho (índices em "components") de cada TextDisplay com marcador gaw:count/gaw:time.
+    # O índice é montado uma vez (gaw_bind ou primeiro uso após restart); updates reescrevem só
+    # os nós indexados e fazem PATCH direto, sem GET. Re-fetch apenas em 404 ou quando o PATCH
+    # devolve uma árvore em que os caminhos indexados não batem mais (mensagem editada por fora).
+
+    def _index_markers(self, comps: list, base_labels: dict[str, str]) -> list[dict]:
+        markers: list[dict] = []
 
-        def walk(lst: list, path: str = ""):
-            nonlocal changed
+        def walk(lst: list, path: tuple[int, ...]):
             for i, c in enumerate(lst):
                 if not isinstance(c, dict):
                     continue
-                t = c.get("type")
-                cur = f"{path}/{i}"
-
-                if t == 10:
-                    content = c.get("content")
-                    if isinstance(content, str):
-                        found = self._zw_find_and_decode(content)
-                        if found:
-                            decoded, token_span = found           # token_span = o trecho invisível já codificado
-                            if decoded.startswith("gaw:count:"):
-                                gid_in = decoded.split(":", 2)[2]
-                                if gid_in == gid:
-                                    visible = content.replace(token_span, "")
-                                    base = base_labels.get(cur) or re.sub(r"\s*:\s*\d+\s*$", "", visible).rstrip()
-                                    c["content"] = f"{base}: {count}{token_span}"  # mantém o marcador invisível
-                                    base_labels[cur] = base
-                                    changed = True
-
+                cur = path + (i,)
+                content = c.get("content")
+                if c.get("type") == 10 and isinstance(content, str) and zwcodec.has_marker(content):
+                    found = self._zw_find_and_decode(content)
+                    if found:
+                        decoded, token_span = found  # token_span = o trecho invisível já codificado
+                        kind, _, gid_in = decoded.partition(":")[2].partition(":")
+                        if decoded.startswith("gaw:") and kind in ("count", "time"):
+                            key = "/" + "/".join(map(str, cur))
+                            visible = content.replace(token_span, "")
+                            rx = r"\s*:\s*\d+\s*$" if kind == "count" else r"\s*:\s*<?t:\d+:R>?\s*$"
+                            base = base_labels.get(key) or re.sub(rx, "", visible).rstrip()
+                            markers.append({"path": cur, "key": key, "kind": kind, "gid": gid_in, "span": token_span, "base": base})
                 inner = c.get("components")
                 if isinstance(inner, list):
                     walk(inner, cur)
 
-        walk(comps, "")
-        return changed, base_labels
+        walk(comps, ())
+        return markers
+
+    @staticmethod
+    def _resolve(comps: list, path: tuple[int, ...]) -> dict | None:
+        node = None
+        lst = comps
+        for i in path:
+            if not isinstance(lst, list) or i >= len(lst) or not isinstance(lst[i], dict):
+                return None
+            node = lst[i]
+            lst = node.get("components")
+        return node
+
+    def _index_matches(self, comps: list, markers: list[dict]) -> bool:
+        for m in markers:
+            node = self._resolve(comps, m["path"])
+            if node is None or m["span"] not in (node.get("content") or ""):
+                return False
+        return True
+
+    async def _binding_webhook_url(self, gid: str, b: dict) -> str | None:
+        url = b.get("webhook_url")
+        if url:
+            return url
+        ch = self.bot.get_channel(b.get("channel_id") or 0)
+        if not isinstance(ch, discord.TextChannel):
+            return None
+        # só o webhook app-owned "Frizz" consegue editar a mensagem; não cria um novo
+        try:
+            wh = await self.bot.webhooks.get(ch, create=False)
+        except discord.HTTPException:
+            return None
+        if not wh:
+            return None
+        b["webhook_url"] = wh.url  # cache para as proximas atualizacoes
+        self.store.save_binding(gid, b)
+        return wh.url
+
+    async def _message_entry(self, url: str, mid: int, base_labels: dict[str, str], *, refresh: bool = False) -> dict | None:
+        entry = self._msg_cache.get(mid)
+        if entry is not None and not refresh:
+            self._msg_cache.move_to_end(mid)
+            return entry
+        r = await self.bot.rest.request("GET", url + f"/messages/{mid}")
+        if r.status != 200:
+            self._msg_cache.pop(mid, None)
+            return None
+        comps = (r.json() or {}).get("components") or []
+        entry = {"components": comps, "markers": self._index_markers(comps, base_labels)}
+        self._msg_cache[mid] = entry
+        self._msg_cache.move_to_end(mid)
+        while len(self._msg_cache) > MSG_CACHE_MAX:
+            self._msg_cache.popitem(last=False)
+        return entry
+
+    def _base_labels_for(self, mid: int) -> dict[str, str]:
+        """Rótulos base de todos os gids vinculados à mensagem (uma mensagem pode ter vários sorteios)."""
+        merged: dict[str, str] = {}
+        for bs in self.bindings.values():
+            for b in bs:
+                if b.get("message_id") == mid:
+                    merged.update(b.get("base_labels") or {})
+        return merged
+
+    def _drop_cached(self, gid: str):
+        """Sorteio encerrado: solta as árvores das mensagens que só ele usa."""
+        for b in self.bindings.get(gid, ()):
+            mid = b.get("message_id")
+            if any(o.get("message_id") == mid for other, bs in self.bindings.items() if other != gid and other in self.active for o in bs):
+                continue
+            self._msg_cache.pop(mid, None)
 
-    async def _update_counters(self, gid: str):
-        """
-        Busca a mensagem via endpoint de webhook, atualiza os componentes (somente textos com marcador)
-        e envia PATCH. Requer vínculo previo via gaw_bind.
-        """
-        # contagem atual
-        if gid in self.active:
-            count = len(self.active[gid].participants)
+    def _render(self, entry: dict, gid: str, kind: str, value: str) -> bool:
+        changed = False
+        for m in entry["markers"]:
+            if m["gid"] != gid or m["kind"] != kind:
+                continue
+            node = self._resolve(entry["components"], m["path"])
+            if node is None:
+                continue
+            content = f"{m['base']}: {value}{m['span']}"  # mantém o marcador invisível
+            if node.get("content") != content:
+                node["content"] = content
+                changed = True
+        return changed
+
+    async def _apply_markers(self, gid: str, kind: str):
+        """Reescreve os marcadores 'kind' do gid em todas as mensagens vinculadas e faz PATCH."""
+        if kind == "count":
+            value = str(len(self._participants_for(gid) or ()))
         else:
-            count = len(self.pending_clicks.get(gid, set()))
-
-        for b in self.bindings.get(gid, []):
-            base_labels = b.setdefault("base_labels", {})
-
-            # descobrir webhook_url automaticamente
-            webhook_url = b.get("webhook_url")
-            if not webhook_url:
-                ch = self.bot.get_channel(b.get("channel_id", 0))
-                if not isinstance(ch, discord.TextChannel):
-                    continue
-                try:
-                    webhooks = await ch.webhooks()
-                except discord.HTTPException:
-                    continue
-
-                # procura webhook app-owned com o mesmo nome e dono
-                me = self.bot.user
-                wh = discord.utils.find(lambda w: w.user == me and w.name == WEBHOOK_NAME, webhooks)
-                if not wh:
-                    wh = await ch.create_webhook(name=WEBHOOK_NAME)
-                    webhook_url = wh.url
-                    b["webhook_url"] = webhook_url
-
-                webhook_url = wh.url
-                b["webhook_url"] = webhook_url  # cache para as proximas atualizacoes
+            g = self.active.get(gid)
+            if not g or not g.ends_at:
+                return
+            value = f"<t:{int(g.ends_at.timestamp())}:R>"
 
-            url = webhook_url
+        for b in list(self.bindings.get(gid, [])):
             mid = b.get("message_id")
             if not mid:
                 continue
+            url = await self._binding_webhook_url(gid, b)
+            if not url:
+                continue
+            base_labels = b.setdefault("base_labels", {})
 
-            # GET da mensagem via endpoint do webhook
-            get_url = url + f"/messages/{mid}"
-            async with aiohttp.ClientSession() as sess:
-                async with sess.get(get_url) as r:
-                    if r.status != 200:
-                        continue
-                    msg_json = await r.json()
-
-            comps = msg_json.get("components") or []
+            entry = await self._message_entry(url, mid, self._base_labels_for(mid))
+            if entry is None:
+                continue
+            if not self._render(entry, gid, kind, value):
+                continue
 
-            changed_count, base_labels = self._set_counter_texts(comps, gid, count, base_labels)
-            if not changed_count:
+            r = await self.bot.rest.request("PATCH", url + f"/messages/{mid}", json={"components": entry["components"]}, timeout=30)
+            if r.status == 404:
+                # mensagem ou webhook sumiu: invalida cache e url; próximo update re-descobre
+                self._msg_cache.pop(mid, None)
+                b.pop("webhook_url", None)
+                self.bot.webhooks.invalidate(b.get("channel_id") or 0)
                 continue
+            if r.ok:
+                body = r.json() or {}
+                comps = body.get("components")
+                if isinstance(comps, list) and not self._index_matches(comps, entry["markers"]):
+                    # versão divergente (editada por fora): reindexa e reaplica uma vez
+                    entry = await self._message_entry(url, mid, self._base_labels_for(mid), refresh=True)
+                    if entry and self._render(entry, gid, kind, value):
+                        await self.bot.rest.request("PATCH", url + f"/messages/{mid}", json={"components": entry["components"]}, timeout=30)
+
+            if entry:
+                # funde: só os marcadores deste gid são atualizados, os de outros sorteios
+                # na mesma mensagem continuam no vínculo
+                labels = {**base_labels, **{m["key"]: m["base"] for m in entry["markers"] if m["gid"] == gid}}
+                if labels != base_labels:
+                    b["base_labels"] = labels
+                    self.store.save_binding(gid, b)
 
-            patch_url = url + f"/messages/{mid}"
-            async with aiohttp.ClientSession() as sess:
-                await sess.patch(patch_url, json={"components": comps}, timeout=30)
-            b["base_labels"] = base_labels
+    async def _update_counters(self, gid: str):
+        """
+        Atualiza os textos com marcador de contagem nas mensagens vinculadas (via gaw_bind)
+        usando a árvore em cache; sem GET por update.
+        """
+        await self._apply_markers(gid, "count")
 
 # entrypoint da extensão
 async def setup(bot: commands.Bot):
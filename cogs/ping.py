@@ -14,6 +14,44 @@ class PingCog(commands.Cog):
         latency_sec = self.bot.latency
         latency_ms = round(latency_sec *1000)
         await ctx.send(f'**Ping!**\nMeu ping está em {latency_ms} ms.') 
+
+    @commands.command(name="reststats")
+    @commands.has_permissions(administrator=True)
+    async def reststats(self, ctx):
+        """Contadores por rota do cliente REST compartilhado."""
+        rows = self.bot.rest.snapshot()[:15]
+        if not rows:
+            return await ctx.send("Nenhum request REST registrado ainda.")
+        lines = [
+            f"`{route}` req={st.requests} 429={st.rate_limited} retry={st.retries} err={st.errors} espera={st.waited_sec:.1f}s"
+            for route, st in rows
+        ]
+        await ctx.send("\n".join(lines)[:1900])
+
+    @commands.command(name="routestats")
+    @commands.has_permissions(administrator=True)
+    async def routestats(self, ctx):
+        """Tempo até a primeira resposta de cada handler do roteador de interações."""
+        rows = sorted(self.bot.router.stats.items(), key=lambda kv: kv[1].calls, reverse=True)
+        if not rows:
+            return await ctx.send("Nenhum handler registrado.")
+        lines = [
+            f"`{prefix}` chamadas={st.calls} erros={st.errors} sem_resposta={st.unacked} "
+            f"ack p50={st.ack_p50():.0f} ms p99={st.ack_p99():.0f} ms"
+            for prefix, st in rows
+        ]
+        await ctx.send("\n".join(lines)[:1900])
+
+    @commands.command(name="schedstats")
+    @commands.has_permissions(administrator=True)
+    async def schedstats(self, ctx):
+        """Métricas do agendador central de prazos."""
+        sched = self.bot.scheduler
+        p50, p99 = sched.lateness_percentiles()
+        await ctx.send(
+            f"Prazos pendentes: {len(sched)} | disparados: {sched.fired} | falhas: {sched.failed}\n"
+            f"Atraso p50={p50 * 1000:.1f} ms p99={p99 * 1000:.1f} ms máx={sched.max_lateness * 1000:.1f} ms"
+        )
         
 async def setup(bot: commands.Bot):
     await bot.add_cog(PingCog(bot))
\ No newline at end of file
@@ -25,6 +25,16 @@ class Restart(commands.Cog):
     @app_commands.checks.has_permissions(administrator=True)
     async def restart(self, interaction: discord.Interaction):
         await interaction.response.defer(ephemeral=True, thinking=True)
+
+        # grava o estado pendente dos cogs (stores em lote) antes do update/execv
+        for cog in list(self.bot.cogs.values()):
+            flush = getattr(cog, "flush_state", None)
+            if flush is None:
+                continue
+            try:
+                await flush()
+            except Exception as e:
+                print(f"[restart] falha ao gravar estado de {cog.qualified_name}: {e!r}")
         
         loop = asyncio.get_running_loop()
         try:
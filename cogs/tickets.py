@@ -1,7 +1,10 @@
-import asyncio, os, json
+import asyncio, os
+import time
+import functools
+from collections import deque
+from dataclasses import asdict, dataclass, field
 from typing import Optional
 from zoneinfo import ZoneInfo
-from io import BytesIO
 import re
 
 import discord
@@ -9,6 +12,13 @@ from discord import app_commands
 from discord.ext import commands
 from discord.ui import View, Button
 
+import config
+from cogs._ticket_config import ConfigError, TicketConfig
+from cogs._ticket_store import TicketStore
+from cogs._ticket_capture import CaptureLog, capture_path
+from cogs._ticket_stats import TicketStatsStore
+from cogs._transcript import export_capture, export_channel, prune_archives, remove_transcript, transcript_path
+
 import datetime as dt
 try:
     from zoneinfo import ZoneInfo
@@ -17,42 +27,11 @@ except Exception:
     SAO_TZ = dt.timezone(dt.timedelta(hours=-3))  
 # ========= Helpers =========
 
-# guardar em um txt externo com o config para nao perder ao reiniciar bot
-CONFIG_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'configs', 'ticket_config.json')
-
-CONFIG_KEY = "CONFIG"
-
-def save_config(config: dict):
-    with open(CONFIG_FILE, 'w', encoding='utf-8') as f:
-        json.dump({CONFIG_KEY: config}, f, indent=4, ensure_ascii = False)
-
-def load_config() -> dict:
-    if not os.path.isfile(CONFIG_FILE):
-        print("Creating default config file...")
-        default_config = {
-            "last_ticket_message_id": None,
-            "last_ticket_channel_id": None,
-            "ticket_category_id": 0,
-            "panel_channel_id": 0,
-            "staff_role_id": 0,
-            "admin_role_id": 0,
-            "logs_channel_id": 0,
-            "one_ticket_per_user": True,
-            "enable_anonymous_reports": True,
-            "rating_timeout_sec": 20,
-            "sla_warn_hours": 24,
-            "sla_autoclose_hours": 48
-        }
-        save_config(default_config)
-        
-    with open(CONFIG_FILE, 'r') as f:
-        return json.load(f).get(CONFIG_KEY, {})
-
-config_dir = os.path.dirname(CONFIG_FILE)
-if not os.path.exists(config_dir):
-    os.makedirs(config_dir)
+# config em DATA_DIR/ticket_config.json (snapshot em memória, gravação atômica fora do loop)
+CONFIG = TicketConfig()
 
-CONFIG = load_config()
+# eventos do ciclo de vida (aberto/assumido/fechado/avaliado) para o /ticket stats
+STATS = TicketStatsStore()
 
 # construir nome do canal
 def build_channel_name(category: str, author: discord.Member) -> str:
@@ -77,7 +56,7 @@ def build_channel_name(category: str, author: discord.Member) -> str:
 def check_configs():
     missing = []
     required_keys = [
-        "ticket_category_id",
+        "thread_parent_channel_id" if CONFIG.get("ticket_mode") == "thread" else "ticket_category_id",
         "panel_channel_id",
         "staff_role_id",
         "admin_role_id",
@@ -90,11 +69,17 @@ def check_configs():
         return True, f"Configuração ausente ou inválida: {', '.join(missing)}\nUtilize /ticket config para configurar o bot."
     return False, None
 
+def ticket_admin_only():
+    """Exige o admin_role_id atual (lido a cada uso, não no import)."""
+    def predicate(interaction: discord.Interaction) -> bool:
+        role_id = CONFIG.get("admin_role_id")
+        if role_id and any(r.id == role_id for r in getattr(interaction.user, "roles", ())):
+            return True
+        raise app_commands.MissingRole(role_id)
+    return app_commands.check(predicate)
+
 def clean_ids():
-    CONFIG["last_ticket_message_id"] = None
-    CONFIG["last_ticket_channel_id"] = None
-    save_config(CONFIG)
-    pass
+    CONFIG.update(last_ticket_message_id=None, last_ticket_channel_id=None)
 
 # remover caracteres invalidos em arquivos
 def safe_filename_part(s: str, maxlen: int = 100) -> str:
@@ -109,7 +94,6 @@ async def restore_panel(bot: commands.Bot):
     channel_id = CONFIG.get("last_ticket_channel_id")
     if not (message_id and channel_id):
         return  # nothing to restore
-    bot.add_view(PanelView())
 
     # try para resolver canal ou mensagem, ver se e valida
     try:
@@ -150,69 +134,429 @@ class TicketModal(discord.ui.Modal):
 
         
         if CONFIG.get("one_ticket_per_user", True):
-            for ch in guild.text_channels:
-                if ch.topic and f"ticket_author_id={interaction.user.id}" in ch.topic and ch.permissions_for(interaction.user).view_channel:
-                    return await interaction.followup.send(content=f"Você já possui um ticket aberto: {ch.mention}", ephemeral=True)
+            ch = OPEN_TICKETS.get(guild, interaction.user.id)
+            if ch and ch.permissions_for(interaction.user).view_channel:
+                return await interaction.followup.send(content=f"Você já possui um ticket aberto: {ch.mention}", ephemeral=True)
 
-        ticket_category_id = CONFIG.get("ticket_category_id")
-        parent = guild.get_channel(ticket_category_id) if ticket_category_id and ticket_category_id != 0 else None
-
-        staff_role_id = CONFIG.get("staff_role_id")
-        admin_role_id = CONFIG.get("admin_role_id")
-        
-        staff_role = guild.get_role(staff_role_id)
-        admin_role = guild.get_role(admin_role_id)
-        everyone_role = guild.default_role 
-
-        
-        if not staff_role or not admin_role:
+        if not guild.get_role(CONFIG.get("staff_role_id")) or not guild.get_role(CONFIG.get("admin_role_id")):
             await interaction.followup.send("Erro crítico: O cargo de Staff ou Admin (`staff_role_id`, `admin_role_id`) configurado não foi encontrado. O ticket não pode ser criado.", ephemeral=True)
             return
 
-        
-        allow_perms = discord.PermissionOverwrite(
-            view_channel=True,
-            send_messages=True,
-            read_message_history=True,
-            attach_files=True,
-            embed_links=True
-        )
-        
-        deny_perms = discord.PermissionOverwrite(view_channel=False)
+        # a criação do canal passa pela fila da guild (concorrência limitada, backoff em 429)
+        await CREATE_QUEUE.submit(interaction, self.category, self.desc.value, anonymous=self.anonymous)
 
-        
-        overwrites = {
-            everyone_role: deny_perms,
-            interaction.user: allow_perms,
-            staff_role: allow_perms,
-            admin_role: allow_perms,
-            guild.me: allow_perms  
-        }
+async def create_ticket(req: "CreateRequest", call) -> discord.TextChannel | discord.Thread:
+    """Cria o canal do ticket e posta as mensagens iniciais. 'call' aplica o backoff da fila."""
+    guild, user = req.guild, req.user
 
-        
-        channel = await guild.create_text_channel(
-            name=build_channel_name(self.category, interaction.user),
+    if CONFIG.get("ticket_mode") == "thread":
+        channel = await create_ticket_thread(req, call)
+    else:
+        channel = await create_ticket_channel(req, call)
+    OPEN_TICKETS.put(guild.id, user.id, channel.id)
+    STATS.opened(channel.id, guild.id, req.category, user.id)
+    if CONFIG.get("capture_messages", False):
+        CAPTURE.start(channel.id)
+    SLA.track(channel.id, guild.id, time.time(), staff=False)
+    
+    author_label = user.mention if not req.anonymous else "Anônimo"
+
+    embed = discord.Embed(title=f"Ticket de {req.category.title()}",
+    colour=0x2fffeb, timestamp=discord.utils.utcnow())
+    embed.add_field(name=user.display_name, value=author_label, inline=True)
+    embed.add_field(name="descricao", value=req.description, inline=False)
+
+    view = TicketControlsView(opener_id=user.id)
+    # em thread privada a menção também adiciona o cargo de staff à thread
+    staff_ping = f"<@&{CONFIG.get('staff_role_id')}>"
+    
+    await call(lambda: channel.send(content=staff_ping, embed=embed, view=view))
+
+    await call(lambda: channel.send(f"{user.mention} criou um ticket na categoria **{req.category}**."))
+    return channel
+
+async def create_ticket_thread(req: "CreateRequest", call) -> discord.Thread:
+    """Modo thread: thread privada no canal configurado, acesso por membresia (sem overwrites)."""
+    guild, user = req.guild, req.user
+    parent = guild.get_channel(CONFIG.get("thread_parent_channel_id") or 0)
+    if not isinstance(parent, discord.TextChannel):
+        raise RuntimeError("thread_parent_channel_id não configurado ou não é um canal de texto")
+    thread = await call(lambda: parent.create_thread(
+        name=build_channel_name(req.category, user),
+        type=discord.ChannelType.private_thread,
+        invitable=False,
+        auto_archive_duration=10080,
+        reason="Novo ticket criado via modal.",
+    ))
+    THREADS.put(thread.id, guild.id, user.id, req.category)
+    await call(lambda: thread.add_user(user))
+    return thread
+
+async def create_ticket_channel(req: "CreateRequest", call) -> discord.TextChannel:
+    guild, user = req.guild, req.user
+
+    ticket_category_id = CONFIG.get("ticket_category_id")
+    parent = guild.get_channel(ticket_category_id) if ticket_category_id and ticket_category_id != 0 else None
+
+    staff_role = guild.get_role(CONFIG.get("staff_role_id"))
+    admin_role = guild.get_role(CONFIG.get("admin_role_id"))
+    everyone_role = guild.default_role 
+
+    
+    allow_perms = discord.PermissionOverwrite(
+        view_channel=True,
+        send_messages=True,
+        read_message_history=True,
+        attach_files=True,
+        embed_links=True
+    )
+    
+    deny_perms = discord.PermissionOverwrite(view_channel=False)
+
+    
+    overwrites = {
+        everyone_role: deny_perms,
+        user: allow_perms,
+        staff_role: allow_perms,
+        admin_role: allow_perms,
+        guild.me: allow_perms  
+    }
+
+    
+    name = build_channel_name(req.category, user)
+    topic = f"ticket_category={req.category}; ticket_author_id={user.id}"
+    t0 = time.perf_counter()
+    channel = await POOL.claim(guild, call, name=name, topic=topic, overwrites=overwrites, reason="Novo ticket criado via modal.")
+    if channel is not None:
+        POOL.hits += 1
+        POOL.hit_ms.append((time.perf_counter() - t0) * 1000)
+    else:
+        channel = await call(lambda: guild.create_text_channel(
+            name=name,
             category=parent,
-            topic=f"ticket_category={self.category}; ticket_author_id={interaction.user.id}",
+            topic=topic,
             reason="Novo ticket criado via modal.",
             overwrites=overwrites
-        )
-        
-        author_label = interaction.user.mention if not self.anonymous else "Anônimo"
+        ))
+        POOL.misses += 1
+        POOL.miss_ms.append((time.perf_counter() - t0) * 1000)
+    return channel
+
+@dataclass
+class CreateRequest:
+    interaction: discord.Interaction
+    category: str
+    description: str
+    anonymous: bool = False
+    status: Optional[discord.WebhookMessage] = None  # followup editado conforme avança
+    enqueued_at: float = field(default_factory=time.perf_counter)
+
+    @property
+    def guild(self) -> discord.Guild:
+        return self.interaction.guild
+
+    @property
+    def user(self) -> discord.Member:
+        return self.interaction.user
+
+    @property
+    def key(self) -> tuple[int, int, str]:
+        return (self.guild.id, self.user.id, self.category)
+
+class _GuildCreateQueue:
+    __slots__ = ("queue", "workers", "idle", "paused_until")
 
-        embed = discord.Embed(title=f"Ticket de {self.category.title()}",
-        colour=0x2fffeb, timestamp=discord.utils.utcnow())
-        embed.add_field(name=interaction.user.display_name, value=author_label, inline=True)
-        embed.add_field(name="descricao", value=self.desc.value, inline=False)
+    def __init__(self):
+        self.queue: asyncio.Queue[CreateRequest] = asyncio.Queue()
+        self.workers: list[asyncio.Task] = []
+        self.idle = 0
+        self.paused_until = 0.0  # monotonic; 429 pausa todos os workers da guild
+
+class CreationQueue:
+    """
+    Criação de tickets por guild com concorrência limitada. Um pedido repetido para o
+    mesmo (usuário, categoria) enquanto o primeiro não terminou é recusado; 429/5xx do
+    Discord pausam a guild inteira pelo retry_after (ou backoff exponencial) antes de
+    tentar de novo. O followup efêmero do usuário mostra a posição e o resultado.
+    """
+    def __init__(self, concurrency: int, max_attempts: int = 4):
+        self.concurrency = concurrency
+        self.max_attempts = max_attempts
+        self._guilds: dict[int, _GuildCreateQueue] = {}
+        self.pending: dict[tuple[int, int, str], CreateRequest] = {}
+        self.in_flight = 0
+        self.created = 0
+        self.failed = 0
+        self.duplicates = 0
+        self.rate_limited = 0
+        self.latency_ms: deque = deque(maxlen=1000)  # do submit até o canal pronto
+
+    def depth(self) -> int:
+        return sum(g.queue.qsize() for g in self._guilds.values())
+
+    def latency_percentiles(self) -> tuple[float, float]:
+        if not self.latency_ms:
+            return 0.0, 0.0
+        s = sorted(self.latency_ms)
+        return s[len(s) // 2], s[min(len(s) - 1, int(len(s) * 0.99))]
+
+    async def stop(self):
+        tasks = [t for g in self._guilds.values() for t in g.workers]
+        for t in tasks:
+            t.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._guilds.clear()
+        self.pending.clear()
+
+    async def submit(self, interaction: discord.Interaction, category: str, description: str, *, anonymous: bool = False):
+        req = CreateRequest(interaction, category, description, anonymous)
+        if req.key in self.pending:
+            self.duplicates += 1
+            await interaction.followup.send("Seu ticket já está sendo criado, aguarde.", ephemeral=True)
+            return
+        gq = self._guilds.get(req.guild.id)
+        if gq is None:
+            gq = self._guilds[req.guild.id] = _GuildCreateQueue()
+            gq.workers = [asyncio.create_task(self._worker(gq)) for _ in range(self.concurrency)]
+        self.pending[req.key] = req
+        position = gq.queue.qsize() - gq.idle + 1
+        gq.queue.put_nowait(req)
+        if position > 0:
+            # só quem realmente vai esperar recebe o aviso de fila
+            try:
+                req.status = await interaction.followup.send(
+                    f"⏳ Seu ticket está na fila (posição {position}). Você será avisado aqui.", ephemeral=True, wait=True)
+            except discord.HTTPException:
+                pass
 
-        view = TicketControlsView(opener_id=interaction.user.id)
-        staff_ping = f"<@&{CONFIG.get('staff_role_id')}>"
-        
-        await channel.send(content=staff_ping, embed=embed, view=view)
+    async def _reply(self, req: CreateRequest, content: str):
+        try:
+            if req.status is not None:
+                await req.status.edit(content=content)
+            else:
+                await req.interaction.followup.send(content, ephemeral=True)
+        except discord.HTTPException as e:
+            print(f"[tickets] não foi possível avisar {req.user.id}: {e}")
+
+    async def _call(self, gq: _GuildCreateQueue, factory):
+        loop = asyncio.get_running_loop()
+        for attempt in range(self.max_attempts):
+            wait = gq.paused_until - loop.time()
+            if wait > 0:
+                await asyncio.sleep(wait)
+            try:
+                return await factory()
+            except (discord.RateLimited, discord.HTTPException) as e:
+                status = getattr(e, "status", 429)
+                if attempt + 1 >= self.max_attempts or not (status == 429 or status >= 500):
+                    raise
+                self.rate_limited += status == 429
+                delay = getattr(e, "retry_after", None) or 2 ** attempt
+                gq.paused_until = max(gq.paused_until, loop.time() + delay)
+
+    async def _worker(self, gq: _GuildCreateQueue):
+        while True:
+            gq.idle += 1
+            try:
+                req = await gq.queue.get()
+            finally:
+                gq.idle -= 1
+            self.in_flight += 1
+            try:
+                if CONFIG.get("one_ticket_per_user", True):
+                    ch = OPEN_TICKETS.get(req.guild, req.user.id)
+                    if ch is not None:
+                        await self._reply(req, f"Você já possui um ticket aberto: {ch.mention}")
+                        continue
+                if req.status is not None:
+                    await self._reply(req, "🛠️ Criando seu ticket...")
+                channel = await create_ticket(req, lambda f: self._call(gq, f))
+                self.created += 1
+                self.latency_ms.append((time.perf_counter() - req.enqueued_at) * 1000)
+                await self._reply(req, f"Ticket criado com sucesso: {channel.mention}")
+            except Exception as e:
+                self.failed += 1
+                print(f"[tickets] falha ao criar ticket de {req.user.id}: {e!r}")
+                await self._reply(req, f"Não foi possível criar o ticket agora ({e}). Tente novamente em instantes.")
+            finally:
+                self.in_flight -= 1
+                self.pending.pop(req.key, None)
+
+CREATE_QUEUE = CreationQueue(concurrency=config.TICKET_CREATE_CONCURRENCY)
+
+POOL_TOPIC = "ticket_pool=1"
+
+class ChannelPool:
+    """
+    Canais de ticket pré-criados (ocultos, só o bot vê) sob ticket_category_id. Abrir um
+    ticket vira um único PATCH (nome, tópico e permissões) num canal do pool em vez de
+    create_text_channel; uma task por guild repõe o pool em segundo plano. Tamanho em
+    channel_pool_size (0 desliga; no modo thread o pool fica vazio). Os canais são
+    reconhecidos pelo tópico, sem estado extra; os que ficaram fora da categoria atual
+    (troca de ticket_category_id) são apagados pela própria task de reposição.
+    """
+    def __init__(self):
+        self.bot: commands.Bot | None = None
+        self._free: dict[int, list[int]] = {}
+        self._stale: dict[int, list[int]] = {}  # canais do pool fora da categoria atual
+        self._refills: dict[int, asyncio.Task] = {}
+        self.hits = 0
+        self.misses = 0
+        self.hit_ms: deque = deque(maxlen=500)
+        self.miss_ms: deque = deque(maxlen=500)
+
+    def size(self, guild_id: int) -> int:
+        return len(self._free.get(guild_id, ()))
+
+    def start(self, bot: commands.Bot):
+        self.bot = bot
+        CONFIG.subscribe(self._on_config)
+
+    async def stop(self):
+        CONFIG.unsubscribe(self._on_config)
+        tasks = list(self._refills.values())
+        for t in tasks:
+            t.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._refills.clear()
+
+    def _category(self, guild: discord.Guild) -> Optional[discord.CategoryChannel]:
+        ch = guild.get_channel(CONFIG.get("ticket_category_id") or 0)
+        return ch if isinstance(ch, discord.CategoryChannel) else None
+
+    @staticmethod
+    def _target() -> int:
+        if CONFIG.get("ticket_mode") == "thread":
+            return 0  # threads não usam canais do pool
+        return CONFIG.get("channel_pool_size") or 0
+
+    def adopt(self, guild: discord.Guild, *, restart: bool = False):
+        """
+        Depois do ready (ou troca de categoria): recupera os canais do pool da categoria
+        atual, marca os de outras categorias para exclusão e agenda a reposição.
+        """
+        category = self._category(guild)
+        free = self._free.setdefault(guild.id, [])
+        stale = self._stale.setdefault(guild.id, [])
+        if restart:
+            free.clear()
+        for ch in guild.text_channels:
+            if ch.topic != POOL_TOPIC:
+                continue
+            if category is not None and ch.category_id == category.id:
+                if ch.id not in free:
+                    free.append(ch.id)
+            elif ch.id not in stale:
+                stale.append(ch.id)
+        self.refill(guild, restart=restart)
+
+    def refill(self, guild: discord.Guild, *, restart: bool = False):
+        t = self._refills.get(guild.id)
+        if t is not None and not t.done():
+            if not restart:
+                return
+            t.cancel()  # a task antiga pode estar criando canal na categoria anterior
+        self._refills[guild.id] = asyncio.create_task(self._refill(guild))
+
+    async def _delete(self, guild: discord.Guild, cid: int, reason: str) -> Optional[bool]:
+        """True: apagado (ou já não existe); None: tentar de novo; False: erro permanente."""
+        ch = guild.get_channel(cid)
+        if ch is None:
+            return True
+        try:
+            await ch.delete(reason=reason)
+        except discord.NotFound:
+            return True
+        except discord.RateLimited as e:
+            await asyncio.sleep(e.retry_after)
+            return None
+        except discord.HTTPException as e:
+            if e.status == 429 or e.status >= 500:
+                await asyncio.sleep(5)
+                return None
+            print(f"[tickets] não foi possível apagar o canal de pool {cid} da guild {guild.id}: {e}")
+            return False
+        return True
+
+    async def _refill(self, guild: discord.Guild):
+        free = self._free.setdefault(guild.id, [])
+        stale = self._stale.setdefault(guild.id, [])
+        while stale:
+            cid = stale[-1]
+            done = await self._delete(guild, cid, "Pool de tickets: categoria alterada")
+            if done is None:
+                continue
+            stale.pop()
+            if done is False:
+                break  # sem permissão na categoria antiga: não trava a reposição
+        while True:
+            target = self._target()
+            category = self._category(guild)
+            if category is None:
+                return
+            if len(free) > target:
+                cid = free.pop()
+                done = await self._delete(guild, cid, "Pool de tickets reduzido")
+                if done is None:
+                    free.append(cid)
+                    continue
+                if done is False:
+                    free.append(cid)  # o canal continua existindo e oculto: segue no pool
+                    return
+                continue
+            if len(free) >= target:
+                return
+            try:
+                ch = await guild.create_text_channel(
+                    name="🔒pool",
+                    category=category,
+                    topic=POOL_TOPIC,
+                    reason="Pool de canais de ticket",
+                    overwrites={
+                        guild.default_role: discord.PermissionOverwrite(view_channel=False),
+                        guild.me: discord.PermissionOverwrite(view_channel=True, send_messages=True, read_message_history=True),
+                    },
+                )
+            except discord.RateLimited as e:
+                await asyncio.sleep(e.retry_after)
+                continue
+            except discord.HTTPException as e:
+                if e.status == 429 or e.status >= 500:
+                    await asyncio.sleep(5)
+                    continue
+                print(f"[tickets] não foi possível repor o pool da guild {guild.id}: {e}")
+                return
+            free.append(ch.id)
+
+    async def claim(self, guild: discord.Guild, call, *, name: str, topic: str, overwrites: dict, reason: str) -> Optional[discord.TextChannel]:
+        """Transforma um canal do pool no ticket (um único edit). None se o pool estiver vazio."""
+        free = self._free.get(guild.id)
+        while free:
+            ch = guild.get_channel(free.pop(0))
+            if not isinstance(ch, discord.TextChannel):
+                continue
+            try:
+                await call(lambda: ch.edit(name=name, topic=topic, overwrites=overwrites, reason=reason))
+            except discord.NotFound:
+                continue
+            except Exception:
+                free.insert(0, ch.id)
+                raise
+            finally:
+                self.refill(guild)
+            return ch
+        return None
 
-        await channel.send(f"{interaction.user.mention} criou um ticket na categoria **{self.category}**.")
+    def _on_config(self, snapshot, changed: set[str]):
+        if changed & {"channel_pool_size", "ticket_category_id", "ticket_mode"} and self.bot and self.bot.is_ready():
+            for guild in self.bot.guilds:
+                if "ticket_category_id" in changed:
+                    # reinicia a task na lista nova; os canais da categoria anterior viram 'stale'
+                    self.adopt(guild, restart=True)
+                else:
+                    self.refill(guild)
 
-        await interaction.followup.send(content=f"Ticket criado com sucesso: {channel.mention}", ephemeral=True)
+POOL = ChannelPool()
                 
 # painel de abertura de tickets
 class PanelView(discord.ui.LayoutView):
@@ -234,13 +578,10 @@ class PanelView(discord.ui.LayoutView):
             visible=True,
         )
 
-        # construcao de botoes
+        # construcao de botoes (cliques tratados pelo roteador: prefixo 'create_ticket_')
         b1 = discord.ui.Button(label="Suporte", style=discord.ButtonStyle.primary, custom_id="create_ticket_suporte", emoji="🎫")
         b2 = discord.ui.Button(label="Denúncia", style=discord.ButtonStyle.danger, custom_id="create_ticket_denuncia", emoji="🚨")
         b3 = discord.ui.Button(label="Loja", style=discord.ButtonStyle.success, custom_id="create_ticket_loja", emoji="🛒")
-        b1.callback = self.create_ticket_suporte
-        b2.callback = self.create_ticket_denuncia
-        b3.callback = self.create_ticket_loja
 
         row = discord.ui.ActionRow(b1, b2, b3)
         footer = discord.ui.TextDisplay("-# www.frizzmc.com")
@@ -249,146 +590,342 @@ class PanelView(discord.ui.LayoutView):
         self.add_item(container)
         self.add_item(row)
 
-    # botoes
-    async def create_ticket_suporte(self, interaction: discord.Interaction):
-        await interaction.response.send_modal(TicketModal(" Suporte "))
-
-    async def create_ticket_denuncia(self, interaction: discord.Interaction):
-        await interaction.response.send_modal(TicketModal("Denúncia"))
-
-    async def create_ticket_loja(self, interaction: discord.Interaction):
-        await interaction.response.send_modal(TicketModal("  Loja  "))
+# botoes do painel -> categoria do modal
+PANEL_CATEGORIES = {
+    "suporte": " Suporte ",
+    "denuncia": "Denúncia",
+    "loja": "  Loja  ",
+}
+
+async def open_ticket_modal(interaction: discord.Interaction):
+    """Handler do roteador para 'create_ticket_<categoria>'."""
+    key = interaction.data["custom_id"][len("create_ticket_"):]
+    category = PANEL_CATEGORIES.get(key)
+    if category is None:
+        return
+    await interaction.response.send_modal(TicketModal(category))
 
 # controles dentro do ticket para visualizacao e gerenciamento
+# (os botões são só layout; os cliques chegam pelo roteador e funcionam mesmo após restart)
 class TicketControlsView(discord.ui.View):
-    def __init__(self, opener_id: int):
+    def __init__(self, opener_id: int | None = None):
         super().__init__(timeout=None)
         self.opener_id = opener_id
+        self.add_item(discord.ui.Button(label="Assumir", style=discord.ButtonStyle.success, custom_id="ticket:claim"))
+        self.add_item(discord.ui.Button(label="Fechar", style=discord.ButtonStyle.danger, custom_id="ticket:close"))
 
-    @discord.ui.button(label="Assumir", style=discord.ButtonStyle.success, custom_id="ticket:claim")
-    async def claim(self, interaction: discord.Interaction, button: discord.ui.Button):
+    @staticmethod
+    async def claim(interaction: discord.Interaction):
+        """Handler do roteador para 'ticket:claim'."""
         #checagem staff (depois fazer verificacao por cargos)
         if not interaction.guild.get_role(CONFIG.get("staff_role_id")) in interaction.user.roles:
             await interaction.response.send_message("Você não tem permissão para assumir tickets.", ephemeral=True)
             return
         await interaction.response.defer()
+        STATS.claimed(interaction.channel_id, interaction.user.id)
         if interaction.message and interaction.message.embeds:
             emb = interaction.message.embeds[0]
             emb.set_footer(text=f"Assumido por {interaction.user}")
-            await interaction.message.edit(embed=emb, view=self)
+            await interaction.message.edit(embed=emb, view=TicketControlsView())
         else:
             await interaction.followup.send("ticket assumido", ephemeral=True)
 
-    @discord.ui.button(label="Fechar", style=discord.ButtonStyle.danger, custom_id="ticket:close")
-
-    async def close(self, interaction: discord.Interaction, button: discord.ui.Button):
+    @staticmethod
+    async def close(interaction: discord.Interaction):
+        """Handler do roteador para 'ticket:close'."""
         await do_close(interaction, reason="Fechado via botão")
 
 # ===== acoes core ======
 
+# avaliacao 1-5 botoes
+class RatingView(discord.ui.View):
+    def __init__(self):
+        super().__init__(timeout=CONFIG.get("rating_timeout_sec", 20))
+        self.value: Optional[int] = None
+
+    @discord.ui.button(label="1", style=discord.ButtonStyle.secondary)
+    async def one(self, i: discord.Interaction, b: discord.ui.Button):
+        self.value = 1; self.stop(); await i.response.defer()
+
+    @discord.ui.button(label="2", style=discord.ButtonStyle.secondary)
+    async def two(self, i: discord.Interaction, b: discord.ui.Button):
+        self.value = 2; self.stop(); await i.response.defer()
+
+    @discord.ui.button(label="3", style=discord.ButtonStyle.secondary)
+    async def three(self, i: discord.Interaction, b: discord.ui.Button):
+        self.value = 3; self.stop(); await i.response.defer()
+
+    @discord.ui.button(label="4", style=discord.ButtonStyle.secondary)
+    async def four(self, i: discord.Interaction, b: discord.ui.Button):
+        self.value = 4; self.stop(); await i.response.defer()
+
+    @discord.ui.button(label="5", style=discord.ButtonStyle.secondary)
+    async def five(self, i: discord.Interaction, b: discord.ui.Button):
+        self.value = 5; self.stop(); await i.response.defer()
+
 async def do_close(interaction: discord.Interaction, reason: str):
     guild = interaction.guild
     channel = interaction.channel
-    assert guild and isinstance(channel, discord.TextChannel)
+    assert guild and isinstance(channel, (discord.TextChannel, discord.Thread))
 
     # checagem staff (depois fazer verificacao por cargos)
     if not interaction.guild.get_role(CONFIG.get("staff_role_id")) in interaction.user.roles:
         await interaction.response.send_message("Você não tem permissão para fechar tickets.", ephemeral=True)
         return
 
+    # o resto (avaliação, transcript, log, exclusão) roda na fila de encerramento
+    if not CLOSE_QUEUE.submit(channel, reason, closed_by=interaction.user.id):
+        await interaction.response.send_message("Este ticket já está sendo encerrado.", ephemeral=True)
+        return
     await interaction.response.defer()
-        
-    # avaliacao 1-5 botoes
-
-    class RatingView(discord.ui.View):
-        def __init__(self):
-            super().__init__(timeout=CONFIG.get("rating_timeout"))
-            self.value: Optional[int] = None
-
-        @discord.ui.button(label="1", style=discord.ButtonStyle.secondary)
-        async def one(self, i: discord.Interaction, b: discord.ui.Button):
-            self.value = 1; self.stop(); await i.response.defer()
-
-        @discord.ui.button(label="2", style=discord.ButtonStyle.secondary)
-        async def two(self, i: discord.Interaction, b: discord.ui.Button):
-            self.value = 2; self.stop(); await i.response.defer()
-
-        @discord.ui.button(label="3", style=discord.ButtonStyle.secondary)
-        async def three(self, i: discord.Interaction, b: discord.ui.Button):
-            self.value = 3; self.stop(); await i.response.defer()
-
-        @discord.ui.button(label="4", style=discord.ButtonStyle.secondary)
-        async def four(self, i: discord.Interaction, b: discord.ui.Button):
-            self.value = 4; self.stop(); await i.response.defer()
-
-        @discord.ui.button(label="5", style=discord.ButtonStyle.secondary)
-        async def five(self, i: discord.Interaction, b: discord.ui.Button):
-            self.value = 5; self.stop(); await i.response.defer()
-
-    msg = await channel.send("Por favor, avalie o atendimento de 1 a 5:")
-    view = RatingView()
-    await msg.edit(view=view)
-    try:
-        await view.wait()
-    except Exception:
-        pass
-    rating = view.value
-
-    # HTML TRANSCRIPT
-    transcript_file = None
-    transcript_err_note = ""    
-    try:
-        import chat_exporter
-        export = await chat_exporter.export(channel=channel, limit=None, tz_info='America/Sao_Paulo', military_time=True, bot=interaction.client)
-    
-        if export is not None:
-            html_bytes = export.encode('utf-8')
-
-            now = dt.datetime.now(SAO_TZ)
-            timestamp = now.strftime("%Y%m%d-%H%M%S")  # ex 20251009-142530
-
-            channel_part = safe_filename_part(getattr(channel, "name", f"channel-{channel.id}"))
-            filename=f"{channel_part}-{timestamp}.html"
 
-            transcript_file = discord.File(fp=BytesIO(html_bytes), filename=filename)
-
-    except Exception as e:
-        try:
-            await channel.send(f"Não foi possível gerar o HTML automático ({e}). Vou fechar sem transcript.")
-            transcript_err_note = f" | TranscriptError: {e!r}"
-        except Exception:
-            pass
+CLOSE_STAGES = ("rating", "transcript", "log", "lock", "delete")
+CLOSE_DELETE_DELAY_SEC = 5
+CLOSE_GUILD_RETRY_SEC = 300  # guild fora do cache (indisponível): o job espera, não é descartado
+
+@dataclass
+class CloseJob:
+    channel_id: int
+    guild_id: int
+    name: str
+    topic: Optional[str]
+    reason: str
+    closed_by: Optional[int] = None
+    stage: str = "rating"
+    rating: Optional[int] = None
+    attempts: int = 0
+    transcript: Optional[str] = None  # arquivo em TRANSCRIPT_DIR
+    note: str = ""
+    created_at: float = field(default_factory=time.time)
+
+class CloseQueue:
+    """
+    Encerramento de tickets em segundo plano. Cada job é persistido no TicketStore e
+    avança por etapas (avaliação -> transcript -> log -> lock -> exclusão); a etapa atual
+    é gravada antes de rodar, então jobs interrompidos por um restart continuam de onde
+    pararam. A avaliação só espera o usuário e roda fora do pool; as demais etapas rodam
+    em no máximo 'workers' jobs ao mesmo tempo, com retentativas e tempo por etapa.
+    """
+    def __init__(self, workers: int, max_attempts: int = 3):
+        self.workers = workers
+        self.max_attempts = max_attempts
+        self.bot: commands.Bot | None = None
+        self.store: TicketStore | None = None
+        self.jobs: dict[int, CloseJob] = {}
+        self._queue: asyncio.Queue | None = None
+        self._tasks: list[asyncio.Task] = []
+        self._waiting: set[asyncio.Task] = set()  # etapas de avaliação em andamento
+        self.running = 0
+        self.done = 0
+        self.failed = 0
+        self.retries = 0
+        self.stage_ms: dict[str, deque] = {s: deque(maxlen=500) for s in CLOSE_STAGES}
+
+    async def start(self, bot: commands.Bot, store: TicketStore):
+        self.bot, self.store = bot, store
+        self._queue = asyncio.Queue()
+        for row in await store.load_close_jobs():
+            job = CloseJob(**row)
+            if job.stage == "rating":
+                job.stage = "transcript"  # a view de avaliação não sobrevive ao restart
+                self._save(job)
+            self.jobs[job.channel_id] = job
+            self._queue.put_nowait(job.channel_id)
+        if self.jobs:
+            print(f"[tickets] retomando {len(self.jobs)} encerramento(s) pendente(s)")
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def stop(self):
+        tasks = self._tasks + list(self._waiting)
+        for t in tasks:
+            t.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._tasks.clear()
+        self._waiting.clear()
+        self.jobs.clear()
+
+    def depth(self) -> int:
+        return self._queue.qsize() if self._queue else 0
+
+    def submit(self, channel: discord.TextChannel | discord.Thread, reason: str, *, closed_by: Optional[int] = None) -> bool:
+        """Registra o encerramento; False se o canal já tem um job."""
+        if channel.id in self.jobs:
+            return False
+        job = CloseJob(channel_id=channel.id, guild_id=channel.guild.id, name=channel.name,
+                       topic=ticket_topic(channel), reason=reason, closed_by=closed_by)
+        self.jobs[channel.id] = job
+        self._save(job)
+        STATS.closed(channel.id, channel.guild.id, extract_category(job.topic), extract_author_id(job.topic),
+                     discord.utils.snowflake_time(channel.id).timestamp(), closed_by, reason)
+        SLA.forget(channel.id)
+        t = asyncio.create_task(self._rating(job, channel))
+        self._waiting.add(t)
+        t.add_done_callback(self._waiting.discard)
+        return True
+
+    # ---- persistência / fila ----
+
+    def _save(self, job: CloseJob):
+        self.store.save_close_job(asdict(job))
+
+    def _advance(self, job: CloseJob):
+        job.stage = CLOSE_STAGES[CLOSE_STAGES.index(job.stage) + 1]
+        job.attempts = 0
+        self._save(job)
+        self._queue.put_nowait(job.channel_id)
+
+    def _enqueue_later(self, job: CloseJob, delay: float):
+        async def put():
+            if self.jobs.get(job.channel_id) is job:
+                self._queue.put_nowait(job.channel_id)
+        self.bot.scheduler.schedule(f"ticket:close:{job.channel_id}", time.time() + delay, put)
+
+    def _finish(self, job: CloseJob, *, failed: bool = False):
+        self.jobs.pop(job.channel_id, None)
+        self.store.delete_close_job(job.channel_id)
+        if job.transcript:
+            remove_transcript(job.transcript)
+        CAPTURE.discard(job.channel_id)
+        if failed:
+            self.failed += 1
+        else:
+            self.done += 1
 
-    logs_channel = guild.get_channel(CONFIG.get("logs_channel_id")) if CONFIG.get("logs_channel_id") != 0 else None
-    meta = f"Ticket: {channel.name} | Author: {extract_author_id(channel.topic)} | Categoria: {extract_category(channel.topic)} | Nota: {rating if rating else 'N/A'} | Motivo: {reason}{transcript_err_note}"
+    # ---- etapas ----
 
-    if logs_channel and isinstance(logs_channel, discord.TextChannel):
+    async def _rating(self, job: CloseJob, channel: discord.TextChannel | discord.Thread):
+        t0 = time.perf_counter()
         try:
-            if transcript_file:
-                await logs_channel.send(content=meta, file=transcript_file)
-            else:
-                await logs_channel.send(content=meta)
+            view = RatingView()
+            await channel.send("Por favor, avalie o atendimento de 1 a 5:", view=view)
+            await view.wait()
+            job.rating = view.value
+            if job.rating:
+                STATS.rated(job.channel_id, job.rating)
         except Exception as e:
-            print(e)
-            pass
-    
-    # remover permissao de escrita para todos (exceto staff)
-    overwrites = channel.overwrites
-    author_id = extract_author_id(channel.topic)
-    if author_id:
-        member = guild.get_member(int(author_id))
-        if member and member in overwrites:
-            overwrites.pop(member, None)
-    
-        await channel.edit(overwrites=overwrites, reason="Ticket encerrado")
-
-        # enviar log para canal de logs
-        # delete provisorio
-        wait_time = 5  # segundos
-        await channel.send(f"Ticket encerrado. Este canal será excluído em {wait_time} segundos.")
-
-        await asyncio.sleep(wait_time)
-        await channel.delete(reason="Ticket encerrado")
+            print(f"[tickets] avaliação do ticket {job.channel_id} falhou: {e!r}")
+        self.stage_ms["rating"].append((time.perf_counter() - t0) * 1000)
+        if self.jobs.get(job.channel_id) is job:
+            self._advance(job)
+
+    async def _worker(self):
+        # jobs retomados no cog_load chegam antes do cache de guilds: sem isso, get_guild()
+        # devolve None e o encerramento seria tratado como "canal já excluído"
+        await self.bot.wait_until_ready()
+        while True:
+            channel_id = await self._queue.get()
+            job = self.jobs.get(channel_id)
+            if job is None:
+                continue
+            self.running += 1
+            t0 = time.perf_counter()
+            stage = job.stage
+            try:
+                await self._run_stage(job)
+            except discord.NotFound:
+                self._finish(job)  # canal já não existe
+            except Exception as e:
+                job.attempts += 1
+                if job.attempts < self.max_attempts:
+                    self.retries += 1
+                    self._save(job)
+                    self._enqueue_later(job, 2 ** job.attempts)
+                else:
+                    print(f"[tickets] etapa '{stage}' do ticket {job.channel_id} falhou: {e!r}")
+                    self._give_up(job, e)
+            finally:
+                self.running -= 1
+                self.stage_ms[stage].append((time.perf_counter() - t0) * 1000)
+
+    def _give_up(self, job: CloseJob, e: Exception):
+        if job.stage == "transcript":
+            job.note += f" | TranscriptError: {e!r}"
+            job.transcript = None
+        elif job.stage == "delete":
+            return self._finish(job, failed=True)
+        self._advance(job)  # log/lock falhos não impedem a exclusão
+
+    async def _run_stage(self, job: CloseJob):
+        guild = self.bot.get_guild(job.guild_id)
+        if guild is None or guild.unavailable:
+            # guild ausente não significa canal excluído: mantém o job (persistido) e tenta depois
+            print(f"[tickets] guild {job.guild_id} indisponível; encerramento de {job.channel_id} adiado")
+            return self._enqueue_later(job, CLOSE_GUILD_RETRY_SEC)
+        channel = guild.get_channel_or_thread(job.channel_id)
+        if channel is None and job.stage != "log":
+            return self._finish(job)
+
+        if job.stage == "transcript":
+            # HTML TRANSCRIPT (paginado, renderizado numa thread direto para disco: .html para o log, .html.gz arquivado)
+            now = dt.datetime.now(SAO_TZ)
+            timestamp = now.strftime("%Y%m%d-%H%M%S")  # ex 20251009-142530
+            channel_part = safe_filename_part(job.name or f"channel-{job.channel_id}")
+            filename = f"{channel_part}-{timestamp}.html"
+            try:
+                # com captura: só a lacuna desde a última mensagem gravada vem do REST
+                if job.channel_id in CAPTURE and await CAPTURE.backfill(channel):
+                    await CAPTURE.flush()
+                    await export_capture(capture_path(job.channel_id), filename, f"Transcript de #{job.name}", tz=SAO_TZ)
+                else:
+                    await export_channel(channel, filename, tz=SAO_TZ)
+            except discord.NotFound:
+                raise
+            except Exception as e:
+                if job.attempts + 1 >= self.max_attempts:
+                    try:
+                        await channel.send(f"Não foi possível gerar o HTML automático ({e}). Vou fechar sem transcript.")
+                    except Exception:
+                        pass
+                raise
+            job.transcript = filename
+            return self._advance(job)
+
+        if job.stage == "log":
+            logs_channel = guild.get_channel(CONFIG.get("logs_channel_id")) if CONFIG.get("logs_channel_id") != 0 else None
+            meta = f"Ticket: {job.name} | Author: {extract_author_id(job.topic)} | Categoria: {extract_category(job.topic)} | Nota: {job.rating if job.rating else 'N/A'} | Motivo: {job.reason}{job.note}"
+            if logs_channel and isinstance(logs_channel, discord.TextChannel):
+                path = transcript_path(job.transcript) if job.transcript else None
+                if path and os.path.isfile(path):
+                    # discord.File com caminho: o upload lê do disco, sem cópia em memória
+                    await logs_channel.send(content=meta, file=discord.File(path, filename=job.transcript))
+                else:
+                    await logs_channel.send(content=meta)
+            if job.transcript:
+                remove_transcript(job.transcript)
+                job.transcript = None
+                if config.TRANSCRIPT_ARCHIVE_DAYS > 0:
+                    await asyncio.to_thread(prune_archives)
+            return self._advance(job)
+
+        if job.stage == "lock":
+            # remover permissao de escrita para todos (exceto staff)
+            author_id = extract_author_id(job.topic)
+            if isinstance(channel, discord.Thread):
+                # thread: o acesso é a membresia; tira o autor e tranca
+                if author_id:
+                    await channel.remove_user(discord.Object(id=author_id))
+                await channel.edit(locked=True, reason="Ticket encerrado")
+            elif author_id:
+                overwrites = channel.overwrites
+                member = guild.get_member(int(author_id))
+                if member and member in overwrites:
+                    overwrites.pop(member, None)
+                    await channel.edit(overwrites=overwrites, reason="Ticket encerrado")
+
+            await channel.send(f"Ticket encerrado. Este canal será excluído em {CLOSE_DELETE_DELAY_SEC} segundos.")
+            # a espera não ocupa um worker: o agendador devolve o job à fila
+            job.stage = "delete"
+            job.attempts = 0
+            self._save(job)
+            return self._enqueue_later(job, CLOSE_DELETE_DELAY_SEC)
+
+        if job.stage == "delete":
+            await channel.delete(reason="Ticket encerrado")
+            OPEN_TICKETS.drop_channel(job.channel_id)
+            THREADS.forget(job.channel_id)
+            return self._finish(job)
+
+CLOSE_QUEUE = CloseQueue(workers=config.TICKET_CLOSE_WORKERS)
 
 def extract_author_id(topic: Optional[str]) -> Optional[int]:
     try:
@@ -409,17 +946,432 @@ def extract_category(topic: Optional[str]) -> str:
             return part.split('=')[1].strip()
     return "desconhecida"
 
+class TicketThreads:
+    """
+    Tickets em thread privada. Threads não têm tópico, então autor e categoria ficam aqui
+    (persistidos no TicketStore) e ticket_topic() monta o mesmo formato dos canais: o resto
+    do código (extract_author_id, índice, encerramento) não distingue os dois modos.
+    """
+    def __init__(self):
+        self.store: TicketStore | None = None
+        self.threads: dict[int, tuple[int, int, str]] = {}  # thread_id -> (guild_id, author_id, categoria)
+
+    async def load(self, store: TicketStore):
+        self.store = store
+        for thread_id, guild_id, author_id, category in await store.load_threads():
+            self.threads[thread_id] = (guild_id, author_id, category)
+
+    def __contains__(self, thread_id: int) -> bool:
+        return thread_id in self.threads
+
+    def put(self, thread_id: int, guild_id: int, author_id: int, category: str):
+        self.threads[thread_id] = (guild_id, author_id, category)
+        if self.store:
+            self.store.save_thread(thread_id, guild_id, author_id, category)
+
+    def forget(self, thread_id: int):
+        if self.threads.pop(thread_id, None) is not None and self.store:
+            self.store.delete_thread(thread_id)
+
+    def topic(self, thread_id: int) -> Optional[str]:
+        entry = self.threads.get(thread_id)
+        if entry is None:
+            return None
+        _guild_id, author_id, category = entry
+        return f"ticket_category={category}; ticket_author_id={author_id}"
+
+    def for_guild(self, guild_id: int) -> list[int]:
+        return [tid for tid, entry in self.threads.items() if entry[0] == guild_id]
+
+    async def revive(self, guild: discord.Guild):
+        """
+        Threads arquivadas saem do cache do discord.py. Depois do ready, busca as que
+        faltam: apagadas saem do registro, arquivadas (ticket ainda aberto) são reabertas.
+        """
+        for thread_id in self.for_guild(guild.id):
+            if guild.get_thread(thread_id) is not None or thread_id in CLOSE_QUEUE.jobs:
+                continue
+            try:
+                thread = await guild.fetch_channel(thread_id)
+                if isinstance(thread, discord.Thread) and thread.archived and not thread.locked:
+                    await thread.edit(archived=False)
+                    guild._add_thread(thread)
+            except discord.NotFound:
+                self.forget(thread_id)
+            except discord.HTTPException as e:
+                print(f"[tickets] não foi possível reabrir a thread {thread_id}: {e!r}")
+
+THREADS = TicketThreads()
+
+def ticket_topic(channel) -> Optional[str]:
+    """Tópico do ticket; para threads, o equivalente montado a partir do registro."""
+    if isinstance(channel, discord.Thread):
+        return THREADS.topic(channel.id)
+    return getattr(channel, "topic", None)
+
+class OpenTicketIndex:
+    """
+    (guild_id, author_id) -> canal do ticket aberto, para o one_ticket_per_user ser O(1).
+    Construído uma vez por guild a partir dos tópicos ('ticket_author_id=') e mantido pelos
+    eventos de criação/remoção/edição de canal. Persistido no TicketStore: num restart a
+    guild já indexada só confere se os canais salvos ainda existem, sem varrer os tópicos.
+    """
+    def __init__(self):
+        self.store: TicketStore | None = None
+        self._by_author: dict[tuple[int, int], int] = {}
+        self._by_channel: dict[int, tuple[int, int]] = {}
+        self._ready: set[int] = set()  # guilds com índice válido nesta execução
+        self._persisted: set[int] = set()  # guilds indexadas em execuções anteriores
+
+    async def load(self, store: TicketStore):
+        self.store = store
+        rows, self._persisted = await store.load_open_tickets()
+        for guild_id, author_id, channel_id in rows:
+            self._by_author[(guild_id, author_id)] = channel_id
+            self._by_channel[channel_id] = (guild_id, author_id)
+
+    def put(self, guild_id: int, author_id: int, channel_id: int):
+        key = (guild_id, author_id)
+        old = self._by_author.get(key)
+        if old == channel_id:
+            return
+        if old is not None:
+            self._by_channel.pop(old, None)
+        self._by_author[key] = channel_id
+        self._by_channel[channel_id] = key
+        if self.store:
+            self.store.save_open_ticket(guild_id, author_id, channel_id)
+
+    def drop_channel(self, channel_id: int):
+        key = self._by_channel.pop(channel_id, None)
+        if key is None:
+            return
+        if self._by_author.get(key) == channel_id:
+            del self._by_author[key]
+            if self.store:
+                self.store.delete_open_ticket(*key)
+
+    def observe(self, channel):
+        """Canal criado ou editado: (re)indexa pelo tópico."""
+        author_id = extract_author_id(ticket_topic(channel))
+        key = self._by_channel.get(channel.id)
+        if key is not None and key[1] != author_id:
+            self.drop_channel(channel.id)
+        if author_id:
+            self.put(channel.guild.id, author_id, channel.id)
+
+    def ensure(self, guild: discord.Guild):
+        """Deixa o índice da guild válido: confere o que veio do disco ou varre os tópicos uma vez."""
+        if guild.id in self._ready:
+            return
+        if guild.id in self._persisted:
+            for channel_id, key in list(self._by_channel.items()):
+                if key[0] != guild.id:
+                    continue
+                ch = guild.get_channel_or_thread(channel_id)
+                if ch is None or extract_author_id(ticket_topic(ch)) != key[1]:
+                    self.drop_channel(channel_id)
+        else:
+            for ch in guild.text_channels:
+                if ch.topic and "ticket_author_id=" in ch.topic:
+                    self.observe(ch)
+            for thread_id in THREADS.for_guild(guild.id):
+                ch = guild.get_thread(thread_id)
+                if ch is not None:
+                    self.observe(ch)
+            if self.store:
+                self.store.mark_indexed(guild.id)
+            self._persisted.add(guild.id)
+        self._ready.add(guild.id)
+
+    def get(self, guild: discord.Guild, author_id: int) -> Optional[discord.abc.GuildChannel | discord.Thread]:
+        self.ensure(guild)
+        channel_id = self._by_author.get((guild.id, author_id))
+        if channel_id is None:
+            return None
+        ch = guild.get_channel_or_thread(channel_id)
+        if ch is None:
+            self.drop_channel(channel_id)
+        return ch
+
+    def channels(self) -> list[tuple[int, int, int]]:
+        """Tickets abertos indexados: [(channel_id, guild_id, author_id)] (cópia)."""
+        return [(channel_id, guild_id, author_id) for channel_id, (guild_id, author_id) in self._by_channel.items()]
+
+    def forget_guild(self, guild_id: int):
+        """Bot saiu da guild: o índice dela é revalidado se o bot voltar."""
+        self._ready.discard(guild_id)
+
+OPEN_TICKETS = OpenTicketIndex()
+
+CAPTURE = CaptureLog()
+
+@dataclass
+class SlaState:
+    guild_id: int
+    last_user: float
+    last_staff: float
+    warned: bool = False
+
+class SlaEngine:
+    """
+    Prazos de SLA dos tickets abertos (sla_warn_hours / sla_autoclose_hours).
+    Guarda por canal o último contato do usuário e da staff (tabela 'sla') e mantém no
+    máximo dois prazos por ticket no agendador central (um heap só, sem loop por ticket):
+    - aviso: usuário esperando resposta da staff há sla_warn_hours;
+    - autoclose: ticket sem nenhuma atividade há sla_autoclose_hours (via fila de encerramento).
+    No restart o estado vem da tabela e só é adiantado pelo last_message_id do canal.
+    """
+    def __init__(self):
+        self.bot: commands.Bot | None = None
+        self.store: TicketStore | None = None
+        self.tickets: dict[int, SlaState] = {}
+        self.warned = 0
+        self.autoclosed = 0
+
+    async def start(self, bot: commands.Bot, store: TicketStore):
+        self.bot, self.store = bot, store
+        for channel_id, guild_id, last_user, last_staff, warned in await store.load_sla():
+            self.tickets[channel_id] = SlaState(guild_id, last_user, last_staff, bool(warned))
+        CONFIG.subscribe(self._on_config)
+
+    def stop(self):
+        CONFIG.unsubscribe(self._on_config)
+        if self.bot:
+            self.bot.scheduler.cancel_prefix("ticket:sla:")
+        self.tickets.clear()
+
+    def rebuild(self):
+        """Depois do ready: adianta pelo last_message_id, adota tickets sem estado e agenda tudo."""
+        for channel_id in list(self.tickets):
+            channel = self.bot.get_channel(channel_id)
+            if channel is None:
+                self.forget(channel_id)
+                continue
+            st = self.tickets[channel_id]
+            if channel.last_message_id:
+                ts = discord.utils.snowflake_time(channel.last_message_id).timestamp()
+                # autor desconhecido: estende o lado que falou por último
+                if st.last_user > st.last_staff and ts > st.last_user:
+                    st.last_user = ts
+                elif ts > max(st.last_user, st.last_staff):
+                    st.last_staff = ts
+                self._save(channel_id)
+            self._schedule(channel_id)
+
+        for channel_id, guild_id, _author in OPEN_TICKETS.channels():
+            if channel_id in self.tickets or channel_id in CLOSE_QUEUE.jobs:
+                continue
+            channel = self.bot.get_channel(channel_id)
+            if channel is None:
+                continue
+            ts = discord.utils.snowflake_time(channel.last_message_id or channel_id).timestamp()
+            self.track(channel_id, guild_id, ts, staff=True)
+
+    # ---- atividade ----
+
+    def track(self, channel_id: int, guild_id: int, ts: float, *, staff: bool):
+        st = self.tickets.get(channel_id)
+        if st is None:
+            # ticket novo espera a staff; adotado (staff=True) só conta para o autoclose
+            st = self.tickets[channel_id] = SlaState(guild_id, ts, ts if staff else 0.0)
+        elif staff:
+            st.last_staff = ts
+        else:
+            st.last_user = ts
+            st.warned = False
+        self._save(channel_id)
+        self._schedule(channel_id)
+
+    def on_message(self, message: discord.Message):
+        if message.channel.id not in self.tickets or message.author.bot:
+            return
+        roles = {r.id for r in getattr(message.author, "roles", ())}
+        staff = bool(roles & {CONFIG.get("staff_role_id"), CONFIG.get("admin_role_id")})
+        self.track(message.channel.id, message.guild.id, message.created_at.timestamp(), staff=staff)
+
+    def forget(self, channel_id: int):
+        if self.tickets.pop(channel_id, None) is not None:
+            self.store.delete_sla(channel_id)
+            self.bot.scheduler.cancel(f"ticket:sla:warn:{channel_id}")
+            self.bot.scheduler.cancel(f"ticket:sla:close:{channel_id}")
+
+    # ---- prazos ----
+
+    def _save(self, channel_id: int):
+        st = self.tickets[channel_id]
+        self.store.save_sla(channel_id, st.guild_id, st.last_user, st.last_staff, st.warned)
+
+    def _schedule(self, channel_id: int):
+        st = self.tickets[channel_id]
+        sched = self.bot.scheduler
+        warn_h = CONFIG.get("sla_warn_hours") or 0
+        close_h = CONFIG.get("sla_autoclose_hours") or 0
+
+        key = f"ticket:sla:warn:{channel_id}"
+        if warn_h > 0 and not st.warned and st.last_user > st.last_staff:
+            sched.schedule(key, st.last_user + warn_h * 3600, functools.partial(self._warn, channel_id))
+        else:
+            sched.cancel(key)
+
+        key = f"ticket:sla:close:{channel_id}"
+        if close_h > 0:
+            last = max(st.last_user, st.last_staff)
+            sched.schedule(key, last + close_h * 3600, functools.partial(self._autoclose, channel_id))
+        else:
+            sched.cancel(key)
+
+    def _on_config(self, snapshot, changed: set[str]):
+        if changed & {"sla_warn_hours", "sla_autoclose_hours"} and self.bot:
+            for channel_id in self.tickets:
+                self._schedule(channel_id)
+
+    async def _warn(self, channel_id: int):
+        st = self.tickets.get(channel_id)
+        channel = self.bot.get_channel(channel_id)
+        if st is None or channel is None:
+            return
+        st.warned = True
+        self._save(channel_id)
+        hours = CONFIG.get("sla_warn_hours")
+        await channel.send(f"<@&{CONFIG.get('staff_role_id')}> ⏰ Este ticket está aguardando resposta da staff há mais de {hours}h.")
+        self.warned += 1
+
+    async def _autoclose(self, channel_id: int):
+        channel = self.bot.get_channel(channel_id)
+        if channel is None:
+            return self.forget(channel_id)
+        if CLOSE_QUEUE.submit(channel, f"Fechado automaticamente após {CONFIG.get('sla_autoclose_hours')}h sem atividade (SLA)"):
+            self.autoclosed += 1
+
+SLA = SlaEngine()
+
+async def build_ticket_index(bot: commands.Bot):
+    await bot.wait_until_ready()
+    for guild in bot.guilds:
+        await THREADS.revive(guild)
+        OPEN_TICKETS.ensure(guild)
+
+    # logs de captura: descarta os de canais que sumiram e cobre o que chegou com o bot
+    # fora do ar (só canais cujo last_message_id difere do último id gravado)
+    for channel_id in CAPTURE.channels():
+        channel = bot.get_channel(channel_id)
+        if channel is None:
+            if channel_id not in CLOSE_QUEUE.jobs:
+                CAPTURE.discard(channel_id)
+            continue
+        try:
+            if not await CAPTURE.backfill(channel):
+                CAPTURE.discard(channel_id)  # lacuna grande demais: o transcript busca o histórico
+        except Exception as e:
+            print(f"[capture] backfill de {channel_id} falhou: {e!r}")
+
+    SLA.rebuild()
+
+    for guild in bot.guilds:
+        POOL.adopt(guild)
+
 class Tickets(commands.Cog):
     def __init__(self, bot: commands.Bot):
         self.bot = bot
+        self.store = TicketStore()
 
     # recuperar painel
     async def cog_load(self):
+        router = self.bot.router
+        router.register("create_ticket_", open_ticket_modal)
+        router.register("ticket:claim", TicketControlsView.claim)
+        router.register("ticket:close", TicketControlsView.close)
+        CONFIG.start()
+        await self.store.open()
+        await STATS.open()
+        await THREADS.load(self.store)
+        await OPEN_TICKETS.load(self.store)
+        await CAPTURE.open()
+        await CLOSE_QUEUE.start(self.bot, self.store)
+        await SLA.start(self.bot, self.store)
+        POOL.start(self.bot)
+        asyncio.create_task(build_ticket_index(self.bot))
         try:
             asyncio.create_task(restore_panel(self.bot))
         except Exception as e:
             print(f"[tickets] Startup restore failed to schedule: {e}")
 
+    async def cog_unload(self):
+        for prefix in ("create_ticket_", "ticket:claim", "ticket:close"):
+            self.bot.router.unregister(prefix)
+        self.bot.scheduler.cancel_prefix("ticket:close:")
+        SLA.stop()
+        await CREATE_QUEUE.stop()
+        await POOL.stop()
+        await CLOSE_QUEUE.stop()
+        await CAPTURE.close()
+        await self.store.close()
+        await STATS.close()
+        await CONFIG.stop()
+
+    async def flush_state(self):
+        """Grava escritas pendentes (chamado pelo /restart antes do execv)."""
+        await self.store.flush()
+        await STATS.flush()
+        await CAPTURE.flush()
+        await CONFIG.flush()
+
+    # manter o índice de tickets abertos
+    @commands.Cog.listener()
+    async def on_guild_channel_create(self, channel: discord.abc.GuildChannel):
+        if isinstance(channel, discord.TextChannel):
+            OPEN_TICKETS.observe(channel)
+
+    @commands.Cog.listener()
+    async def on_guild_channel_update(self, before: discord.abc.GuildChannel, after: discord.abc.GuildChannel):
+        if isinstance(after, discord.TextChannel) and getattr(before, "topic", None) != after.topic:
+            OPEN_TICKETS.observe(after)
+
+    @commands.Cog.listener()
+    async def on_guild_channel_delete(self, channel: discord.abc.GuildChannel):
+        self._ticket_gone(channel.id)
+
+    # tickets em thread privada
+    @commands.Cog.listener()
+    async def on_raw_thread_delete(self, payload: discord.RawThreadDeleteEvent):
+        if payload.thread_id in THREADS:
+            self._ticket_gone(payload.thread_id)
+            THREADS.forget(payload.thread_id)
+
+    @commands.Cog.listener()
+    async def on_thread_update(self, before: discord.Thread, after: discord.Thread):
+        # auto-arquivamento por inatividade não encerra o ticket: reabre
+        if after.id in THREADS and after.archived and not after.locked and after.id not in CLOSE_QUEUE.jobs:
+            try:
+                await after.edit(archived=False)
+            except discord.HTTPException as e:
+                print(f"[tickets] não foi possível reabrir a thread {after.id}: {e!r}")
+
+    def _ticket_gone(self, channel_id: int):
+        OPEN_TICKETS.drop_channel(channel_id)
+        SLA.forget(channel_id)
+        if channel_id not in CLOSE_QUEUE.jobs:
+            CAPTURE.discard(channel_id)
+
+    # captura incremental (só canais com log iniciado na criação do ticket)
+    @commands.Cog.listener()
+    async def on_message(self, message: discord.Message):
+        CAPTURE.message(message)
+        SLA.on_message(message)
+
+    @commands.Cog.listener()
+    async def on_raw_message_edit(self, payload: discord.RawMessageUpdateEvent):
+        CAPTURE.edit(payload)
+
+    @commands.Cog.listener()
+    async def on_raw_message_delete(self, payload: discord.RawMessageDeleteEvent):
+        CAPTURE.delete(payload.channel_id, payload.message_id)
+
+    @commands.Cog.listener()
+    async def on_guild_remove(self, guild: discord.Guild):
+        OPEN_TICKETS.forget_guild(guild.id)
+
     # grupo de comandos /ticket
     group = app_commands.Group(name="ticket", description="Utilidades e configuracoes de tickets.")
 
@@ -443,9 +1395,7 @@ class Tickets(commands.Cog):
         await interaction.followup.send("Painel publicado.", ephemeral=True)
 
         # salvar id da mensagem e canal
-        CONFIG["last_ticket_message_id"] = msg.id
-        CONFIG["last_ticket_channel_id"] = msg.channel.id
-        save_config(CONFIG)
+        CONFIG.update(last_ticket_message_id=msg.id, last_ticket_channel_id=msg.channel.id)
         
     #comando de /ticket lock
     @group.command(name="lock", description="Comando de lock (apenas para staff).") 
@@ -453,6 +1403,19 @@ class Tickets(commands.Cog):
     async def lock(self, interaction: discord.Interaction):
         
         canal = interaction.channel
+        if isinstance(canal, discord.Thread):
+            # thread privada: trancar impede mensagens de quem não gerencia threads
+            if canal.locked:
+                await interaction.response.send_message("Esta thread já está fechada.", ephemeral=True)
+                return
+            try:
+                await canal.edit(locked=True, reason=f"Trancado por {interaction.user}")
+                await interaction.response.send_message("Thread trancada com sucesso.", ephemeral=True)
+                await canal.send(f"Este ticket foi trancado por {interaction.user.mention}")
+            except discord.Forbidden:
+                await interaction.response.send_message("Erro: Eu não tenho permissão para 'Gerenciar Threads' aqui.", ephemeral=True)
+            return
+
         everyone_role = interaction.guild.default_role
         overwrites = canal.overwrites_for(everyone_role)
         
@@ -475,9 +1438,74 @@ class Tickets(commands.Cog):
         
             await interaction.response.send_message(f"Ocorreu um erro inesperado: {e}", ephemeral=True)                  
 
+    # fila de encerramento
+    @group.command(name="queue", description="Mostra as filas de criação e encerramento de tickets.")
+    @app_commands.checks.has_permissions(administrator=True)
+    async def queue(self, interaction: discord.Interaction):
+        q = CLOSE_QUEUE
+        lines = [
+            f"Encerramentos: na fila={q.depth()} rodando={q.running}/{q.workers} pendentes={len(q.jobs)} "
+            f"concluídos={q.done} falhas={q.failed} retentativas={q.retries}"
+        ]
+        for stage, xs in q.stage_ms.items():
+            if xs:
+                s = sorted(xs)
+                lines.append(f"`{stage}` p50={s[len(s) // 2]:.0f} ms máx={s[-1]:.0f} ms (n={len(s)})")
+        p50, p99 = CREATE_QUEUE.latency_percentiles()
+        c = CREATE_QUEUE
+        lines.append(
+            f"Criação: na fila={c.depth()} criando={c.in_flight} criados={c.created} falhas={c.failed} "
+            f"duplicados={c.duplicates} 429={c.rate_limited} latência p50={p50:.0f} ms p99={p99:.0f} ms"
+        )
+        hit = sorted(POOL.hit_ms)
+        miss = sorted(POOL.miss_ms)
+        lines.append(
+            f"Pool: livres={POOL.size(interaction.guild.id)}/{CONFIG.get('channel_pool_size')} acertos={POOL.hits} "
+            f"(p50={hit[len(hit) // 2] if hit else 0:.0f} ms) faltas={POOL.misses} (p50={miss[len(miss) // 2] if miss else 0:.0f} ms)"
+        )
+        lines.append(f"SLA: acompanhados={len(SLA.tickets)} avisos={SLA.warned} autoclose={SLA.autoclosed}")
+        await interaction.response.send_message("\n".join(lines), ephemeral=True)
+
+    @group.command(name="stats", description="Estatísticas dos tickets por categoria.")
+    @app_commands.describe(period="Período considerado (pela data de abertura)")
+    @app_commands.choices(period=[
+        app_commands.Choice(name="Últimas 24 horas", value=1),
+        app_commands.Choice(name="Últimos 7 dias", value=7),
+        app_commands.Choice(name="Últimos 30 dias", value=30),
+        app_commands.Choice(name="Tudo", value=0),
+    ])
+    @ticket_admin_only()
+    async def stats(self, interaction: discord.Interaction, period: Optional[app_commands.Choice[int]] = None):
+        days = period.value if period else 7
+        since = time.time() - days * 86400 if days else 0.0
+        t0 = time.perf_counter()
+        rows = await STATS.summary(interaction.guild.id, since)
+        took = (time.perf_counter() - t0) * 1000
+
+        def fmt(sec: Optional[float]) -> str:
+            if sec is None:
+                return "—"
+            if sec < 3600:
+                return f"{sec / 60:.0f} min"
+            return f"{sec / 3600:.1f} h"
+
+        label = period.name if period else "Últimos 7 dias"
+        embed = discord.Embed(title=f"Estatísticas de tickets — {label}", colour=0x2fffeb, timestamp=discord.utils.utcnow())
+        if not rows:
+            embed.description = "Nenhum ticket no período."
+        for r in rows[:25]:
+            rating = f"{r.avg_rating:.2f} ({r.rated})" if r.avg_rating is not None else "—"
+            embed.add_field(name=r.category, inline=False, value=(
+                f"abertos={r.opened} assumidos={r.claimed} fechados={r.closed}\n"
+                f"mediana até assumir: {fmt(r.median_claim_sec)} | mediana até fechar: {fmt(r.median_close_sec)}\n"
+                f"nota média: {rating}"
+            ))
+        embed.set_footer(text=f"consulta em {took:.0f} ms")
+        await interaction.response.send_message(embed=embed, ephemeral=True)
+
     #debug 
     @group.command(name="debug", description="Comando de debug (apenas admins).")
-    @app_commands.checks.has_role(CONFIG.get("admin_role_id"))
+    @ticket_admin_only()
     async def debug(self, interaction: discord.Interaction):
         # format message to ping roles and channels within the config
         message = f"Current CONFIG: {CONFIG}"
@@ -487,7 +1515,7 @@ class Tickets(commands.Cog):
             if role:
                 message += f"\n- {role.mention} ({role.name})"
         message += "\n\n**Channels:**"
-        for channel_id in [CONFIG.get("panel_channel_id"), CONFIG.get("logs_channel_id"), CONFIG.get("ticket_category_id")]:
+        for channel_id in [CONFIG.get("panel_channel_id"), CONFIG.get("logs_channel_id"), CONFIG.get("ticket_category_id"), CONFIG.get("thread_parent_channel_id")]:
             channel = interaction.guild.get_channel(channel_id)
             if channel:
                 message += f"\n- {channel.mention} ({channel.name})"
@@ -510,7 +1538,8 @@ class Tickets(commands.Cog):
 
     # configurar tickets
     @group.command(name="config", description="Configura IDs de canais e cargos")
-    @app_commands.describe(panel_channel_id="Canal onde o painel de tickets sera postado", logs_channel_id="Canal onde os logs de tickets serao enviados", ticket_category_id="Categoria onde os tickets serao criados", staff_role_id="Cargo que tera acesso aos tickets", admin_role_id="Cargo com permissoes administrativas no bot", one_ticket_per_user="Permitir apenas um ticket por usuario", enable_anonymous_reports="Permitir tickets anonimos", rating_timeout_sec="Tempo (em segundos) para aguardar avaliacao apos fechamento do ticket (default 20s)", sla_warn_hours="Horas para avisar sobre SLA (0 para desativar, default 24h)", sla_autoclose_hours="Horas para fechar automaticamente o ticket (0 para desativar, default 48h)")
+    @app_commands.describe(panel_channel_id="Canal onde o painel de tickets sera postado", logs_channel_id="Canal onde os logs de tickets serao enviados", ticket_category_id="Categoria onde os tickets serao criados", staff_role_id="Cargo que tera acesso aos tickets", admin_role_id="Cargo com permissoes administrativas no bot", one_ticket_per_user="Permitir apenas um ticket por usuario", enable_anonymous_reports="Permitir tickets anonimos", rating_timeout_sec="Tempo (em segundos) para aguardar avaliacao apos fechamento do ticket (default 20s)", sla_warn_hours="Horas para avisar sobre SLA (0 para desativar, default 24h)", sla_autoclose_hours="Horas para fechar automaticamente o ticket (0 para desativar, default 48h)", capture_messages="Gravar as mensagens dos tickets localmente (transcript sem buscar o historico)", channel_pool_size="Canais de ticket pre-criados e ocultos na categoria (0 desativa)", ticket_mode="Canal por ticket ou thread privada (sem limite de canais)", thread_parent_channel_id="Canal onde as threads de ticket serao criadas (modo thread)")
+    @app_commands.choices(ticket_mode=[app_commands.Choice(name="Canal", value="channel"), app_commands.Choice(name="Thread privada", value="thread")])
     @app_commands.checks.has_permissions(administrator=True)
     async def config_cmd(self, interaction: discord.Interaction,
         panel_channel_id: Optional[discord.TextChannel] = None,
@@ -522,66 +1551,69 @@ class Tickets(commands.Cog):
         enable_anonymous_reports: Optional[bool] = None,
         rating_timeout_sec: Optional[int] = None,
         sla_warn_hours: Optional[int] = None,
-        sla_autoclose_hours: Optional[int] = None
+        sla_autoclose_hours: Optional[int] = None,
+        capture_messages: Optional[bool] = None,
+        channel_pool_size: Optional[app_commands.Range[int, 0, 25]] = None,
+        ticket_mode: Optional[app_commands.Choice[str]] = None,
+        thread_parent_channel_id: Optional[discord.TextChannel] = None
     ):
+        updates = {}
         changes = []
         if panel_channel_id is not None:
-            CONFIG["panel_channel_id"] = panel_channel_id.id if hasattr(panel_channel_id, "id") else panel_channel_id
-            changes.append(f"panel_channel_id definido para <#{CONFIG['panel_channel_id']}>")
+            updates["panel_channel_id"] = panel_channel_id.id
+            changes.append(f"panel_channel_id definido para <#{panel_channel_id.id}>")
         if logs_channel_id is not None:
-            CONFIG["logs_channel_id"] = logs_channel_id.id if hasattr(logs_channel_id, "id") else logs_channel_id
-            changes.append(f"logs_channel_id definido para <#{CONFIG['logs_channel_id']}>")
+            updates["logs_channel_id"] = logs_channel_id.id
+            changes.append(f"logs_channel_id definido para <#{logs_channel_id.id}>")
         if ticket_category_id is not None:
-            CONFIG["ticket_category_id"] = ticket_category_id.id if hasattr(ticket_category_id, "id") else ticket_category_id
-            changes.append(f"ticket_category_id definido para <#{CONFIG['ticket_category_id']}>")
+            updates["ticket_category_id"] = ticket_category_id.id
+            changes.append(f"ticket_category_id definido para <#{ticket_category_id.id}>")
         if staff_role_id is not None:
-            CONFIG["staff_role_id"] = staff_role_id.id if hasattr(staff_role_id, "id") else staff_role_id
-            changes.append(f"staff_role_id definido para <@&{CONFIG['staff_role_id']}>")
+            updates["staff_role_id"] = staff_role_id.id
+            changes.append(f"staff_role_id definido para <@&{staff_role_id.id}>")
         if admin_role_id is not None:
-            CONFIG["admin_role_id"] = admin_role_id.id if hasattr(admin_role_id, "id") else admin_role_id
-            changes.append(f"admin_role_id definido para <@&{CONFIG['admin_role_id']}>")
+            updates["admin_role_id"] = admin_role_id.id
+            changes.append(f"admin_role_id definido para <@&{admin_role_id.id}>")
         if one_ticket_per_user is not None:
-            CONFIG["one_ticket_per_user"] = one_ticket_per_user
+            updates["one_ticket_per_user"] = one_ticket_per_user
             changes.append(f"one_ticket_per_user definido para {one_ticket_per_user}")
         if enable_anonymous_reports is not None:
-            CONFIG["enable_anonymous_reports"] = enable_anonymous_reports
+            updates["enable_anonymous_reports"] = enable_anonymous_reports
             changes.append(f"enable_anonymous_reports definido para {enable_anonymous_reports}")
         if rating_timeout_sec is not None:
-            CONFIG["rating_timeout_sec"] = rating_timeout_sec
+            updates["rating_timeout_sec"] = rating_timeout_sec
             changes.append(f"rating_timeout_sec definido para {rating_timeout_sec} segundos")
         if sla_warn_hours is not None:
-            CONFIG["sla_warn_hours"] = sla_warn_hours
+            updates["sla_warn_hours"] = sla_warn_hours
             changes.append(f"sla_warn_hours definido para {sla_warn_hours} horas")
         if sla_autoclose_hours is not None:
-            CONFIG["sla_autoclose_hours"] = sla_autoclose_hours
+            updates["sla_autoclose_hours"] = sla_autoclose_hours
             changes.append(f"sla_autoclose_hours definido para {sla_autoclose_hours} horas")
-
-        try:
-            # Load existing config to avoid overwriting unrelated values
-            if os.path.isfile(CONFIG_FILE):
-                with open(CONFIG_FILE, 'r', encoding='utf-8') as f:
-                    existing = json.load(f)
-            else:
-                existing = {}
-
-            existing[CONFIG_KEY] = CONFIG
-            with open(CONFIG_FILE, 'w', encoding='utf-8') as f:
-                json.dump(existing, f, indent=4)
-
-        except Exception as e:
-            await interaction.response.send_message(f"Erro ao salvar configurações: {e}", ephemeral=True)
+        if capture_messages is not None:
+            updates["capture_messages"] = capture_messages
+            changes.append(f"capture_messages definido para {capture_messages}")
+        if channel_pool_size is not None:
+            updates["channel_pool_size"] = channel_pool_size
+            changes.append(f"channel_pool_size definido para {channel_pool_size}")
+        if ticket_mode is not None:
+            updates["ticket_mode"] = ticket_mode.value
+            changes.append(f"ticket_mode definido para {ticket_mode.value}")
+        if thread_parent_channel_id is not None:
+            updates["thread_parent_channel_id"] = thread_parent_channel_id.id
+            changes.append(f"thread_parent_channel_id definido para <#{thread_parent_channel_id.id}>")
+
+        if not updates:
+            await interaction.response.send_message("Nenhuma opção informada.", ephemeral=True)
             return
 
+        # vale na hora; a gravação em disco acontece em segundo plano
         try:
-            with open(CONFIG_FILE, 'w', encoding='utf-8') as f:
-                json.dump({"CONFIG": CONFIG}, f, indent=4)
-            CONFIG.clear()
-            CONFIG.update(load_config())
-        except Exception as e:
-            await interaction.response.send_message(f"Erro ao salvar configurações: {e}", ephemeral=True)
+            CONFIG.update(**updates)
+        except ConfigError as e:
+            await interaction.response.send_message(f"Configuração recusada: {e}", ephemeral=True)
             return
 
-        embed = discord.Embed(title="Configurações de Tickets Atualizadas; Digite **/restart** para aplicar!", description="\n".join(changes), colour=discord.Colour.blue(), timestamp=discord.utils.utcnow())
+        embed = discord.Embed(title="Configurações de Tickets Atualizadas", description="\n".join(changes), colour=discord.Colour.blue(), timestamp=discord.utils.utcnow())
         await interaction.response.send_message(embed=embed, ephemeral=True)
 
 async def setup(bot: commands.Bot):
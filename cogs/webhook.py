@@ -1,10 +1,6 @@
 import discord
 from discord.ext import commands
 from discord import app_commands
-import aiohttp
-
-WEBHOOK_NAME = "Frizz"
-WEBHOOK_AVATAR = "https://cdn.discordapp.com/attachments/781008768925433876/1410721715264426148/frizz-logo-test.png?ex=68b406ba&is=68b2b53a&hm=540404107d693ca15ee49646794f531e6dd6e7e725fc56fd01408b8fb80912ce&"
 
 class WebhookCog(commands.Cog):
     def __init__(self, bot: commands.Bot):
@@ -15,24 +11,20 @@ class WebhookCog(commands.Cog):
     @app_commands.describe(canal="O canal onde o webhook sera criado")
     async def create_webhook(self, interaction: discord.Interaction, canal: discord.TextChannel):
 
-        # checa se existe webhook do bot c/ msm nome
-        webhooks = await canal.webhooks()
-        existing = discord.utils.get(webhooks, name=WEBHOOK_NAME, user=interaction.client.user)
+        # checa se existe webhook do bot c/ msm nome (registro compartilhado, sem REST depois da 1a vez)
+        existing = await self.bot.webhooks.get(canal, create=False)
 
         if existing:
             await interaction.response.send_message("webhook ja existe nesse canal", ephemeral=True)
             return
         else:
-            # baixar avatar
             await interaction.response.defer(ephemeral=True)
-            async with aiohttp.ClientSession() as session:
-                async with session.get(WEBHOOK_AVATAR) as resp:
-                    if resp.status != 200:
-                        await interaction.followup.send("Erro ao carregar o avatar", ephemeral=True)
-                    avatar_bytes = await resp.read()
-
-            # cria webhook
-            webhook = await canal.create_webhook(name=WEBHOOK_NAME, avatar=avatar_bytes)
+            # cria webhook (avatar vem do cache local de assets)
+            try:
+                webhook = await self.bot.webhooks.get(canal)
+            except discord.HTTPException as e:
+                await interaction.followup.send(f"Erro ao criar webhook: {e}", ephemeral=True)
+                return
             await interaction.followup.send(f"webhook criado: {webhook.url}", ephemeral=True)
 
     # /send_webhook command
@@ -41,32 +33,21 @@ class WebhookCog(commands.Cog):
     async def send_webhook(self, interaction: discord.Interaction, canal: discord.TextChannel, message: str):
         await interaction.response.defer(ephemeral=True)
 
-        # acha o webhook
-        webhooks = await canal.webhooks()
-        webhook = discord.utils.get(webhooks, name=WEBHOOK_NAME, user=interaction.client.user)
-
-        if not webhook:
-            
-            # baixar avatar
-            await interaction.response.defer(ephemeral=True)
-            async with aiohttp.ClientSession() as session:
-                async with session.get(WEBHOOK_AVATAR) as resp:
-                    if resp.status != 200:
-                        await interaction.response.send_message("Erro ao carregar o avatar", ephemeral=True)
-                avatar_bytes = await resp.read()
-            try:
-                # cria webhook
-                webhook = await canal.create_webhook(name=WEBHOOK_NAME, avatar=avatar_bytes)
-            except Exception as e:
-                await interaction.followup.send(f"Erro ao criar webhook: {e}\n Tente criar manualmente (/create_webhook)", ephemeral=True)
-                return
+        # acha (ou cria) o webhook
+        try:
+            webhook = await self.bot.webhooks.get(canal)
+        except discord.HTTPException as e:
+            await interaction.followup.send(f"Erro ao criar webhook: {e}\n Tente criar manualmente (/create_webhook)", ephemeral=True)
+            return
 
         # Send the message
         try:
             await webhook.send(content=message)
             await interaction.followup.send("mensagem enviada via webhook.", ephemeral=True)
-        except discord.NotFound:
-            await interaction.followup.send(f"Erro ao criar webhook: {e}\n Tente criar manualmente (/create_webhook)", ephemeral=True)
+        except discord.NotFound as e:
+            # webhook apagado por fora: esquece e tenta de novo no próximo uso
+            self.bot.webhooks.invalidate(canal.id)
+            await interaction.followup.send(f"Webhook não encontrado: {e}\n Tente novamente ou crie manualmente (/create_webhook)", ephemeral=True)
         except discord.HTTPException as e:
             await interaction.followup.send(f"Erro ao enviar mensagem via webhook: {e}", ephemeral=True)
             return
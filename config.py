@@ -3,4 +3,22 @@ import os
 TOKEN = os.getenv("TOKEN")
 PREFIX = os.getenv("PREFIX", "-")
 GUILD_ID = int(os.getenv("GUILD_ID", "0"))
-DEBUG_TOKEN = os.getenv("DEBUG_TOKEN")
\ No newline at end of file
+DEBUG_TOKEN = os.getenv("DEBUG_TOKEN")
+
+# dados persistentes do bot (bancos SQLite, caches); preservado pelo updater
+DATA_DIR = os.getenv("DATA_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "data"))
+
+# sorteios: janela mínima (segundos) entre PATCHes do contador de participantes
+GAW_COUNTER_FLUSH_SEC = float(os.getenv("GAW_COUNTER_FLUSH_SEC", "2.0"))
+# sorteios: token bucket por (usuário, gid) no botão de participar
+GAW_CLICK_BURST = int(os.getenv("GAW_CLICK_BURST", "3"))
+GAW_CLICK_REFILL_SEC = float(os.getenv("GAW_CLICK_REFILL_SEC", "2.0"))  # 1 ficha a cada N segundos
+# tickets: quantos encerramentos (transcript/log/exclusão) rodam ao mesmo tempo
+TICKET_CLOSE_WORKERS = int(os.getenv("TICKET_CLOSE_WORKERS", "2"))
+# tickets: criações de canal simultâneas por guild (o resto espera na fila)
+TICKET_CREATE_CONCURRENCY = int(os.getenv("TICKET_CREATE_CONCURRENCY", "2"))
+# tickets: dias que a cópia .html.gz de cada transcript fica em DATA_DIR/transcripts
+# (0 = sem cópia local; o transcript fica só no canal de logs)
+TRANSCRIPT_ARCHIVE_DAYS = float(os.getenv("TRANSCRIPT_ARCHIVE_DAYS", "0"))
+# card builder: intervalo mínimo (segundos) entre re-renderizações do preview automático
+CARD_PREVIEW_DEBOUNCE_SEC = float(os.getenv("CARD_PREVIEW_DEBOUNCE_SEC", "3.0"))
@@ -11,6 +11,10 @@ if PARENT_DIR not in sys.path:
     sys.path.insert(0, PARENT_DIR)
 
 import config
+from rest import RestClient
+from scheduler import Scheduler
+from router import InteractionRouter
+from webhook_registry import WebhookRegistry
 
 # Atualizar o bot dando pull
 self_update()
@@ -24,8 +28,21 @@ class MyBot(commands.Bot):
         intents = discord.Intents.default()
         intents.message_content = True
         super().__init__(command_prefix=commands.when_mentioned_or(config.PREFIX), intents=intents)
+        # cliente HTTP compartilhado para chamadas cruas de webhook (pool + rate-limit por rota)
+        self.rest = RestClient()
+        # agendador central de prazos (fim de sorteios etc.), um heap + uma task
+        self.scheduler = Scheduler()
+        # roteador de interações por prefixo de custom_id; cogs registram handlers no cog_load
+        self.router = InteractionRouter()
+        self.add_listener(self.router.dispatch, "on_interaction")
+        # webhook "Frizz" por canal, resolvido uma vez e invalidado por on_webhooks_update/404
+        self.webhooks = WebhookRegistry(self)
+        self.add_listener(self.webhooks.on_webhooks_update, "on_webhooks_update")
 
     async def setup_hook(self):
+        await self.rest.start()
+        self.scheduler.start()
+
         # load cogs
         for filename in os.listdir(cogs_path):
             if filename.endswith('.py') and not filename.startswith('_'):
@@ -36,6 +53,11 @@ class MyBot(commands.Bot):
         self.tree.copy_global_to(guild=guild)
         await self.tree.sync(guild=guild)
 
+    async def close(self):
+        await super().close()
+        await self.scheduler.stop()
+        await self.rest.close()
+
 bot = MyBot()
 
 @bot.event
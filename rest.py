@@ -0,0 +1,254 @@
+import time
+import asyncio
+import json as _json
+from dataclasses import dataclass
+from typing import Mapping
+from urllib.parse import urlsplit
+
+import aiohttp
+
+# Cliente REST compartilhado pelo bot para chamadas "cruas" (webhooks com Components V2,
+# download de assets) que não passam pelo HTTPClient do discord.py.
+# - uma única aiohttp.ClientSession com pool de conexões (keep-alive, TLS reaproveitado)
+# - buckets por rota a partir dos headers X-RateLimit-* do Discord
+# - fila por bucket respeitando retry-after / reset, e lock global para 429 global
+# - contadores por rota (requests, 429, retries, tempo esperado)
+
+MAX_RETRIES = 3
+# só estes são refeitos depois de timeout/desconexão: o request pode já ter chegado ao
+# Discord, e repetir um POST duplicaria a mensagem. POST só é refeito se a conexão
+# falhou antes de enviar (ClientConnectorError).
+IDEMPOTENT = frozenset({"GET", "HEAD", "PUT", "PATCH", "DELETE", "OPTIONS"})
+
+@dataclass
+class RestResponse:
+    status: int
+    headers: Mapping[str, str]
+    body: bytes
+
+    @property
+    def ok(self) -> bool:
+        return 200 <= self.status < 300
+
+    def text(self) -> str:
+        return self.body.decode("utf-8", errors="replace")
+
+    def json(self):
+        if not self.body:
+            return None
+        return _json.loads(self.body)
+
+@dataclass
+class RouteStats:
+    requests: int = 0
+    rate_limited: int = 0
+    retries: int = 0
+    errors: int = 0
+    waited_sec: float = 0.0
+    last_status: int = 0
+
+class _Bucket:
+    __slots__ = ("lock", "remaining", "reset_at", "probe")
+
+    def __init__(self):
+        self.lock = asyncio.Lock()
+        self.remaining: int | None = None  # None = ainda não sabemos o limite
+        self.reset_at: float = 0.0
+        # depois do reset sai um único request; os demais esperam os headers dele
+        self.probe: asyncio.Future | None = None
+
+def route_key(method: str, url: str) -> tuple[str, str]:
+    """
+    Normaliza uma URL em (rota, parametro_maior).
+    Ex.: PATCH /api/v10/webhooks/123/<token>/messages/456 -> ("PATCH /webhooks/{webhook_id}/{token}/messages/{id}", "123")
+    """
+    parts = urlsplit(url)
+    if not parts.path.startswith("/api/"):
+        # assets (CDN etc.): um bucket por host
+        return f"{method} {parts.netloc}", parts.netloc
+
+    segs = [s for s in parts.path.split("/") if s]
+    # remove /api e /vNN
+    while segs and (segs[0] == "api" or (segs[0].startswith("v") and segs[0][1:].isdigit())):
+        segs.pop(0)
+
+    major = ""
+    out: list[str] = []
+    for i, s in enumerate(segs):
+        prev = segs[i - 1] if i else ""
+        if prev in ("webhooks", "channels", "guilds") and i == 1:
+            major = s
+            out.append("{" + prev[:-1] + "_id}")
+        elif i == 2 and segs[0] == "webhooks":
+            out.append("{token}")
+        elif s.isdigit():
+            out.append("{id}")
+        else:
+            out.append(s)
+    return f"{method} /" + "/".join(out), major
+
+class RestClient:
+    """Cliente HTTP único do bot. Criado em MyBot.__init__, aberto no setup_hook e fechado no close."""
+
+    def __init__(self, *, pool_size: int = 50, timeout: float = 30.0):
+        self._pool_size = pool_size
+        self._timeout = aiohttp.ClientTimeout(total=timeout)
+        self._session: aiohttp.ClientSession | None = None
+        self._buckets: dict[str, _Bucket] = {}
+        self._route_bucket: dict[str, str] = {}   # rota -> hash do X-RateLimit-Bucket
+        self._global_until: float = 0.0
+        self.stats: dict[str, RouteStats] = {}
+
+    async def start(self):
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(limit=self._pool_size, ttl_dns_cache=300, keepalive_timeout=60)
+            self._session = aiohttp.ClientSession(connector=connector, timeout=self._timeout)
+
+    async def close(self):
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            raise RuntimeError("RestClient não iniciado; chame start() no setup_hook.")
+        return self._session
+
+    def _bucket_for(self, route: str, major: str) -> _Bucket:
+        key = f"{self._route_bucket.get(route, route)}:{major}"
+        b = self._buckets.get(key)
+        if b is None:
+            b = self._buckets[key] = _Bucket()
+        return b
+
+    async def _wait_for_slot(self, bucket: _Bucket, st: RouteStats):
+        # serializa apenas a decisão de quem consome o próximo slot do bucket;
+        # o request em si roda fora do lock
+        async with bucket.lock:
+            while True:
+                now = time.monotonic()
+                delay = max(self._global_until - now, 0.0)
+                if bucket.remaining == 0 and bucket.reset_at > now:
+                    delay = max(delay, bucket.reset_at - now)
+                if delay > 0:
+                    st.waited_sec += delay
+                    await asyncio.sleep(delay)
+                    continue
+                if bucket.remaining != 0:
+                    if bucket.remaining:
+                        bucket.remaining -= 1
+                    return
+                # esgotado e já resetado: remaining fica em 0 até headers novos chegarem
+                if bucket.probe is not None:
+                    t0 = time.monotonic()
+                    await asyncio.shield(bucket.probe)
+                    st.waited_sec += time.monotonic() - t0
+                    continue
+                bucket.probe = asyncio.get_running_loop().create_future()
+                return
+
+    @staticmethod
+    def _release_probe(bucket: _Bucket):
+        """Fim do request de sondagem (com ou sem headers): libera quem espera no bucket."""
+        if bucket.probe is not None:
+            if not bucket.probe.done():
+                bucket.probe.set_result(None)
+            bucket.probe = None
+
+    def _update_bucket(self, route: str, major: str, bucket: _Bucket, headers) -> _Bucket:
+        h = headers.get("X-RateLimit-Bucket")
+        if h and self._route_bucket.get(route) != h:
+            self._route_bucket[route] = h
+            key = f"{h}:{major}"
+            bucket = self._buckets.setdefault(key, bucket)
+        rem = headers.get("X-RateLimit-Remaining")
+        reset_after = headers.get("X-RateLimit-Reset-After")
+        if reset_after is not None:
+            try:
+                bucket.reset_at = time.monotonic() + float(reset_after)
+            except ValueError:
+                pass
+        if rem is not None:
+            try:
+                bucket.remaining = int(rem)
+            except ValueError:
+                pass
+        return bucket
+
+    async def request(self, method: str, url: str, *, json=None, data=None, headers: dict | None = None, timeout: float | None = None) -> RestResponse:
+        """
+        Executa um request respeitando os buckets de rate-limit. Refaz automaticamente em 429;
+        timeout/desconexão só é refeito para métodos idempotentes (POST levanta a exceção).
+        """
+        method = method.upper()
+        route, major = route_key(method, url)
+        st = self.stats.get(route)
+        if st is None:
+            st = self.stats[route] = RouteStats()
+        extra = {"timeout": aiohttp.ClientTimeout(total=timeout)} if timeout else {}
+
+        attempt = 0
+        while True:
+            bucket = slot = self._bucket_for(route, major)
+            await self._wait_for_slot(slot, st)
+            st.requests += 1
+            try:
+                async with self.session.request(method, url, json=json, data=data, headers=headers, **extra) as resp:
+                    body = await resp.read()
+                    status = resp.status
+                    resp_headers = resp.headers.copy()  # CIMultiDict: headers case-insensitive
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                self._release_probe(slot)
+                st.errors += 1
+                retryable = method in IDEMPOTENT or isinstance(e, aiohttp.ClientConnectorError)
+                if not retryable or attempt >= MAX_RETRIES:
+                    raise
+                attempt += 1
+                st.retries += 1
+                await asyncio.sleep(0.5 * attempt)
+                continue
+            except BaseException:
+                self._release_probe(slot)
+                raise
+
+            st.last_status = status
+            bucket = self._update_bucket(route, major, bucket, resp_headers)
+            self._release_probe(slot)
+
+            if status != 429:
+                return RestResponse(status, resp_headers, body)
+
+            st.rate_limited += 1
+            retry_after = 1.0
+            is_global = resp_headers.get("X-RateLimit-Global") == "true"
+            try:
+                payload = _json.loads(body) if body else {}
+                retry_after = float(payload.get("retry_after", retry_after))
+                is_global = is_global or bool(payload.get("global"))
+            except (ValueError, AttributeError):
+                try:
+                    retry_after = float(resp_headers.get("Retry-After", retry_after))
+                except ValueError:
+                    pass  # header fora do padrão: fica o padrão de 1s
+
+            until = time.monotonic() + retry_after
+            if is_global:
+                self._global_until = max(self._global_until, until)
+            else:
+                bucket.remaining = 0
+                bucket.reset_at = max(bucket.reset_at, until)
+
+            if attempt >= MAX_RETRIES:
+                return RestResponse(status, resp_headers, body)
+            attempt += 1
+            st.retries += 1
+
+    async def get_bytes(self, url: str) -> bytes | None:
+        """GET simples para assets (avatar etc.). Retorna None se o status não for 200."""
+        r = await self.request("GET", url)
+        return r.body if r.status == 200 else None
+
+    def snapshot(self) -> list[tuple[str, RouteStats]]:
+        """Rotas ordenadas por volume de requests."""
+        return sorted(self.stats.items(), key=lambda kv: kv[1].requests, reverse=True)
@@ -0,0 +1,117 @@
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable
+
+import discord
+
+# Roteador central de interações por prefixo de custom_id (ex.: 'gaw:join:', 'ticket:claim',
+# 'create_ticket_'). Um único listener on_interaction no bot; os cogs registram handlers.
+# Despacho: uma consulta ao dict por comprimento distinto de prefixo (poucos), ou seja O(1).
+# Interações sem rota não chegam a nenhum cog.
+
+Handler = Callable[[discord.Interaction], Awaitable[None]]
+
+@dataclass
+class HandlerStats:
+    calls: int = 0
+    errors: int = 0
+    unacked: int = 0  # handler terminou sem responder a interação
+    ack_ms: deque = field(default_factory=lambda: deque(maxlen=1000))
+    total_ms: deque = field(default_factory=lambda: deque(maxlen=1000))
+
+    @staticmethod
+    def _pct(xs: deque, q: float) -> float:
+        if not xs:
+            return 0.0
+        s = sorted(xs)
+        return s[min(len(s) - 1, int(len(s) * q))]
+
+    def ack_p50(self) -> float:
+        return self._pct(self.ack_ms, 0.50)
+
+    def ack_p99(self) -> float:
+        return self._pct(self.ack_ms, 0.99)
+
+class _AckWatch:
+    """
+    Executa o coroutine do handler passo a passo e, a cada suspensão, verifica se a
+    interação já foi respondida. Marca assim o momento da primeira resposta sem polling
+    e sem mexer no InteractionResponse.
+    """
+    __slots__ = ("_coro", "_interaction", "acked_at")
+
+    def __init__(self, coro, interaction: discord.Interaction):
+        self._coro = coro
+        self._interaction = interaction
+        self.acked_at: float | None = None
+
+    def _check(self):
+        if self.acked_at is None and self._interaction.response.is_done():
+            self.acked_at = time.perf_counter()
+
+    def __await__(self):
+        coro = self._coro
+        send, exc = None, None
+        while True:
+            try:
+                yielded = coro.send(send) if exc is None else coro.throw(exc)
+            except StopIteration as stop:
+                self._check()
+                return stop.value
+            self._check()
+            try:
+                send, exc = (yield yielded), None
+            except BaseException as e:  # cancelamento etc. é repassado ao handler
+                send, exc = None, e
+
+class InteractionRouter:
+    def __init__(self):
+        self._routes: dict[str, Handler] = {}
+        self._lengths: list[int] = []
+        self.stats: dict[str, HandlerStats] = {}
+
+    def register(self, prefix: str, handler: Handler):
+        self._routes[prefix] = handler
+        self.stats.setdefault(prefix, HandlerStats())
+        self._lengths = sorted({len(p) for p in self._routes}, reverse=True)
+
+    def unregister(self, prefix: str):
+        if self._routes.pop(prefix, None) is not None:
+            self._lengths = sorted({len(p) for p in self._routes}, reverse=True)
+
+    def match(self, custom_id: str) -> tuple[str, Handler] | None:
+        routes = self._routes
+        for n in self._lengths:  # prefixo mais longo vence
+            h = routes.get(custom_id[:n])
+            if h is not None:
+                return custom_id[:n], h
+        return None
+
+    async def dispatch(self, interaction: discord.Interaction):
+        """Listener on_interaction do bot."""
+        if interaction.type not in (discord.InteractionType.component, discord.InteractionType.modal_submit):
+            return
+        cid = (interaction.data or {}).get("custom_id")
+        if not isinstance(cid, str):
+            return
+        m = self.match(cid)
+        if m is None:
+            return
+        prefix, handler = m
+        st = self.stats[prefix]
+        st.calls += 1
+
+        t0 = time.perf_counter()
+        watch = _AckWatch(handler(interaction), interaction)
+        try:
+            await watch
+        except Exception as e:
+            st.errors += 1
+            print(f"[router] handler de '{prefix}' falhou: {e!r}")
+        finally:
+            st.total_ms.append((time.perf_counter() - t0) * 1000)
+            if watch.acked_at is not None:
+                st.ack_ms.append((watch.acked_at - t0) * 1000)
+            else:
+                st.unacked += 1
@@ -0,0 +1,152 @@
+import time
+import heapq
+import asyncio
+import itertools
+from collections import deque
+from datetime import datetime
+from typing import Awaitable, Callable
+
+# Agendador central do bot: um heap de prazos + uma única task "driver".
+# schedule/reschedule/cancel são O(log n) (remoção preguiçosa: entradas antigas
+# ficam no heap e são descartadas quando chegam ao topo).
+
+Callback = Callable[[], Awaitable[None]]
+
+def _to_ts(when: datetime | float) -> float:
+    return when.timestamp() if isinstance(when, datetime) else float(when)
+
+class _Entry:
+    __slots__ = ("when", "seq", "callback")
+
+    def __init__(self, when: float, seq: int, callback: Callback):
+        self.when = when
+        self.seq = seq
+        self.callback = callback
+
+class Scheduler:
+    """Prazos por chave (ex.: 'gaw:end:<gid>'). Os callbacks rodam como tasks próprias."""
+
+    def __init__(self, *, lateness_window: int = 1000):
+        self._heap: list[tuple[float, int, str]] = []
+        self._entries: dict[str, _Entry] = {}
+        self._seq = itertools.count()
+        self._wake: asyncio.Event | None = None
+        self._driver: asyncio.Task | None = None
+        self._running: set[asyncio.Task] = set()
+        # métricas
+        self.fired = 0
+        self.failed = 0
+        self.max_lateness = 0.0
+        self._lateness: deque[float] = deque(maxlen=lateness_window)
+
+    # ---------------------------- ciclo de vida ----------------------------
+
+    def start(self):
+        if self._driver is None or self._driver.done():
+            self._wake = asyncio.Event()
+            self._driver = asyncio.create_task(self._drive())
+
+    async def stop(self):
+        if self._driver:
+            self._driver.cancel()
+            try:
+                await self._driver
+            except asyncio.CancelledError:
+                pass
+            self._driver = None
+
+    # ------------------------------- API ------------------------------------
+
+    def schedule(self, key: str, when: datetime | float, callback: Callback):
+        """Agenda (ou substitui) o prazo da chave."""
+        ts = _to_ts(when)
+        seq = next(self._seq)
+        self._entries[key] = _Entry(ts, seq, callback)
+        heapq.heappush(self._heap, (ts, seq, key))
+        self._maybe_compact()
+        if self._wake is not None:
+            self._wake.set()
+
+    def reschedule(self, key: str, when: datetime | float) -> bool:
+        e = self._entries.get(key)
+        if e is None:
+            return False
+        self.schedule(key, when, e.callback)
+        return True
+
+    def cancel(self, key: str) -> bool:
+        return self._entries.pop(key, None) is not None
+
+    def cancel_prefix(self, prefix: str) -> int:
+        keys = [k for k in self._entries if k.startswith(prefix)]
+        for k in keys:
+            del self._entries[k]
+        return len(keys)
+
+    def when(self, key: str) -> float | None:
+        e = self._entries.get(key)
+        return e.when if e else None
+
+    def pending(self, prefix: str = "") -> list[tuple[str, float]]:
+        """Prazos pendentes com o prefixo, em ordem de disparo."""
+        return sorted(((k, e.when) for k, e in self._entries.items() if k.startswith(prefix)), key=lambda kv: kv[1])
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def lateness_percentiles(self) -> tuple[float, float]:
+        """(p50, p99) do atraso de disparo, em segundos, na janela recente."""
+        if not self._lateness:
+            return 0.0, 0.0
+        xs = sorted(self._lateness)
+        return xs[len(xs) // 2], xs[min(len(xs) - 1, int(len(xs) * 0.99))]
+
+    # ------------------------------ interno ---------------------------------
+
+    def _is_live(self, seq: int, key: str) -> bool:
+        e = self._entries.get(key)
+        return e is not None and e.seq == seq
+
+    def _maybe_compact(self):
+        # evita que entradas canceladas/reagendadas façam o heap crescer sem limite
+        if len(self._heap) > 2 * len(self._entries) + 64:
+            self._heap = [(e.when, e.seq, k) for k, e in self._entries.items()]
+            heapq.heapify(self._heap)
+
+    async def _drive(self):
+        while True:
+            heap = self._heap  # pode ser trocado por _maybe_compact
+            while heap and not self._is_live(heap[0][1], heap[0][2]):
+                heapq.heappop(heap)
+
+            if not heap:
+                await self._wake.wait()
+                self._wake.clear()
+                continue
+
+            delay = heap[0][0] - time.time()
+            if delay > 0:
+                try:
+                    await asyncio.wait_for(self._wake.wait(), timeout=delay)
+                except asyncio.TimeoutError:
+                    pass
+                self._wake.clear()
+                continue
+
+            ts, seq, key = heapq.heappop(heap)
+            entry = self._entries.pop(key)
+            late = max(0.0, time.time() - ts)
+            self._lateness.append(late)
+            self.max_lateness = max(self.max_lateness, late)
+            self.fired += 1
+
+            t = asyncio.create_task(self._run(key, entry.callback))
+            self._running.add(t)
+            t.add_done_callback(self._running.discard)
+
+    async def _run(self, key: str, callback: Callback):
+        try:
+            await callback()
+        except Exception as e:
+            self.failed += 1
+            print(f"[scheduler] callback de '{key}' falhou: {e!r}")
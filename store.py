@@ -0,0 +1,143 @@
+import os
+import asyncio
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+
+# Base para os stores SQLite do bot (modo WAL, uma thread dedicada por banco).
+# Escritas são enfileiradas em memória com write() e gravadas em lote por um flusher,
+# então o caminho de uma interação nunca toca o disco de forma síncrona.
+# Lote que falha por banco ocupado/travado volta para a fila (até MAX_FLUSH_RETRIES);
+# qualquer outro erro refaz o lote linha a linha e descarta só as escritas inválidas.
+
+MAX_FLUSH_RETRIES = 5
+
+def _transient(e: Exception) -> bool:
+    msg = str(e).lower()
+    return isinstance(e, sqlite3.OperationalError) and ("locked" in msg or "busy" in msg)
+
+class SQLiteStore:
+    SCHEMA = ""
+
+    def __init__(self, path: str, *, flush_interval: float = 0.5, max_batch: int = 500):
+        self.path = path
+        self.flush_interval = flush_interval
+        self.max_batch = max_batch
+        self._conn: sqlite3.Connection | None = None
+        self._executor: ThreadPoolExecutor | None = None
+        self._pending: list[tuple[str, tuple]] = []
+        self._wake: asyncio.Event | None = None
+        self._flusher: asyncio.Task | None = None
+        self._flush_lock: asyncio.Lock | None = None
+        self._retries = 0  # falhas transitórias seguidas do lote da frente
+        self.dropped = 0  # escritas descartadas por erro permanente
+
+    # ---------------------------- ciclo de vida ----------------------------
+
+    async def open(self):
+        if self._conn is not None:
+            return
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"sqlite-{os.path.basename(self.path)}")
+        self._wake = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        await self._run(self._connect)
+        self._flusher = asyncio.create_task(self._flush_loop())
+
+    def _connect(self):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        conn = sqlite3.connect(self.path, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        if self.SCHEMA:
+            conn.executescript(self.SCHEMA)
+        conn.commit()
+        self._conn = conn
+
+    async def close(self):
+        if self._conn is None:
+            return
+        if self._flusher:
+            self._flusher.cancel()
+            self._flusher = None
+        await self.flush()
+        await self._run(self._conn.close)
+        self._conn = None
+        self._executor.shutdown(wait=False)
+        self._executor = None
+
+    # ------------------------------- escrita --------------------------------
+
+    def write(self, sql: str, params: tuple = ()):
+        """Enfileira uma escrita; o commit acontece no próximo lote."""
+        self._pending.append((sql, params))
+        if len(self._pending) >= self.max_batch and self._wake is not None:
+            self._wake.set()
+
+    async def flush(self):
+        """Grava imediatamente tudo que está na fila."""
+        if self._conn is None or self._flush_lock is None:
+            return
+        async with self._flush_lock:
+            if not self._pending:
+                return
+            batch, self._pending = self._pending, []
+            try:
+                await self._run(self._commit_batch, batch)
+                self._retries = 0
+                return
+            except Exception as e:
+                if _transient(e) and self._retries < MAX_FLUSH_RETRIES:
+                    # a transação foi desfeita: o lote volta à frente da fila (mantém a ordem)
+                    self._retries += 1
+                    self._pending[:0] = batch
+                    print(f"[store] {self.path} ocupado, lote de {len(batch)} escritas volta à fila "
+                          f"(tentativa {self._retries}/{MAX_FLUSH_RETRIES}): {e!r}")
+                    return
+                print(f"[store] falha ao gravar lote em {self.path}, refazendo linha a linha: {e!r}")
+            self._retries = 0
+            try:
+                bad = await self._run(self._commit_rows, batch)
+            except Exception as e:
+                self.dropped += len(batch)
+                print(f"[store] lote de {len(batch)} escritas descartado em {self.path}: {e!r}")
+                return
+            self.dropped += len(bad)
+            for sql, params, err in bad:
+                print(f"[store] escrita descartada em {self.path}: {err!r} | {sql} {params!r}")
+
+    def _commit_batch(self, batch: list[tuple[str, tuple]]):
+        with self._conn:
+            for sql, params in batch:
+                self._conn.execute(sql, params)
+
+    def _commit_rows(self, batch: list[tuple[str, tuple]]) -> list[tuple[str, tuple, Exception]]:
+        """Uma transação, mas cada escrita isolada: a que falha é pulada e devolvida."""
+        bad = []
+        with self._conn:
+            for sql, params in batch:
+                try:
+                    self._conn.execute(sql, params)
+                except sqlite3.Error as e:
+                    if _transient(e):
+                        raise
+                    bad.append((sql, params, e))
+        return bad
+
+    async def _flush_loop(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+            await self.flush()
+
+    # ------------------------------- leitura --------------------------------
+
+    async def query(self, sql: str, params: tuple = ()) -> list[tuple]:
+        """Executa um SELECT fora do loop (grava a fila antes, para ler as próprias escritas)."""
+        await self.flush()
+        return await self._run(lambda: self._conn.execute(sql, params).fetchall())
+
+    async def _run(self, fn, *args):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, fn, *args)
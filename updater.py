@@ -8,7 +8,7 @@ def self_update():
     token = os.getenv('ACCESS_TOKEN')
 
     # >>> arquivos/pastas que NÃO devem ser apagados por update
-    PRESERVE = ['.env', 'ticket_config.json']  # adicione outros se precisar, ex: 'data', 'config.local.json'
+    PRESERVE = ['.env', 'ticket_config.json', 'data']  # adicione outros se precisar, ex: 'data', 'config.local.json'
 
     if os.getenv('DISABLE_SELF_UPDATE') == '1':
         print('[updater] desativado por DISABLE_SELF_UPDATE=1')
@@ -0,0 +1,128 @@
+import os
+import json
+import asyncio
+import hashlib
+
+import discord
+
+import config
+
+# Registro dos webhooks "Frizz" do bot, compartilhado pelos cogs (builder, sorteios, /webhook).
+# channel.webhooks() é caro e tem rate-limit apertado: cada canal é resolvido uma vez e fica
+# em memória (lookup O(1)) até um on_webhooks_update do canal ou um 404 avisado por quem usa.
+# O avatar é baixado uma vez e guardado em disco com nome pelo hash do conteúdo.
+
+WEBHOOK_NAME = "Frizz"
+WEBHOOK_AVATAR = "https://cdn.discordapp.com/attachments/781008768925433876/1410721715264426148/frizz-logo-test.png"
+ASSET_DIR = os.path.join(config.DATA_DIR, "assets")
+_ASSET_INDEX = os.path.join(ASSET_DIR, "index.json")
+
+_MISSING = object()  # canal já consultado e sem webhook do bot
+
+class WebhookRegistry:
+    """Criado em MyBot.__init__ (bot.webhooks); o listener on_webhooks_update é registrado lá."""
+
+    def __init__(self, bot: discord.Client, *, name: str = WEBHOOK_NAME, avatar_url: str = WEBHOOK_AVATAR):
+        self.bot = bot
+        self.name = name
+        self.avatar_url = avatar_url
+        self._cache: dict[int, discord.Webhook | object] = {}
+        self._locks: dict[int, asyncio.Lock] = {}
+        self._avatar: bytes | None = None
+        self._avatar_lock = asyncio.Lock()
+        # métricas
+        self.hits = 0
+        self.lookups = 0  # chamadas a channel.webhooks()
+        self.created = 0
+        self.invalidated = 0
+
+    # ---- webhooks ----
+
+    async def get(self, channel: discord.TextChannel, *, create: bool = True) -> discord.Webhook | None:
+        """Webhook do bot no canal; cria se não existir (create=True). Pode levantar HTTPException."""
+        wh = self._cache.get(channel.id)
+        if isinstance(wh, discord.Webhook) or (wh is _MISSING and not create):
+            self.hits += 1
+            return wh if wh is not _MISSING else None
+
+        lock = self._locks.setdefault(channel.id, asyncio.Lock())
+        async with lock:  # chamadas simultâneas no mesmo canal esperam uma única resolução
+            wh = self._cache.get(channel.id)
+            if wh is None:
+                self.lookups += 1
+                me = self.bot.user
+                found = discord.utils.find(lambda w: w.user == me and w.name == self.name, await channel.webhooks())
+                wh = self._cache[channel.id] = found or _MISSING
+            if wh is _MISSING and create:
+                wh = await channel.create_webhook(name=self.name, avatar=await self.avatar())
+                self._cache[channel.id] = wh
+                self.created += 1
+        self._locks.pop(channel.id, None)
+        return wh if wh is not _MISSING else None
+
+    def peek(self, channel_id: int) -> discord.Webhook | None:
+        wh = self._cache.get(channel_id)
+        return wh if isinstance(wh, discord.Webhook) else None
+
+    def invalidate(self, channel_id: int):
+        """Esquece o canal (webhook apagado/404); a próxima chamada consulta a API de novo."""
+        if self._cache.pop(channel_id, None) is not None:
+            self.invalidated += 1
+
+    def invalidate_url(self, url: str):
+        for channel_id, wh in list(self._cache.items()):
+            if isinstance(wh, discord.Webhook) and url.startswith(wh.url):
+                self.invalidate(channel_id)
+
+    async def on_webhooks_update(self, channel: discord.abc.GuildChannel):
+        self.invalidate(channel.id)
+
+    # ---- avatar (cache em disco por hash do conteúdo) ----
+
+    async def avatar(self) -> bytes | None:
+        if self._avatar is not None:
+            return self._avatar
+        async with self._avatar_lock:
+            if self._avatar is None:
+                self._avatar = await asyncio.to_thread(self._load_asset, self.avatar_url)
+            if self._avatar is None:
+                data = await self.bot.rest.get_bytes(self.avatar_url)
+                if data is not None:
+                    await asyncio.to_thread(self._store_asset, self.avatar_url, data)
+                    self._avatar = data
+        return self._avatar
+
+    @staticmethod
+    def _read_index() -> dict:
+        try:
+            with open(_ASSET_INDEX, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    @classmethod
+    def _load_asset(cls, url: str) -> bytes | None:
+        digest = cls._read_index().get(url)
+        if not digest:
+            return None
+        try:
+            with open(os.path.join(ASSET_DIR, digest), "rb") as f:
+                data = f.read()
+        except OSError:
+            return None
+        return data if hashlib.sha256(data).hexdigest() == digest else None
+
+    @classmethod
+    def _store_asset(cls, url: str, data: bytes):
+        os.makedirs(ASSET_DIR, exist_ok=True)
+        digest = hashlib.sha256(data).hexdigest()
+        path = os.path.join(ASSET_DIR, digest)
+        if not os.path.isfile(path):
+            with open(path + ".tmp", "wb") as f:
+                f.write(data)
+            os.replace(path + ".tmp", path)
+        index = cls._read_index()
+        index[url] = digest
+        with open(_ASSET_INDEX + ".tmp", "w", encoding="utf-8") as f:
+            json.dump(index, f)
+        os.replace(_ASSET_INDEX + ".tmp", _ASSET_INDEX)
@@ -0,0 +1,76 @@
+# Codec dos marcadores invisíveis (zero-width) usados nos cards, ex.: 'gaw:count:<gid>'.
+#
+# v1 (legado): "\u2063\u2063" + 8 símbolos por byte (\u200b=0, \u200c=1) + "\u2063\u2063"
+# v2:          "\u2063\u2064" + 4 símbolos por byte (base 4)             + "\u2063\u2063"
+#
+# Encode/decode via tabelas de str.translate + int(..., base); nada de loop por bit.
+# Todo marcador começa com MARK_LEAD, então textos sem marcador saem com um único find.
+
+MARK_LEAD = "\u2063"
+V1_START = "\u2063\u2063"
+V2_START = "\u2063\u2064"
+END = "\u2063\u2063"
+
+_V1_SYMBOLS = "\u200b\u200c"
+_V2_SYMBOLS = "\u200b\u200c\u200d\u2060"
+
+# byte (como ordinal latin-1) -> 4 símbolos
+_ENC_V2 = {
+    b: "".join(_V2_SYMBOLS[(b >> shift) & 3] for shift in (6, 4, 2, 0))
+    for b in range(256)
+}
+_DEC_V1 = str.maketrans({ch: str(i) for i, ch in enumerate(_V1_SYMBOLS)})
+_DEC_V2 = str.maketrans({ch: str(i) for i, ch in enumerate(_V2_SYMBOLS)})
+
+def encode(token: str) -> str:
+    """Codifica o token no formato atual (v2)."""
+    payload = token.encode("utf-8").decode("latin-1").translate(_ENC_V2)
+    return V2_START + payload + END
+
+def encode_v1(token: str) -> str:
+    """Formato legado, mantido só para compatibilidade/testes."""
+    bits = "".join(f"{b:08b}" for b in token.encode("latin-1"))
+    return V1_START + bits.translate(str.maketrans("01", _V1_SYMBOLS)) + END
+
+def has_marker(s: str) -> bool:
+    return MARK_LEAD in s
+
+def _decode_payload(payload: str, table: dict, base: int, per_byte: int, charset: str) -> str | None:
+    n = len(payload)
+    if not n or n % per_byte:
+        return None
+    digits = payload.translate(table)
+    try:
+        value = int(digits, base)
+    except ValueError:
+        return None  # algum caractere fora do alfabeto
+    try:
+        return value.to_bytes(n // per_byte, "big").decode(charset)
+    except (OverflowError, UnicodeDecodeError):
+        return None
+
+def find_and_decode(s: str) -> tuple[str, str] | None:
+    """
+    Procura o primeiro marcador (v1 ou v2) em s.
+    Retorna (token_decodificado, trecho_invisivel_completo) ou None.
+    """
+    i = s.find(MARK_LEAD)
+    while i != -1:
+        head = s[i:i + 2]
+        if head == V2_START:
+            j = s.find(END, i + 2)
+            if j == -1:
+                return None
+            decoded = _decode_payload(s[i + 2:j], _DEC_V2, 4, 4, "utf-8")
+        elif head == V1_START:
+            j = s.find(END, i + 2)
+            if j == -1:
+                return None
+            decoded = _decode_payload(s[i + 2:j], _DEC_V1, 2, 8, "latin-1")
+        else:
+            i = s.find(MARK_LEAD, i + 1)
+            continue
+        if decoded is not None:
+            return decoded, s[i:j + len(END)]
+        i = s.find(MARK_LEAD, j + len(END))
+    return None